@@ -1,12 +1,14 @@
 from fastapi import FastAPI
 
-from . import dex, ton, auth
+from . import account, dex, ton, auth, status
 
 
 def register_routes(app: FastAPI):
     dex.register_routes(app)
     ton.register_routes(app)
     auth.register_routes(app)
+    status.register_routes(app)
+    account.register_routes(app)
 
 
 __all__ = [
@@ -0,0 +1,26 @@
+from typing import Union
+
+from fastapi import FastAPI
+
+from src.auth.models import ErrorResponse
+
+from .account import get_account_data_endpoint, get_referrals_endpoint
+from .schemas import AccountResponse, ReferralsPage
+
+BASE_PATH = "/api/v1/account"
+
+
+def register_routes(app: FastAPI):
+    app.add_api_route(
+        path=BASE_PATH,
+        endpoint=get_account_data_endpoint,
+        response_model=Union[AccountResponse, ErrorResponse],
+        methods=["GET"],
+    )
+
+    app.add_api_route(
+        path=f"{BASE_PATH}/referrals",
+        endpoint=get_referrals_endpoint,
+        response_model=Union[ReferralsPage, ErrorResponse],
+        methods=["GET"],
+    )
@@ -1,11 +1,17 @@
+from typing import Annotated, Dict
+
+from fastapi import Query
 from fastapi.requests import Request
 
 from src.auth.jwt import decode_jwt
 from src.auth.models import ErrorResponse
+from src.config import config
 from src.database.dal import account_dal
 
+from .schemas import AccountResponse, Referral, ReferralsPage
 
-async def get_account_data_endpoint(request: Request):
+
+def _get_token_data(request: Request) -> Dict[str, str] | ErrorResponse:
     bearer_token = request.headers.get("authorization", None)
 
     if not bearer_token:
@@ -16,9 +22,61 @@ async def get_account_data_endpoint(request: Request):
     if not token_data:
         return ErrorResponse(message="Invalid or expired token")
 
-    user_address = token_data["user_address"]
-    user_id = token_data["user_id"]
+    return token_data
+
+
+async def get_account_data_endpoint(request: Request):
+    token_data = _get_token_data(request)
+
+    if isinstance(token_data, ErrorResponse):
+        return token_data
+
+    account = await account_dal.get_account_summary(token_data["user_address"])
+
+    if account is None:
+        return ErrorResponse(message="Account not found")
+
+    return AccountResponse(
+        address=account.address,
+        username=account.username,
+        affiliate_address=account.affiliate_address,
+        referral_count=account.referral_count,
+        referral_swap_count=account.referral_swap_count,
+    )
+
+
+async def get_referrals_endpoint(
+    request: Request,
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    cursor: int | None = None,
+):
+    token_data = _get_token_data(request)
+
+    if isinstance(token_data, ErrorResponse):
+        return token_data
+
+    limit = min(
+        limit or config.account.referrals_page_size,
+        config.account.referrals_max_page_size,
+    )
+
+    # Pages are keyed by the id of their last referral, one extra row
+    # tells whether another page follows.
+    referrals = await account_dal.get_referrals(
+        token_data["user_id"],
+        limit=limit + 1,
+        after_id=cursor,
+    )
 
-    user_account = await account_dal.get_account(user_address)
+    next_cursor = None
+    if len(referrals) > limit:
+        referrals = referrals[:limit]
+        next_cursor = referrals[-1].id
 
-    return
+    return ReferralsPage(
+        referrals=[
+            Referral(address=referral.address, username=referral.username)
+            for referral in referrals
+        ],
+        next_cursor=next_cursor,
+    )
@@ -0,0 +1,21 @@
+from typing import List
+
+from pydantic import BaseModel
+
+
+class AccountResponse(BaseModel):
+    address: str
+    username: str | None = None
+    affiliate_address: str | None = None
+    referral_count: int
+    referral_swap_count: int
+
+
+class Referral(BaseModel):
+    address: str
+    username: str | None = None
+
+
+class ReferralsPage(BaseModel):
+    referrals: List[Referral]
+    next_cursor: int | None = None
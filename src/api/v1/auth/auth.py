@@ -8,35 +8,31 @@ from src.auth.models import (
     ErrorResponse,
     PayloadResponse,
 )
+from src.auth.payload_store import payload_store
 from src.auth.ton_proof import check_ton_proof, generate_payload
+from src.config import config
 from src.database.dal import account_dal
 
-PAYLOAD_TTL = 1000 * 60 * 20  # 20 minutes in ms
-
 
 async def get_payload_endpoint():
-    payload = generate_payload(PAYLOAD_TTL)
+    payload = generate_payload(config.ton_proof.payload_ttl)
 
-    ton_proof = await account_dal.save_ton_proof_payload(
-        payload=payload, ttl=PAYLOAD_TTL
-    )
+    await payload_store.put(payload, config.ton_proof.payload_ttl)
 
-    return PayloadResponse(payload=ton_proof.payload)
+    return PayloadResponse(payload=payload)
 
 
 async def auth_with_ton_proof_endpoint(
     request: AuthWithTonProofRequest,
     response: Response,
 ):
-    payload_dao = await account_dal.get_ton_proof_payload(
-        request.proof.payload
-    )
-
-    if not payload_dao:
+    # The payload is spent even if the proof turns out to be wrong, a
+    # signed proof can't be replayed and a new one needs a new payload.
+    if not await payload_store.consume(request.proof.payload):
         return ErrorResponse(message="payload not found")
 
     is_ton_proof_correct = await check_ton_proof(
-        payload=payload_dao.payload,
+        payload=request.proof.payload,
         user_address=request.address,
         request=request,
     )
@@ -44,15 +40,16 @@ async def auth_with_ton_proof_endpoint(
     if not is_ton_proof_correct:
         return ErrorResponse(message="Wrong ton proof!")
 
-    account = await account_dal.get_account(user_address=request.address)
+    account_id = await account_dal.get_account_id(user_address=request.address)
 
-    if not account:
+    if account_id is None:
         affiliate_address = request.affiliate_address
         account = await account_dal.create_account(
             user_address=request.address, affiliate_address=affiliate_address
         )
+        account_id = account.id
 
-    token = sign_jwt(user_id=account.id, user_address=account.address)
+    token = sign_jwt(user_id=account_id, user_address=request.address)
 
     set_token_cookie(
         response=response,
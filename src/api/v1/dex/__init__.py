@@ -2,9 +2,17 @@ from typing import List
 
 from fastapi import FastAPI
 
-from src.dex.models import Pool, SwapSimulateResponse, WalletAssetExport
+from src.dex.models import (
+    Pool,
+    PoolReservesSeries,
+    SwapDepthResponse,
+    SwapRouteResponse,
+    SwapSimulateResponse,
+    SwapSplitResponse,
+    WalletAssetExport,
+)
 from src.dex.models.liquidity import SimulateProvideLiquidityResponse
-from src.dex.models.transaction import TransactionData
+from src.dex.models.transaction import SwapTransactionsPage, TransactionData
 
 from .assets import get_assets_endpoint
 from .liquidity import (
@@ -14,13 +22,22 @@ from .liquidity import (
     remove_liquidity_endpoint,
     simulate_provide_liquidity_endpoint,
 )
-from .pools import get_pools_endpoint, get_pools_for_wallet_endpoint
+from .pools import (
+    get_pool_reserves_endpoint,
+    get_pools_endpoint,
+    get_pools_for_wallet_endpoint,
+)
 from .schemas import DexError
 from .swap import (
     simulate_reverse_swap_endpoint,
+    simulate_swap_depth_endpoint,
     simulate_swap_endpoint,
+    simulate_swap_route_endpoint,
+    simulate_swap_split_endpoint,
     swap_endpoint,
+    swap_split_endpoint,
 )
+from .transactions import get_swap_transactions_endpoint
 
 
 def register_routes(app: FastAPI):
@@ -31,18 +48,53 @@ def register_routes(app: FastAPI):
         methods=["GET"],
     )
 
+    app.add_api_route(
+        path="/api/v1/wallet/{wallet_address}/swaps",
+        endpoint=get_swap_transactions_endpoint,
+        response_model=SwapTransactionsPage,
+        methods=["GET"],
+    )
+
     app.add_api_route(
         path="/api/v1/swap",
         endpoint=swap_endpoint,
         methods=["POST"],
-        response_model=TransactionData,
+        response_model=TransactionData | DexError,
     )
 
     app.add_api_route(
         path="/api/v1/swap/simulate",
         endpoint=simulate_swap_endpoint,
         methods=["POST"],
-        response_model=SwapSimulateResponse,
+        response_model=SwapSimulateResponse | DexError,
+    )
+
+    app.add_api_route(
+        path="/api/v1/swap/depth",
+        endpoint=simulate_swap_depth_endpoint,
+        methods=["POST"],
+        response_model=SwapDepthResponse | DexError,
+    )
+
+    app.add_api_route(
+        path="/api/v1/swap/route",
+        endpoint=simulate_swap_route_endpoint,
+        methods=["POST"],
+        response_model=SwapRouteResponse | DexError,
+    )
+
+    app.add_api_route(
+        path="/api/v1/swap/split",
+        endpoint=swap_split_endpoint,
+        methods=["POST"],
+        response_model=TransactionData | DexError,
+    )
+
+    app.add_api_route(
+        path="/api/v1/swap/split/simulate",
+        endpoint=simulate_swap_split_endpoint,
+        methods=["POST"],
+        response_model=SwapSplitResponse | DexError,
     )
 
     app.add_api_route(
@@ -59,6 +111,13 @@ def register_routes(app: FastAPI):
         response_model=List[Pool],
     )
 
+    app.add_api_route(
+        path="/api/v1/pools/{pool_address}/reserves",
+        endpoint=get_pool_reserves_endpoint,
+        methods=["GET"],
+        response_model=PoolReservesSeries,
+    )
+
     app.add_api_route(
         path="/api/v1/assets",
         endpoint=get_assets_endpoint,
@@ -3,11 +3,15 @@ from src.dex.http_api import (
     get_pools_for_wallet,
 )
 
+import time
 from typing import Annotated
 from fastapi import Body
 
+from src.config import config
 from src.database.dal import pool_dal
-from src.dex.models import Pool
+from src.dex.models import Pool, PoolReservesResolution, PoolReservesSeries
+from src.dex.pool_reserves import pool_reserves
+from src.utils.address import ValidatedAddress
 
 
 async def get_pools_for_wallet_endpoint(wallet_address: str):
@@ -36,3 +40,25 @@ async def get_pools_endpoint():
     pools_response = list(map(lambda pool: Pool.from_pool_dao(pool), pools))
 
     return pools_response
+
+
+async def get_pool_reserves_endpoint(
+    pool_address: ValidatedAddress,
+    resolution: PoolReservesResolution = PoolReservesResolution.HOUR_1,
+    start: int | None = None,
+    end: int | None = None,
+):
+    if end is None:
+        end = int(time.time())
+    if start is None:
+        start = end - config.pool_reserves.default_range
+
+    series = await pool_reserves.get_series(
+        pool_address, resolution, start, end
+    )
+
+    return PoolReservesSeries(
+        pool_address=pool_address,
+        resolution=resolution,
+        **series,
+    )
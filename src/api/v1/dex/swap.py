@@ -1,19 +1,55 @@
-from src.dex.exceptions import NotEnoughLiquidityError
-from src.dex.models import SwapRequest, SwapSimulateRequest
-from src.dex.models.transaction import TransactionData
-from src.dex.swap import simulate_swap, simulate_swap_reverse, swap
+from src.dex.exceptions import (
+    AssetRateNotFoundError,
+    NotEnoughLiquidityError,
+    RouteNotFoundError,
+)
+from src.dex.models import (
+    SwapDepthRequest,
+    SwapRequest,
+    SwapRouteRequest,
+    SwapSimulateRequest,
+)
+from src.dex.swap import (
+    simulate_swap,
+    simulate_swap_depth,
+    simulate_swap_reverse,
+    simulate_swap_route,
+    simulate_swap_split,
+    swap,
+    swap_split,
+)
 
 from .schemas import DexError
 
 
-async def swap_endpoint(swap_data: SwapRequest) -> TransactionData:
-    return await swap(swap_data)
+async def swap_endpoint(swap_data: SwapRequest):
+    try:
+        return await swap(swap_data)
+    except AssetRateNotFoundError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="No TON rate for the offer asset",
+        )
 
 
 async def simulate_swap_endpoint(
     request_data: SwapSimulateRequest,
 ):
-    return await simulate_swap(request_data)
+    try:
+        return await simulate_swap(request_data)
+    except RouteNotFoundError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="No pool found",
+        )
+    except AssetRateNotFoundError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="No TON rate for the offer asset",
+        )
 
 
 async def simulate_reverse_swap_endpoint(
@@ -21,9 +57,107 @@ async def simulate_reverse_swap_endpoint(
 ):
     try:
         return await simulate_swap_reverse(request_data)
+    except RouteNotFoundError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="No pool found",
+        )
+    except NotEnoughLiquidityError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="Not enough liquidity",
+        )
+    except AssetRateNotFoundError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="No TON rate for the offer asset",
+        )
+
+
+async def simulate_swap_route_endpoint(
+    request_data: SwapRouteRequest,
+):
+    try:
+        return await simulate_swap_route(request_data)
+    except RouteNotFoundError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="No route found",
+        )
     except NotEnoughLiquidityError as e:
         return DexError(
             type="error",
             code=e.code,
             message="Not enough liquidity",
         )
+    except AssetRateNotFoundError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="No TON rate for the offer asset",
+        )
+
+
+async def simulate_swap_split_endpoint(
+    request_data: SwapRouteRequest,
+):
+    try:
+        return await simulate_swap_split(request_data)
+    except RouteNotFoundError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="No route found",
+        )
+    except NotEnoughLiquidityError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="Not enough liquidity",
+        )
+    except AssetRateNotFoundError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="No TON rate for the offer asset",
+        )
+
+
+async def swap_split_endpoint(swap_data: SwapRequest):
+    try:
+        return await swap_split(swap_data)
+    except RouteNotFoundError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="No route found",
+        )
+    except NotEnoughLiquidityError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="Not enough liquidity",
+        )
+    except AssetRateNotFoundError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="No TON rate for the offer asset",
+        )
+
+
+async def simulate_swap_depth_endpoint(
+    request_data: SwapDepthRequest,
+):
+    try:
+        return await simulate_swap_depth(request_data)
+    except RouteNotFoundError as e:
+        return DexError(
+            type="error",
+            code=e.code,
+            message="No pool found",
+        )
@@ -0,0 +1,40 @@
+from typing import Annotated
+
+from fastapi import Query
+
+from src.config import config
+from src.database.dal import transaction_dal
+from src.dex.models.transaction import SwapTransaction, SwapTransactionsPage
+from src.utils.address import ValidatedAddress
+
+
+async def get_swap_transactions_endpoint(
+    wallet_address: ValidatedAddress,
+    limit: Annotated[int | None, Query(ge=1)] = None,
+    cursor: int | None = None,
+):
+    limit = min(
+        limit or config.swap.history_page_size,
+        config.swap.history_max_page_size,
+    )
+
+    # Pages are keyed by the id of their last row, one extra row tells
+    # whether another page follows.
+    transactions = await transaction_dal.get_confirmed_transactions_for_user(
+        wallet_address,
+        limit=limit + 1,
+        before_id=cursor,
+    )
+
+    next_cursor = None
+    if len(transactions) > limit:
+        transactions = transactions[:limit]
+        next_cursor = transactions[-1].id
+
+    return SwapTransactionsPage(
+        transactions=[
+            SwapTransaction.from_transaction_dao(transaction)
+            for transaction in transactions
+        ],
+        next_cursor=next_cursor,
+    )
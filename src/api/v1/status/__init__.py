@@ -0,0 +1,15 @@
+from fastapi import FastAPI
+
+from .metrics import get_metrics_endpoint
+from .schemas import MetricsResponse
+
+BASE_PATH = "/api/v1/status"
+
+
+def register_routes(app: FastAPI):
+    app.add_api_route(
+        path=f"{BASE_PATH}/metrics",
+        endpoint=get_metrics_endpoint,
+        response_model=MetricsResponse,
+        methods=["GET"],
+    )
@@ -0,0 +1,37 @@
+from src.auth.payload_store import payload_store
+from src.database import database
+from src.dex import data_manager
+from src.dex.http_api import wallet_requests
+from src.dex.http_client import StonFiClientFactory
+from src.dex.pool_reserves import pool_reserves
+from src.dex.pool_snapshot import pool_snapshot
+from src.dex.routing import pool_graph
+from src.dex.ton_rates import ton_rate_table
+from src.dex.ston_fi_contracts.router import pool_data_requests
+from src.ton.jetton_wallet_cache import jetton_wallet_cache
+from src.ton.tonapi_scheduler import tonapi_scheduler
+from src.ton.utils import jetton_wallet_deriver
+from src.utils.timing import latency_stats
+
+from .schemas import MetricsResponse
+
+
+async def get_metrics_endpoint():
+    return MetricsResponse(
+        ston_fi_http=StonFiClientFactory.stats,
+        ston_fi_wallet_requests=wallet_requests.stats,
+        pool_data_requests=pool_data_requests.stats,
+        assets_sync=data_manager.assets_sync_state.stats,
+        pools_sync=data_manager.pools_sync_state.stats,
+        swap_sweep=data_manager.swap_sweep_stats,
+        jetton_wallets=jetton_wallet_cache.stats,
+        jetton_wallet_derivation=jetton_wallet_deriver.stats,
+        pool_snapshot=pool_snapshot.stats,
+        pool_reserves=pool_reserves.stats,
+        routing=pool_graph.stats,
+        ton_rates=ton_rate_table.stats,
+        tonapi=tonapi_scheduler.stats,
+        ton_proof_payloads=payload_store.stats,
+        database=database.get_stats(),
+        latency=latency_stats,
+    )
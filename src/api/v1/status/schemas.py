@@ -0,0 +1,37 @@
+from typing import Dict
+
+from pydantic import BaseModel
+
+from src.auth.payload_store import PayloadStoreStats
+from src.database.database import DatabaseStats
+from src.dex.data_manager import SwapSweepStats
+from src.dex.http_client import ConnectionStats
+from src.dex.pool_reserves import PoolReservesStats
+from src.dex.pool_snapshot import PoolSnapshotStats
+from src.dex.routing import RoutingStats
+from src.ton.jetton_wallet_cache import JettonWalletCacheStats
+from src.ton.tonapi_scheduler import TonapiSchedulerStats
+from src.ton.utils import JettonWalletDerivationStats
+from src.dex.sync_state import SyncStats
+from src.dex.ton_rates import TonRateTableStats
+from src.utils.single_flight import SingleFlightStats
+from src.utils.timing import LatencyStats
+
+
+class MetricsResponse(BaseModel):
+    ston_fi_http: ConnectionStats
+    ston_fi_wallet_requests: SingleFlightStats
+    pool_data_requests: SingleFlightStats
+    assets_sync: SyncStats
+    pools_sync: SyncStats
+    swap_sweep: SwapSweepStats
+    jetton_wallets: JettonWalletCacheStats
+    jetton_wallet_derivation: JettonWalletDerivationStats
+    pool_snapshot: PoolSnapshotStats
+    pool_reserves: PoolReservesStats
+    routing: RoutingStats
+    ton_rates: TonRateTableStats
+    tonapi: TonapiSchedulerStats
+    ton_proof_payloads: PayloadStoreStats
+    database: DatabaseStats
+    latency: Dict[str, LatencyStats]
@@ -0,0 +1,142 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Dict
+
+from pydantic import BaseModel
+
+from src.config import config
+from src.database.dal import account_dal
+
+logger = logging.getLogger("payload_store")
+
+
+class PayloadStoreStats(BaseModel):
+    issued: int = 0
+    consumed: int = 0
+    rejected: int = 0
+    expired: int = 0
+    evicted: int = 0
+    size: int = 0
+
+
+class PayloadStore(ABC):
+    def __init__(self):
+        self.stats = PayloadStoreStats()
+
+    @abstractmethod
+    async def put(self, payload: str, ttl: int):
+        pass
+
+    @abstractmethod
+    async def consume(self, payload: str) -> bool:
+        pass
+
+    @abstractmethod
+    async def sweep(self):
+        pass
+
+
+# Only for a single worker, a payload issued by one worker is unknown to
+# the others.
+class MemoryPayloadStore(PayloadStore):
+    def __init__(self, max_size: int):
+        super().__init__()
+
+        self.max_size = max_size
+
+        # Payloads share one TTL, so insertion order is expiry order.
+        self._expires_at: Dict[str, float] = {}
+
+    async def put(self, payload: str, ttl: int):
+        if len(self._expires_at) >= self.max_size:
+            self._remove_expired()
+
+        while len(self._expires_at) >= self.max_size:
+            del self._expires_at[next(iter(self._expires_at))]
+            self.stats.evicted += 1
+
+        self._expires_at[payload] = time.time() + ttl
+
+        self.stats.issued += 1
+        self.stats.size = len(self._expires_at)
+
+    async def consume(self, payload: str) -> bool:
+        expires_at = self._expires_at.pop(payload, None)
+        self.stats.size = len(self._expires_at)
+
+        if expires_at is None or expires_at < time.time():
+            self.stats.rejected += 1
+            return False
+
+        self.stats.consumed += 1
+        return True
+
+    async def sweep(self):
+        expired = self.stats.expired
+        self._remove_expired()
+
+        logger.debug(
+            "Swept %d expired payloads, %d left",
+            self.stats.expired - expired,
+            self.stats.size,
+        )
+
+    def _remove_expired(self):
+        now = time.time()
+
+        while self._expires_at:
+            payload = next(iter(self._expires_at))
+            if self._expires_at[payload] >= now:
+                break
+
+            del self._expires_at[payload]
+            self.stats.expired += 1
+
+        self.stats.size = len(self._expires_at)
+
+
+class DatabasePayloadStore(PayloadStore):
+    async def put(self, payload: str, ttl: int):
+        await account_dal.save_ton_proof_payload(
+            payload=payload,
+            ttl=ttl,
+            expires_at=int(time.time()) + ttl,
+        )
+
+        self.stats.issued += 1
+
+    async def consume(self, payload: str) -> bool:
+        consumed = await account_dal.consume_ton_proof_payload(
+            payload=payload,
+            now=int(time.time()),
+        )
+
+        if not consumed:
+            self.stats.rejected += 1
+            return False
+
+        self.stats.consumed += 1
+        return True
+
+    async def sweep(self):
+        expired = await account_dal.delete_expired_ton_proof_payloads(
+            now=int(time.time())
+        )
+        self.stats.expired += expired
+
+        logger.debug("Swept %d expired payloads", expired)
+
+
+def create_payload_store() -> PayloadStore:
+    backend = config.ton_proof.payload_store
+
+    if backend == "memory":
+        return MemoryPayloadStore(max_size=config.ton_proof.payload_store_size)
+    if backend == "database":
+        return DatabasePayloadStore()
+
+    raise ValueError(f"Unknown ton_proof payload store: {backend}")
+
+
+payload_store = create_payload_store()
@@ -9,6 +9,25 @@ class StonFiSettings(BaseSettings):
     ton_contract_address: str
     router_address: str
 
+    http2: bool = True
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 60
+    timeout: float = 30
+    connect_timeout: float = 10
+
+    wallet_cache_ttl: float = 2
+    wallet_cache_size: int = 10000
+
+    pool_data_cache_ttl: float = 3
+    pool_data_cache_size: int = 10000
+
+    sync_streaming: bool = True
+    sync_chunk_size: int = 500
+
+    status_check_concurrency: int = 16
+    status_check_rps: float = 20
+
 
 class Database(BaseSettings):
     dev_mode: bool
@@ -16,17 +35,50 @@ class Database(BaseSettings):
     dev_url_async: str
     dev_url_sync: str
 
+    # Deployments without production URLs keep using the dev ones.
+    prod_url_async: str = ""
+    prod_url_sync: str = ""
+
+    pool_size: int = 10
+    max_overflow: int = 20
+    pool_timeout: float = 30
+    pool_pre_ping: bool = True
+    pool_recycle: float = 1800
+
+    statement_cache_size: int = 500
+
+    replica_urls_async: List[str] = []
+    replica_max_lag: float = 5
+    replica_probe_interval: float = 5
+
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+
     @property
     def url(self) -> str:
-        return self.dev_url_async
+        if self.dev_mode:
+            return self.dev_url_async
+
+        return self.prod_url_async or self.dev_url_async
 
     @property
     def url_sync(self) -> str:
-        return self.dev_url_sync
+        if self.dev_mode:
+            return self.dev_url_sync
+
+        return self.prod_url_sync or self.dev_url_sync
 
 
 class TonConsole(BaseSettings):
     api_key: SecretStr
+    base_url: str | None = None
+
+    rps: float = 1
+    burst: int = 1
+    max_retries: int = 3
+    retry_delay: float = 1
+    retry_budget_ratio: float = 0.1
+    retry_budget_max: float = 10
 
 
 class Ton(BaseSettings):
@@ -35,16 +87,52 @@ class Ton(BaseSettings):
     fnz_contract_address: str
     scale_contract_address: str
 
+    jetton_wallet_cache_size: int = 10000
+    jetton_wallet_prewarm_concurrency: int = 4
+    jetton_wallet_fetch_concurrency: int = 8
+
 
 class Swap(BaseSettings):
     fee_percent: float
     tgr_cashback_percent: float
     ton_fee_address: str
 
+    route_max_hops: int = 3
+    split_max_legs: int = 3
+    split_steps: int = 20
+    depth_max_points: int = 200
+    history_page_size: int = 20
+    history_max_page_size: int = 100
+
+
+class Account(BaseSettings):
+    referrals_page_size: int = 50
+    referrals_max_page_size: int = 200
+
+
+class PoolReserves(BaseSettings):
+    raw_retention: int = 60 * 60 * 24
+    minutes_5_retention: int = 60 * 60 * 24 * 7
+    hour_1_retention: int = 60 * 60 * 24 * 90
+    day_1_retention: int = 0
+
+    maintenance_interval: float = 60
+    default_range: int = 60 * 60 * 24 * 7
+
+
+class TonProof(BaseSettings):
+    payload_ttl: int = 60 * 20
+    payload_store: str = "database"
+    payload_store_size: int = 100000
+    sweep_interval: float = 60
+
 
 class Server(BaseSettings):
     domain: str
     cors_allow_origins: List[str]
+    slow_threshold: float = 1.0
+    worker_id: int | None = None
+    worker_lease_ttl: float = 60
 
 
 class JWT(BaseSettings):
@@ -65,6 +153,12 @@ class Config(BaseSettings):
 
     swap: Swap
 
+    account: Account = Account()
+
+    pool_reserves: PoolReserves = PoolReserves()
+
+    ton_proof: TonProof = TonProof()
+
     server: Server
 
     model_config = SettingsConfigDict(
@@ -1,40 +1,111 @@
-from ..models import TonProofPayloadDao, AccountDao
+import logging
+from typing import List
+
+from sqlalchemy import Row, delete, select, update
+from sqlalchemy.orm import aliased
+
 from ..database import database
-from sqlalchemy import select
-from sqlalchemy.orm import joinedload
+from ..models import AccountDao, TonProofPayloadDao
+
+logger = logging.getLogger("account_dal")
+
+
+async def get_account_id(
+    user_address: str,
+    primary: bool = False,
+) -> int | None:
+    query = select(AccountDao.id).where(AccountDao.address == user_address)
+
+    async with database.create_read_session(
+        user_address, primary=primary
+    ) as session:
+        account_id = await session.scalar(query)
+
+    if account_id is None and not primary and database.replicas:
+        return await get_account_id(user_address, primary=True)
 
+    return account_id
 
-async def get_account(user_address: str) -> AccountDao | None:
-    # print(user_address)
+
+async def get_account_summary(user_address: str) -> Row | None:
+    affiliate = aliased(AccountDao)
     query = (
-        select(AccountDao)
+        select(
+            AccountDao.id,
+            AccountDao.address,
+            AccountDao.username,
+            affiliate.address.label("affiliate_address"),
+            AccountDao.referral_count,
+            AccountDao.referral_swap_count,
+        )
+        .outerjoin(affiliate, AccountDao.affiliate_id == affiliate.id)
         .where(AccountDao.address == user_address)
-        .options(joinedload(AccountDao.affiliate, AccountDao.referrals))
     )
-    async with database.create_session() as session:
+
+    async with database.create_read_session(user_address) as session:
         result = await session.execute(query)
 
-        account = result.scalar()
+    return result.first()
 
-    return account
+
+async def get_referrals(
+    account_id: int,
+    limit: int,
+    after_id: int | None = None,
+) -> List[Row]:
+    query = (
+        select(AccountDao.id, AccountDao.address, AccountDao.username)
+        .where(AccountDao.affiliate_id == account_id)
+        .order_by(AccountDao.id)
+        .limit(limit)
+    )
+
+    if after_id is not None:
+        query = query.where(AccountDao.id > after_id)
+
+    async with database.create_read_session() as session:
+        result = await session.execute(query)
+
+    return result.all()
 
 
 async def create_account(
     user_address: str,
     affiliate_address: str,
 ) -> AccountDao:
-    async with database.create_session() as session:
-        affiliate_account_id = None
-        if affiliate_address:
-            affiliate_account = await get_account(affiliate_address)
-            affiliate_account_id = affiliate_account.id
+    affiliate_account_id = None
+    if affiliate_address:
+        affiliate_account_id = await get_account_id(affiliate_address)
+
+        # The account is still created, only without a referrer.
+        if affiliate_account_id is None:
+            logger.warning(
+                "Affiliate %s of %s has no account, referral dropped",
+                affiliate_address,
+                user_address,
+            )
 
+    keys = [user_address]
+    if affiliate_account_id is not None:
+        keys.append(affiliate_address)
+
+    async with database.create_write_session(*keys) as session:
         account = AccountDao(
             address=user_address,
             affiliate_id=affiliate_account_id,
+            referral_count=0,
+            referral_swap_count=0,
         )
 
         session.add(account)
+
+        if affiliate_account_id is not None:
+            await session.execute(
+                update(AccountDao)
+                .where(AccountDao.id == affiliate_account_id)
+                .values(referral_count=AccountDao.referral_count + 1)
+            )
+
         await session.commit()
 
     return account
@@ -43,11 +114,13 @@ async def create_account(
 async def save_ton_proof_payload(
     payload: str,
     ttl: int,
+    expires_at: int,
 ) -> TonProofPayloadDao:
-    async with database.create_session() as session:
+    async with database.create_write_session(payload) as session:
         ton_proof_payload = TonProofPayloadDao(
             payload=payload,
             ttl=ttl,
+            expires_at=expires_at,
         )
 
         session.add(ton_proof_payload)
@@ -56,16 +129,29 @@ async def save_ton_proof_payload(
     return ton_proof_payload
 
 
-async def get_ton_proof_payload(
-    payload: str,
-) -> TonProofPayloadDao | None:
-    async with database.create_session() as session:
-        result = await session.execute(
-            select(TonProofPayloadDao).where(
-                TonProofPayloadDao.payload == payload
-            )
-        )
+async def consume_ton_proof_payload(payload: str, now: int) -> bool:
+    # A single DELETE both checks and spends the payload, so two logins
+    # racing with the same proof can't both succeed.
+    query = (
+        delete(TonProofPayloadDao)
+        .where(TonProofPayloadDao.payload == payload)
+        .where(TonProofPayloadDao.expires_at >= now)
+    )
 
-        ton_proof_payload = result.scalar()
+    async with database.create_write_session(payload) as session:
+        result = await session.execute(query)
+        await session.commit()
 
-    return ton_proof_payload
+    return result.rowcount > 0
+
+
+async def delete_expired_ton_proof_payloads(now: int) -> int:
+    query = delete(TonProofPayloadDao).where(
+        TonProofPayloadDao.expires_at < now
+    )
+
+    async with database.create_write_session() as session:
+        result = await session.execute(query)
+        await session.commit()
+
+    return result.rowcount
@@ -1,11 +1,16 @@
-from typing import Any, Dict, List
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List
 from ..models import AssetDao
 from ..database import database
+from ..upsert import upsert
 from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ASSETS_KEY = "assets"
 
 
 async def get_asset_by_symbol(symbol: str) -> AssetDao:
-    async with database.create_session() as session:
+    async with database.create_read_session(ASSETS_KEY) as session:
         result = await session.execute(
             select(AssetDao).where(AssetDao.symbol == symbol)
         )
@@ -14,7 +19,7 @@ async def get_asset_by_symbol(symbol: str) -> AssetDao:
 
 
 async def get_asset_by_contract_address(contract_address: str) -> AssetDao:
-    async with database.create_session() as session:
+    async with database.create_read_session(ASSETS_KEY) as session:
         result = await session.execute(
             select(AssetDao).where(
                 AssetDao.contract_address == contract_address
@@ -24,8 +29,28 @@ async def get_asset_by_contract_address(contract_address: str) -> AssetDao:
         return result.scalars().first()
 
 
+@asynccontextmanager
+async def create_assets_session() -> AsyncIterator[AsyncSession]:
+    async with database.create_write_session(ASSETS_KEY) as session:
+        yield session
+        await session.commit()
+
+
+async def upsert_assets(
+    session: AsyncSession,
+    assets: List[Dict[str, Any]],
+) -> int:
+    return await upsert(
+        session,
+        AssetDao,
+        assets,
+        index_elements=["contract_address"],
+        update_keys=AssetDao.update_keys,
+    )
+
+
 async def get_assets_list() -> List[AssetDao]:
-    async with database.create_session() as session:
+    async with database.create_read_session(ASSETS_KEY) as session:
         result = await session.execute(select(AssetDao))
 
     return result.scalars().all()
@@ -0,0 +1,62 @@
+from typing import List
+
+from sqlalchemy import and_, select
+
+from ..database import database
+from ..models import JettonWalletDao
+from ..upsert import upsert
+
+
+async def get_jetton_wallet(
+    jetton_address: str,
+    owner_address: str,
+) -> JettonWalletDao | None:
+    async with database.create_read_session() as session:
+        result = await session.execute(
+            select(JettonWalletDao).where(
+                and_(
+                    JettonWalletDao.jetton_address == jetton_address,
+                    JettonWalletDao.owner_address == owner_address,
+                )
+            )
+        )
+
+    return result.scalars().first()
+
+
+async def get_jetton_wallets_by_owner(
+    owner_address: str,
+) -> List[JettonWalletDao]:
+    async with database.create_read_session() as session:
+        result = await session.execute(
+            select(JettonWalletDao).where(
+                JettonWalletDao.owner_address == owner_address
+            )
+        )
+
+    return result.scalars().all()
+
+
+async def add_jetton_wallets(jetton_wallets: List[JettonWalletDao]):
+    if not jetton_wallets:
+        return
+
+    # Wallets another worker stored first are skipped, a wallet address
+    # never changes for the same jetton and owner.
+    async with database.create_write_session() as session:
+        await upsert(
+            session,
+            JettonWalletDao,
+            [
+                {
+                    "jetton_address": jetton_wallet.jetton_address,
+                    "owner_address": jetton_wallet.owner_address,
+                    "wallet_address": jetton_wallet.wallet_address,
+                }
+                for jetton_wallet in jetton_wallets
+            ],
+            index_elements=["jetton_address", "owner_address"],
+            update_keys=[],
+        )
+
+        await session.commit()
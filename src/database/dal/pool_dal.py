@@ -1,7 +1,12 @@
-from typing import List
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List
 from ..models.dex import PoolDao
 from ..database import database
-from sqlalchemy import and_, or_, select
+from ..upsert import upsert
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+POOLS_KEY = "pools"
 
 
 async def get_pools(include_deprecated: bool = False) -> List[PoolDao]:
@@ -10,14 +15,14 @@ async def get_pools(include_deprecated: bool = False) -> List[PoolDao]:
     if not include_deprecated:
         query = query.where(PoolDao.deprecated == False)  # noqa
 
-    async with database.create_session() as session:
+    async with database.create_read_session(POOLS_KEY) as session:
         result = await session.execute(query)
 
     return result.scalars().all()
 
 
 async def get_pool_by_address(address: str) -> PoolDao:
-    async with database.create_session() as session:
+    async with database.create_read_session(POOLS_KEY) as session:
         result = await session.execute(
             select(PoolDao).where(PoolDao.address == address)
         )
@@ -25,23 +30,40 @@ async def get_pool_by_address(address: str) -> PoolDao:
     return result.scalars().first()
 
 
+@asynccontextmanager
+async def create_pools_session() -> AsyncIterator[AsyncSession]:
+    async with database.create_write_session(POOLS_KEY) as session:
+        yield session
+        await session.commit()
+
+
+async def upsert_pools(
+    session: AsyncSession,
+    pools: List[Dict[str, Any]],
+) -> int:
+    for pool in pools:
+        pool["pair_key"] = PoolDao.get_pair_key(
+            pool["token0_address"], pool["token1_address"]
+        )
+
+    return await upsert(
+        session,
+        PoolDao,
+        pools,
+        index_elements=["address"],
+        update_keys=PoolDao.update_keys | {"pair_key"},
+    )
+
+
 async def get_pool_for_assets(
     token0_address: str,
     token1_address: str,
 ) -> PoolDao:
-    async with database.create_session() as session:
+    async with database.create_read_session(POOLS_KEY) as session:
         result = await session.execute(
             select(PoolDao).where(
-                or_(
-                    and_(
-                        PoolDao.token0_address == token0_address,
-                        PoolDao.token1_address == token1_address,
-                    ),
-                    and_(
-                        PoolDao.token0_address == token1_address,
-                        PoolDao.token1_address == token0_address,
-                    ),
-                )
+                PoolDao.pair_key
+                == PoolDao.get_pair_key(token0_address, token1_address)
             )
         )
 
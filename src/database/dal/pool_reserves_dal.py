@@ -0,0 +1,90 @@
+from typing import Any, Dict, List
+
+from sqlalchemy import Row, delete, select
+
+from ..database import database
+from ..models import PoolReservesDao
+from ..upsert import upsert
+
+POOL_RESERVES_KEY = "pool_reserves"
+
+SERIES_COLUMNS = ("timestamp", "reserve0", "reserve1", "samples")
+
+
+async def upsert_pool_reserves(points: List[Dict[str, Any]]) -> int:
+    async with database.create_write_session(POOL_RESERVES_KEY) as session:
+        batches = await upsert(
+            session,
+            PoolReservesDao,
+            points,
+            index_elements=["pool_address", "resolution", "timestamp"],
+            update_keys=["reserve0", "reserve1", "samples"],
+        )
+
+        await session.commit()
+
+    return batches
+
+
+async def get_pool_reserves_since(
+    resolution: int,
+    timestamp: int,
+) -> List[Row]:
+    query = (
+        select(
+            PoolReservesDao.pool_address,
+            PoolReservesDao.timestamp,
+            PoolReservesDao.reserve0,
+            PoolReservesDao.reserve1,
+            PoolReservesDao.samples,
+        )
+        .where(PoolReservesDao.resolution == resolution)
+        .where(PoolReservesDao.timestamp >= timestamp)
+        .order_by(PoolReservesDao.timestamp)
+    )
+
+    async with database.create_read_session(
+        POOL_RESERVES_KEY, primary=True
+    ) as session:
+        result = await session.execute(query)
+
+    return result.all()
+
+
+async def get_pool_reserves_series(
+    pool_address: str,
+    resolution: int,
+    start: int,
+    end: int,
+) -> Dict[str, List[int]]:
+    query = (
+        select(*(getattr(PoolReservesDao, name) for name in SERIES_COLUMNS))
+        .where(PoolReservesDao.pool_address == pool_address)
+        .where(PoolReservesDao.resolution == resolution)
+        .where(PoolReservesDao.timestamp >= start)
+        .where(PoolReservesDao.timestamp < end)
+        .order_by(PoolReservesDao.timestamp)
+    )
+
+    async with database.create_read_session(POOL_RESERVES_KEY) as session:
+        result = await session.execute(query)
+
+    columns = list(zip(*result.all())) or [()] * len(SERIES_COLUMNS)
+
+    return {
+        name: list(column) for name, column in zip(SERIES_COLUMNS, columns)
+    }
+
+
+async def delete_pool_reserves_before(resolution: int, timestamp: int) -> int:
+    query = (
+        delete(PoolReservesDao)
+        .where(PoolReservesDao.resolution == resolution)
+        .where(PoolReservesDao.timestamp < timestamp)
+    )
+
+    async with database.create_write_session(POOL_RESERVES_KEY) as session:
+        result = await session.execute(query)
+        await session.commit()
+
+    return result.rowcount
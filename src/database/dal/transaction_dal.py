@@ -1,23 +1,26 @@
 import time
-from random import randint
+from collections import Counter
 from typing import List
 
 from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.utils.snowflake import SnowflakeGenerator
 
 from ..database import database
-from ..models import TransactionDao
+from ..models import AccountDao, TransactionDao
 
+TRANSACTIONS_KEY = "transactions"
+
+# Assigned at startup, from SERVER__WORKER_ID or a leased worker id.
+query_id_generator: SnowflakeGenerator | None = None
 
-async def get_last_transaction_id() -> int:
-    async with database.create_session() as session:
-        result = await session.execute(
-            select(TransactionDao.id)
-            .order_by(TransactionDao.id.desc())
-            .limit(1)
-        )
 
-    last_id = result.scalars().first() or 0
-    return last_id
+def set_worker_id(worker_id: int):
+    global query_id_generator
+
+    if query_id_generator is None or query_id_generator.worker_id != worker_id:
+        query_id_generator = SnowflakeGenerator(worker_id=worker_id)
 
 
 async def create_transaction(
@@ -32,11 +35,10 @@ async def create_transaction(
     referral_address: str,
     valid_until: int,
 ) -> int:
-    last_id = await get_last_transaction_id()
+    if query_id_generator is None:
+        raise RuntimeError("No worker id assigned")
 
-    query_id = int(f"{account_id}{last_id + 1}") + randint(
-        10000, 99999
-    )  # TODO: think
+    query_id = query_id_generator.next_id()
 
     if not forward_gas_amount:
         forward_gas_amount = 0.3
@@ -55,7 +57,9 @@ async def create_transaction(
         valid_until=valid_until,
     )
 
-    async with database.create_session() as session:
+    async with database.create_write_session(
+        TRANSACTIONS_KEY, user_wallet_address
+    ) as session:
         session.add(transaction)
         await session.commit()
 
@@ -65,7 +69,7 @@ async def create_transaction(
 async def get_transaction_by_query_id(query_id: str) -> TransactionDao:
     query = select(TransactionDao).where(TransactionDao.queryId == query_id)
 
-    async with database.create_session() as session:
+    async with database.create_read_session(TRANSACTIONS_KEY) as session:
         result = await session.execute(query)
 
     return result.scalars().first()
@@ -76,9 +80,10 @@ async def get_unconfirmed_swap_transactions() -> List[TransactionDao]:
         select(TransactionDao)
         .where(TransactionDao.is_confirmed == False)  # noqa
         .where(TransactionDao.valid_until > int(time.time()) - 60 * 10)
+        .order_by(TransactionDao.valid_until)
     )
 
-    async with database.create_session() as session:
+    async with database.create_read_session(TRANSACTIONS_KEY) as session:
         result = await session.execute(query)
 
     return result.scalars().all()
@@ -86,26 +91,71 @@ async def get_unconfirmed_swap_transactions() -> List[TransactionDao]:
 
 async def get_confirmed_transactions_for_user(
     user_wallet_address: str,
+    limit: int,
+    before_id: int | None = None,
 ) -> List[TransactionDao]:
     query = (
         select(TransactionDao)
         .where(TransactionDao.user_wallet_address == user_wallet_address)
         .where(TransactionDao.is_confirmed == True)  # noqa
+        .order_by(TransactionDao.id.desc())
+        .limit(limit)
     )
 
-    async with database.create_session() as session:
+    if before_id is not None:
+        query = query.where(TransactionDao.id < before_id)
+
+    async with database.create_read_session(
+        TRANSACTIONS_KEY, user_wallet_address
+    ) as session:
         result = await session.execute(query)
 
     return result.scalars().all()
 
 
 async def set_transaction_confirmed(transaction_id: int):
+    await set_transactions_confirmed([transaction_id])
+
+
+async def set_transactions_confirmed(transaction_ids: List[int]):
+    if not transaction_ids:
+        return
+
+    # Only rows that actually change are returned, a swap confirmed twice
+    # isn't counted twice in the referral stats.
     query = (
         update(TransactionDao)
-        .where(TransactionDao.id == transaction_id)
+        .where(TransactionDao.id.in_(transaction_ids))
+        .where(TransactionDao.is_confirmed == False)  # noqa
         .values(is_confirmed=True)
+        .returning(TransactionDao.account_id)
     )
 
-    async with database.create_session() as session:
-        await session.execute(query)
+    async with database.create_write_session(TRANSACTIONS_KEY) as session:
+        result = await session.execute(query)
+        swaps = Counter(result.scalars().all())
+
+        await _add_referral_swaps(session, swaps)
         await session.commit()
+
+
+async def _add_referral_swaps(session: AsyncSession, swaps: Counter):
+    if not swaps:
+        return
+
+    result = await session.execute(
+        select(AccountDao.id, AccountDao.affiliate_id)
+        .where(AccountDao.id.in_(swaps))
+        .where(AccountDao.affiliate_id != None)  # noqa
+    )
+
+    affiliate_swaps = Counter()
+    for account_id, affiliate_id in result:
+        affiliate_swaps[affiliate_id] += swaps[account_id]
+
+    for affiliate_id, count in affiliate_swaps.items():
+        await session.execute(
+            update(AccountDao)
+            .where(AccountDao.id == affiliate_id)
+            .values(referral_swap_count=AccountDao.referral_swap_count + count)
+        )
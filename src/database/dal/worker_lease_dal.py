@@ -0,0 +1,85 @@
+from typing import Set
+
+from sqlalchemy import delete, exc, select, update
+
+from ..database import database
+from ..models import WorkerLeaseDao
+
+WORKER_LEASES_KEY = "worker_leases"
+
+
+async def get_leased_worker_ids(now: int) -> Set[int]:
+    query = select(WorkerLeaseDao.worker_id).where(
+        WorkerLeaseDao.expires_at >= now
+    )
+
+    async with database.create_read_session(
+        WORKER_LEASES_KEY, primary=True
+    ) as session:
+        result = await session.execute(query)
+
+    return set(result.scalars().all())
+
+
+async def try_lease_worker_id(
+    worker_id: int,
+    holder: str,
+    now: int,
+    expires_at: int,
+) -> bool:
+    async with database.create_write_session(WORKER_LEASES_KEY) as session:
+        # An expired lease is taken over, the unique worker_id makes
+        # concurrent attempts on a free id fail for all but one worker.
+        await session.execute(
+            delete(WorkerLeaseDao)
+            .where(WorkerLeaseDao.worker_id == worker_id)
+            .where(WorkerLeaseDao.expires_at < now)
+        )
+        session.add(
+            WorkerLeaseDao(
+                worker_id=worker_id,
+                holder=holder,
+                expires_at=expires_at,
+            )
+        )
+
+        try:
+            await session.commit()
+        except exc.IntegrityError:
+            await session.rollback()
+            return False
+
+    return True
+
+
+async def renew_worker_lease(
+    worker_id: int,
+    holder: str,
+    now: int,
+    expires_at: int,
+) -> bool:
+    query = (
+        update(WorkerLeaseDao)
+        .where(WorkerLeaseDao.worker_id == worker_id)
+        .where(WorkerLeaseDao.holder == holder)
+        .where(WorkerLeaseDao.expires_at >= now)
+        .values(expires_at=expires_at)
+    )
+
+    async with database.create_write_session(WORKER_LEASES_KEY) as session:
+        result = await session.execute(query)
+        await session.commit()
+
+    return result.rowcount > 0
+
+
+async def release_worker_lease(worker_id: int, holder: str):
+    query = (
+        delete(WorkerLeaseDao)
+        .where(WorkerLeaseDao.worker_id == worker_id)
+        .where(WorkerLeaseDao.holder == holder)
+    )
+
+    async with database.create_write_session(WORKER_LEASES_KEY) as session:
+        await session.execute(query)
+        await session.commit()
@@ -1,13 +1,163 @@
+import asyncio
+import itertools
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Dict, Hashable, List
+
+from alembic import command
+from alembic.config import Config as AlembicConfig
+from pydantic import BaseModel
+from sqlalchemy import Connection, event, exc, text
 from sqlalchemy.ext.asyncio import (
     create_async_engine,
     async_sessionmaker,
     AsyncEngine,
     AsyncSession,
 )
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
 from sqlalchemy_utils.functions import create_database, database_exists
 
 from src.config import config
-from . import models
+
+logger = logging.getLogger("database")
+
+MIGRATIONS_PATH = os.path.join(os.path.dirname(__file__), "migrations")
+
+# Seconds a replica runs behind its primary, zero when it has replayed
+# everything it received.
+REPLICA_LAG_QUERY = """
+SELECT CASE
+    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+END
+"""
+
+
+class DatabasePoolStats(BaseModel):
+    size: int = 0
+    checked_out: int = 0
+    overflow: int = 0
+    checkouts: int = 0
+    timeouts: int = 0
+    wait_total: float = 0
+    wait_max: float = 0
+
+
+class ReplicaStats(BaseModel):
+    url: str
+    healthy: bool = False
+    lag: float = 0
+    reads: int = 0
+    probe_failures: int = 0
+    pool: DatabasePoolStats = DatabasePoolStats()
+
+
+class DatabaseStats(BaseModel):
+    primary: DatabasePoolStats = DatabasePoolStats()
+    primary_reads: int = 0
+    read_your_writes: int = 0
+    replicas: List[ReplicaStats] = []
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.stats = DatabasePoolStats()
+
+    def recreate(self) -> "TimedQueuePool":
+        pool = super().recreate()
+        pool.stats = self.stats
+
+        return pool
+
+    def connect(self) -> PoolProxiedConnection:
+        started_at = time.perf_counter()
+
+        try:
+            return super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        finally:
+            duration = time.perf_counter() - started_at
+            self.stats.checkouts += 1
+            self.stats.wait_total += duration
+            self.stats.wait_max = max(self.stats.wait_max, duration)
+
+    def get_stats(self) -> DatabasePoolStats:
+        self.stats.size = self.size()
+        self.stats.checked_out = self.checkedout()
+        self.stats.overflow = self.overflow()
+
+        return self.stats
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    cursor.execute(
+        f"PRAGMA journal_mode={config.database.sqlite_journal_mode}"
+    )
+    cursor.execute(f"PRAGMA synchronous={config.database.sqlite_synchronous}")
+    cursor.close()
+
+
+def _create_engine(url: str) -> AsyncEngine:
+    connect_args = {}
+    if url.startswith("postgresql+asyncpg"):
+        connect_args["prepared_statement_cache_size"] = (
+            config.database.statement_cache_size
+        )
+
+    # File based SQLite gets a connection pool as well, by default every
+    # session would open a new connection and a new aiosqlite thread.
+    engine = create_async_engine(
+        url,
+        poolclass=TimedQueuePool,
+        pool_size=config.database.pool_size,
+        max_overflow=config.database.max_overflow,
+        pool_timeout=config.database.pool_timeout,
+        pool_pre_ping=config.database.pool_pre_ping,
+        pool_recycle=config.database.pool_recycle,
+        connect_args=connect_args,
+    )
+
+    if engine.dialect.name == "sqlite":
+        event.listen(engine.sync_engine, "connect", _set_sqlite_pragmas)
+
+    return engine
+
+
+def _upgrade_schema(connection: Connection) -> None:
+    alembic_config = AlembicConfig()
+    alembic_config.set_main_option("script_location", MIGRATIONS_PATH)
+    alembic_config.attributes["connection"] = connection
+
+    command.upgrade(alembic_config, "head")
+
+
+class Replica:
+    def __init__(self, url: str) -> None:
+        self.engine = _create_engine(url)
+        self.session_maker = async_sessionmaker(
+            self.engine, expire_on_commit=False
+        )
+        self.stats = ReplicaStats(
+            url=self.engine.url.render_as_string(hide_password=True)
+        )
+
+    async def probe(self) -> None:
+        async with self.engine.connect() as connection:
+            if self.engine.dialect.name == "postgresql":
+                lag = await connection.scalar(text(REPLICA_LAG_QUERY))
+            else:
+                await connection.execute(text("SELECT 1"))
+                lag = 0
+
+        self.stats.lag = float(lag or 0)
+        self.stats.healthy = self.stats.lag <= config.database.replica_max_lag
 
 
 class Database:
@@ -15,23 +165,125 @@ class Database:
     session_maker: async_sessionmaker
 
     def __init__(self) -> None:
-        self.engine = create_async_engine(config.database.url)
+        self.engine = _create_engine(config.database.url)
         self.session_maker = async_sessionmaker(
             self.engine, expire_on_commit=False
         )
 
+        self.replicas = [
+            Replica(url) for url in config.database.replica_urls_async
+        ]
+        self.stats = DatabaseStats(
+            replicas=[replica.stats for replica in self.replicas]
+        )
+
+        # A write stays visible only on the primary until every replica
+        # that may serve reads is guaranteed to have replayed it.
+        self.read_your_writes_window = (
+            config.database.replica_max_lag
+            + config.database.replica_probe_interval
+        )
+        self._written_at: Dict[Hashable, float] = {}
+        self._pruned_at = time.monotonic()
+        self._replica_counter = itertools.count()
+
     async def init_database(self) -> None:
+        # Production databases are provisioned and migrated separately,
+        # with `alembic upgrade head` before a deploy.
+        if not config.database.dev_mode:
+            return
+
         url = config.database.url_sync
+        if not database_exists(url):
+            create_database(url)
 
-        if database_exists(url):
+        async with self.engine.begin() as connection:
+            await connection.run_sync(_upgrade_schema)
+
+    @asynccontextmanager
+    async def create_write_session(
+        self,
+        *keys: Hashable,
+    ) -> AsyncIterator[AsyncSession]:
+        try:
+            async with self.session_maker() as session:
+                yield session
+        finally:
+            self.mark_written(*keys)
+
+    def create_read_session(
+        self,
+        *keys: Hashable,
+        primary: bool = False,
+    ) -> AsyncSession:
+        replica = None if primary else self._get_replica(keys)
+
+        if replica is None:
+            self.stats.primary_reads += 1
+            return self.session_maker()
+
+        replica.stats.reads += 1
+        return replica.session_maker()
+
+    def mark_written(self, *keys: Hashable) -> None:
+        if not self.replicas or not keys:
             return
 
-        create_database(url)
-        async with self.engine.begin() as connection:
-            await connection.run_sync(models.Base.metadata.create_all)
+        now = time.monotonic()
+        for key in keys:
+            self._written_at[key] = now
+
+        if now - self._pruned_at > self.read_your_writes_window:
+            self._written_at = {
+                key: written_at
+                for key, written_at in self._written_at.items()
+                if now - written_at <= self.read_your_writes_window
+            }
+            self._pruned_at = now
+
+    def _get_replica(self, keys) -> Replica | None:
+        if not self.replicas:
+            return None
+
+        now = time.monotonic()
+        for key in keys:
+            written_at = self._written_at.get(key)
+
+            if (
+                written_at is not None
+                and now - written_at <= self.read_your_writes_window
+            ):
+                self.stats.read_your_writes += 1
+                return None
+
+        replicas = [
+            replica for replica in self.replicas if replica.stats.healthy
+        ]
+        if not replicas:
+            return None
+
+        return replicas[next(self._replica_counter) % len(replicas)]
+
+    async def probe_replicas(self) -> None:
+        for replica in self.replicas:
+            try:
+                await asyncio.wait_for(
+                    replica.probe(),
+                    config.database.replica_probe_interval,
+                )
+            except Exception as e:
+                replica.stats.healthy = False
+                replica.stats.probe_failures += 1
+                logger.warning(
+                    "Replica %s probe failed: %r", replica.stats.url, e
+                )
+
+    def get_stats(self) -> DatabaseStats:
+        self.stats.primary = self.engine.pool.get_stats()
+        for replica in self.replicas:
+            replica.stats.pool = replica.engine.pool.get_stats()
 
-    def create_session(self) -> AsyncSession:
-        return self.session_maker()
+        return self.stats
 
 
 database = Database()
@@ -0,0 +1,48 @@
+"""add worker_lease_dao
+
+Revision ID: 2bffcf5da9df
+Revises: 53623bcea8f7
+Create Date: 2026-10-18 13:31:26.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "2bffcf5da9df"
+down_revision: Union[str, None] = "53623bcea8f7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "worker_lease_dao",
+        sa.Column("worker_id", sa.Integer(), nullable=False),
+        sa.Column("holder", sa.String(), nullable=False),
+        sa.Column("expires_at", sa.BigInteger(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_worker_lease_dao_id"), "worker_lease_dao", ["id"], unique=True
+    )
+    op.create_index(
+        op.f("ix_worker_lease_dao_worker_id"),
+        "worker_lease_dao",
+        ["worker_id"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_worker_lease_dao_worker_id"), table_name="worker_lease_dao"
+    )
+    op.drop_index(
+        op.f("ix_worker_lease_dao_id"), table_name="worker_lease_dao"
+    )
+    op.drop_table("worker_lease_dao")
@@ -0,0 +1,53 @@
+"""add jetton_wallet_dao
+
+Revision ID: 30f3d72ac62b
+Revises: 551966cdefe2
+Create Date: 2026-10-18 11:02:41.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "30f3d72ac62b"
+down_revision: Union[str, None] = "551966cdefe2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "jetton_wallet_dao",
+        sa.Column("jetton_address", sa.String(), nullable=False),
+        sa.Column("owner_address", sa.String(), nullable=False),
+        sa.Column("wallet_address", sa.String(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("jetton_address", "owner_address"),
+    )
+    op.create_index(
+        op.f("ix_jetton_wallet_dao_id"),
+        "jetton_wallet_dao",
+        ["id"],
+        unique=True,
+    )
+    op.create_index(
+        op.f("ix_jetton_wallet_dao_owner_address"),
+        "jetton_wallet_dao",
+        ["owner_address"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_jetton_wallet_dao_owner_address"),
+        table_name="jetton_wallet_dao",
+    )
+    op.drop_index(
+        op.f("ix_jetton_wallet_dao_id"), table_name="jetton_wallet_dao"
+    )
+    op.drop_table("jetton_wallet_dao")
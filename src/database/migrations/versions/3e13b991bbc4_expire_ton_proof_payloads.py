@@ -0,0 +1,54 @@
+"""expire ton_proof payloads
+
+Revision ID: 3e13b991bbc4
+Revises: 850b928a7376
+Create Date: 2026-10-18 12:40:17.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "3e13b991bbc4"
+down_revision: Union[str, None] = "850b928a7376"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Payloads saved without an expiry can never be consumed, dropping
+    # them also clears any duplicates before the unique index.
+    op.execute("DELETE FROM ton_proof_payload_dao")
+
+    op.add_column(
+        "ton_proof_payload_dao",
+        sa.Column("expires_at", sa.BigInteger(), nullable=True),
+    )
+    op.create_index(
+        op.f("ix_ton_proof_payload_dao_expires_at"),
+        "ton_proof_payload_dao",
+        ["expires_at"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_ton_proof_payload_dao_payload"),
+        "ton_proof_payload_dao",
+        ["payload"],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_ton_proof_payload_dao_payload"),
+        table_name="ton_proof_payload_dao",
+    )
+    op.drop_index(
+        op.f("ix_ton_proof_payload_dao_expires_at"),
+        table_name="ton_proof_payload_dao",
+    )
+    with op.batch_alter_table("ton_proof_payload_dao") as batch_op:
+        batch_op.drop_column("expires_at")
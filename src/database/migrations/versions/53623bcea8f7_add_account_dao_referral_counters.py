@@ -0,0 +1,88 @@
+"""add account_dao referral counters
+
+Revision ID: 53623bcea8f7
+Revises: 3e13b991bbc4
+Create Date: 2026-10-18 13:05:44.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "53623bcea8f7"
+down_revision: Union[str, None] = "3e13b991bbc4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "account_dao",
+        sa.Column(
+            "referral_count",
+            sa.BigInteger(),
+            server_default="0",
+            nullable=False,
+        ),
+    )
+    op.add_column(
+        "account_dao",
+        sa.Column(
+            "referral_swap_count",
+            sa.BigInteger(),
+            server_default="0",
+            nullable=False,
+        ),
+    )
+
+    account_dao = sa.table(
+        "account_dao",
+        sa.column("id", sa.Integer),
+        sa.column("affiliate_id", sa.BigInteger),
+        sa.column("referral_count", sa.BigInteger),
+        sa.column("referral_swap_count", sa.BigInteger),
+    )
+    transaction_dao = sa.table(
+        "transaction_dao",
+        sa.column("id", sa.Integer),
+        sa.column("account_id", sa.BigInteger),
+        sa.column("is_confirmed", sa.Boolean),
+    )
+    referral = account_dao.alias("referral")
+    referral_count = (
+        sa.select(sa.func.count(referral.c.id))
+        .where(referral.c.affiliate_id == account_dao.c.id)
+        .scalar_subquery()
+    )
+    referral_swap_count = (
+        sa.select(sa.func.count(transaction_dao.c.id))
+        .join(referral, transaction_dao.c.account_id == referral.c.id)
+        .where(referral.c.affiliate_id == account_dao.c.id)
+        .where(transaction_dao.c.is_confirmed == sa.true())
+        .scalar_subquery()
+    )
+    op.execute(
+        sa.update(account_dao).values(
+            referral_count=referral_count,
+            referral_swap_count=referral_swap_count,
+        )
+    )
+
+    op.create_index(
+        op.f("ix_account_dao_affiliate_id"),
+        "account_dao",
+        ["affiliate_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_account_dao_affiliate_id"), table_name="account_dao"
+    )
+    with op.batch_alter_table("account_dao") as batch_op:
+        batch_op.drop_column("referral_swap_count")
+        batch_op.drop_column("referral_count")
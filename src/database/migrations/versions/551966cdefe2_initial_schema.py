@@ -0,0 +1,173 @@
+"""initial schema
+
+Revision ID: 551966cdefe2
+Revises:
+Create Date: 2026-10-18 10:45:17.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "551966cdefe2"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases created with create_all before there were migrations
+    # already have this schema.
+    if sa.inspect(op.get_bind()).has_table("account_dao"):
+        return
+
+    op.create_table(
+        "account_dao",
+        sa.Column("username", sa.String(), nullable=True),
+        sa.Column("address", sa.String(), nullable=False),
+        sa.Column("affiliate_id", sa.BigInteger(), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.ForeignKeyConstraint(["affiliate_id"], ["account_dao.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_account_dao_address"), "account_dao", ["address"], unique=True
+    )
+    op.create_index(
+        op.f("ix_account_dao_id"), "account_dao", ["id"], unique=True
+    )
+
+    op.create_table(
+        "asset_dao",
+        sa.Column("blacklisted", sa.Boolean(), nullable=False),
+        sa.Column("community", sa.Boolean(), nullable=False),
+        sa.Column("contract_address", sa.String(), nullable=False),
+        sa.Column("decimals", sa.Integer(), nullable=False),
+        sa.Column("default_symbol", sa.Boolean(), nullable=False),
+        sa.Column("deprecated", sa.Boolean(), nullable=False),
+        sa.Column("dex_price_usd", sa.Float(), nullable=True),
+        sa.Column("dex_usd_price", sa.Float(), nullable=True),
+        sa.Column("display_name", sa.String(), nullable=True),
+        sa.Column("image_url", sa.String(), nullable=True),
+        sa.Column(
+            "kind",
+            sa.Enum("JETTON", "WTON", "TON", name="assetkind"),
+            nullable=False,
+        ),
+        sa.Column("symbol", sa.String(), nullable=False),
+        sa.Column("third_party_price_usd", sa.Float(), nullable=True),
+        sa.Column("third_party_usd_price", sa.Float(), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_asset_dao_contract_address"),
+        "asset_dao",
+        ["contract_address"],
+        unique=True,
+    )
+    op.create_index(op.f("ix_asset_dao_id"), "asset_dao", ["id"], unique=True)
+
+    op.create_table(
+        "ton_proof_payload_dao",
+        sa.Column("payload", sa.String(), nullable=False),
+        sa.Column("ttl", sa.BigInteger(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_ton_proof_payload_dao_id"),
+        "ton_proof_payload_dao",
+        ["id"],
+        unique=True,
+    )
+
+    op.create_table(
+        "pool_dao",
+        sa.Column("address", sa.String(), nullable=False),
+        sa.Column("apy_1d", sa.Float(), nullable=True),
+        sa.Column("apy_30d", sa.Float(), nullable=True),
+        sa.Column("apy_7d", sa.Float(), nullable=True),
+        sa.Column("collected_token0_protocol_fee", sa.Float(), nullable=False),
+        sa.Column("collected_token1_protocol_fee", sa.Float(), nullable=False),
+        sa.Column("deprecated", sa.Boolean(), nullable=False),
+        sa.Column("lp_account_address", sa.String(), nullable=True),
+        sa.Column("lp_balance", sa.Float(), nullable=True),
+        sa.Column("lp_fee", sa.BigInteger(), nullable=False),
+        sa.Column("lp_price_usd", sa.Float(), nullable=True),
+        sa.Column("lp_total_supply", sa.BigInteger(), nullable=False),
+        sa.Column("lp_total_supply_usd", sa.Float(), nullable=True),
+        sa.Column("lp_wallet_address", sa.String(), nullable=True),
+        sa.Column("protocol_fee", sa.BigInteger(), nullable=True),
+        sa.Column("protocol_fee_address", sa.String(), nullable=False),
+        sa.Column("ref_fee", sa.BigInteger(), nullable=False),
+        sa.Column("reserve0", sa.BigInteger(), nullable=False),
+        sa.Column("reserve1", sa.BigInteger(), nullable=False),
+        sa.Column("router_address", sa.String(), nullable=False),
+        sa.Column("token0_address", sa.String(), nullable=False),
+        sa.Column("token0_balance", sa.Float(), nullable=True),
+        sa.Column("token1_address", sa.String(), nullable=False),
+        sa.Column("token1_balance", sa.Float(), nullable=True),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.ForeignKeyConstraint(
+            ["token0_address"], ["asset_dao.contract_address"]
+        ),
+        sa.ForeignKeyConstraint(
+            ["token1_address"], ["asset_dao.contract_address"]
+        ),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_pool_dao_address"), "pool_dao", ["address"], unique=True
+    )
+    op.create_index(op.f("ix_pool_dao_id"), "pool_dao", ["id"], unique=True)
+
+    op.create_table(
+        "transaction_dao",
+        sa.Column("account_id", sa.BigInteger(), nullable=False),
+        sa.Column("router_address", sa.String(), nullable=False),
+        sa.Column("user_wallet_address", sa.String(), nullable=False),
+        sa.Column("offer_jetton_address", sa.String(), nullable=False),
+        sa.Column("offer_amount", sa.BigInteger(), nullable=False),
+        sa.Column("ask_jetton_address", sa.String(), nullable=False),
+        sa.Column("min_ask_amount", sa.BigInteger(), nullable=False),
+        sa.Column("forward_gas_amount", sa.BigInteger(), nullable=False),
+        sa.Column(
+            "query_id", sa.BigInteger(), autoincrement=True, nullable=False
+        ),
+        sa.Column("referral_address", sa.String(), nullable=True),
+        sa.Column("is_confirmed", sa.Boolean(), nullable=False),
+        sa.Column("valid_until", sa.BigInteger(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.ForeignKeyConstraint(["account_id"], ["account_dao.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("query_id"),
+    )
+    op.create_index(
+        op.f("ix_transaction_dao_id"), "transaction_dao", ["id"], unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_transaction_dao_id"), table_name="transaction_dao")
+    op.drop_table("transaction_dao")
+    op.drop_index(op.f("ix_pool_dao_id"), table_name="pool_dao")
+    op.drop_index(op.f("ix_pool_dao_address"), table_name="pool_dao")
+    op.drop_table("pool_dao")
+    op.drop_index(
+        op.f("ix_ton_proof_payload_dao_id"),
+        table_name="ton_proof_payload_dao",
+    )
+    op.drop_table("ton_proof_payload_dao")
+    op.drop_index(op.f("ix_asset_dao_id"), table_name="asset_dao")
+    op.drop_index(
+        op.f("ix_asset_dao_contract_address"), table_name="asset_dao"
+    )
+    op.drop_table("asset_dao")
+    sa.Enum(name="assetkind").drop(op.get_bind(), checkfirst=True)
+    op.drop_index(op.f("ix_account_dao_id"), table_name="account_dao")
+    op.drop_index(op.f("ix_account_dao_address"), table_name="account_dao")
+    op.drop_table("account_dao")
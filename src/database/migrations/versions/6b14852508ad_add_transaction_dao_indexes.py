@@ -0,0 +1,46 @@
+"""add transaction_dao indexes
+
+Revision ID: 6b14852508ad
+Revises: 6b8d33269124
+Create Date: 2026-10-18 11:48:30.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "6b14852508ad"
+down_revision: Union[str, None] = "6b8d33269124"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_transaction_dao_unconfirmed_valid_until",
+        "transaction_dao",
+        ["valid_until"],
+        unique=False,
+        sqlite_where=sa.text("is_confirmed = 0"),
+        postgresql_where=sa.text("is_confirmed = false"),
+    )
+    op.create_index(
+        "ix_transaction_dao_user_wallet_address_is_confirmed_id",
+        "transaction_dao",
+        ["user_wallet_address", "is_confirmed", "id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_transaction_dao_user_wallet_address_is_confirmed_id",
+        table_name="transaction_dao",
+    )
+    op.drop_index(
+        "ix_transaction_dao_unconfirmed_valid_until",
+        table_name="transaction_dao",
+    )
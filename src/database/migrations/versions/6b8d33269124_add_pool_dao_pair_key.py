@@ -0,0 +1,60 @@
+"""add pool_dao.pair_key
+
+Revision ID: 6b8d33269124
+Revises: 30f3d72ac62b
+Create Date: 2026-10-18 11:21:09.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "6b8d33269124"
+down_revision: Union[str, None] = "30f3d72ac62b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "pool_dao", sa.Column("pair_key", sa.String(), nullable=True)
+    )
+
+    # Same key as PoolDao.get_pair_key, sorted in Python so the order
+    # doesn't depend on the database collation.
+    pool_dao = sa.table(
+        "pool_dao",
+        sa.column("id", sa.Integer),
+        sa.column("token0_address", sa.String),
+        sa.column("token1_address", sa.String),
+        sa.column("pair_key", sa.String),
+    )
+    connection = op.get_bind()
+    pools = connection.execute(
+        sa.select(
+            pool_dao.c.id,
+            pool_dao.c.token0_address,
+            pool_dao.c.token1_address,
+        )
+    ).all()
+    for pool_id, token0_address, token1_address in pools:
+        connection.execute(
+            sa.update(pool_dao)
+            .where(pool_dao.c.id == pool_id)
+            .values(
+                pair_key=":".join(sorted((token0_address, token1_address)))
+            )
+        )
+
+    op.create_index(
+        op.f("ix_pool_dao_pair_key"), "pool_dao", ["pair_key"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_pool_dao_pair_key"), table_name="pool_dao")
+    with op.batch_alter_table("pool_dao") as batch_op:
+        batch_op.drop_column("pair_key")
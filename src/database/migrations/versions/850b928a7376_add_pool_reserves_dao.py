@@ -0,0 +1,56 @@
+"""add pool_reserves_dao
+
+Revision ID: 850b928a7376
+Revises: 6b14852508ad
+Create Date: 2026-10-18 12:15:52.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = "850b928a7376"
+down_revision: Union[str, None] = "6b14852508ad"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "pool_reserves_dao",
+        sa.Column("pool_address", sa.String(), nullable=False),
+        sa.Column("resolution", sa.Integer(), nullable=False),
+        sa.Column("timestamp", sa.BigInteger(), nullable=False),
+        sa.Column("reserve0", sa.BigInteger(), nullable=False),
+        sa.Column("reserve1", sa.BigInteger(), nullable=False),
+        sa.Column("samples", sa.Integer(), nullable=False),
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("pool_address", "resolution", "timestamp"),
+    )
+    op.create_index(
+        op.f("ix_pool_reserves_dao_id"),
+        "pool_reserves_dao",
+        ["id"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_pool_reserves_dao_resolution_timestamp",
+        "pool_reserves_dao",
+        ["resolution", "timestamp"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_pool_reserves_dao_resolution_timestamp",
+        table_name="pool_reserves_dao",
+    )
+    op.drop_index(
+        op.f("ix_pool_reserves_dao_id"), table_name="pool_reserves_dao"
+    )
+    op.drop_table("pool_reserves_dao")
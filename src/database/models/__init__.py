@@ -1,7 +1,10 @@
 from .account import AccountDao, TonProofPayloadDao
 from .base import Base
 from .dex import AssetDao, PoolDao
+from .jetton_wallet import JettonWalletDao
+from .pool_reserves import PoolReservesDao
 from .transaction import TransactionDao
+from .worker_lease import WorkerLeaseDao
 
 __all__ = [
     "AccountDao",
@@ -9,5 +12,8 @@ __all__ = [
     "Base",
     "AssetDao",
     "PoolDao",
+    "JettonWalletDao",
+    "PoolReservesDao",
     "TransactionDao",
+    "WorkerLeaseDao",
 ]
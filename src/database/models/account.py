@@ -15,7 +15,15 @@ class AccountDao(Base):
         String, nullable=False, unique=True, index=True
     )
     affiliate_id: Mapped[str] = mapped_column(
-        BigInteger, ForeignKey("account_dao.id"), nullable=True
+        BigInteger, ForeignKey("account_dao.id"), nullable=True, index=True
+    )
+    # Denormalized referral stats, kept up to date when referrals sign up
+    # and their swaps are confirmed.
+    referral_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
+    )
+    referral_swap_count: Mapped[int] = mapped_column(
+        BigInteger, nullable=False, default=0
     )
 
     referrals: Mapped[List["AccountDao"]] = relationship(
@@ -34,5 +42,10 @@ class AccountDao(Base):
 
 
 class TonProofPayloadDao(Base):
-    payload: Mapped[str] = mapped_column(String, nullable=False)
+    payload: Mapped[str] = mapped_column(
+        String, nullable=False, unique=True, index=True
+    )
     ttl: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    expires_at: Mapped[int] = mapped_column(
+        BigInteger, nullable=True, index=True
+    )
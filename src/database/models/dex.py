@@ -1,5 +1,5 @@
 from enum import Enum as StrEnum
-from typing import Any, Dict
+from typing import Any, ClassVar, Dict, Set
 
 from sqlalchemy import (
     BigInteger,
@@ -42,23 +42,23 @@ class AssetDao(Base):
     third_party_price_usd: Mapped[float] = mapped_column(Float, nullable=True)
     third_party_usd_price: Mapped[float] = mapped_column(Float, nullable=True)
 
-    def update(self, **kwargs):
-        update_keys = {
-            "symbol",
-            "default_symbol",
-            "blacklisted",
-            "community",
-            "deprecated",
-            "dex_price_usd",
-            "dex_usd_price",
-            "display_name",
-            "image_url",
-            "third_party_price_usd",
-            "third_party_usd_price",
-        }
+    update_keys: ClassVar[Set[str]] = {
+        "symbol",
+        "default_symbol",
+        "blacklisted",
+        "community",
+        "deprecated",
+        "dex_price_usd",
+        "dex_usd_price",
+        "display_name",
+        "image_url",
+        "third_party_price_usd",
+        "third_party_usd_price",
+    }
 
+    def update(self, **kwargs):
         for key, value in kwargs.items():
-            if key in update_keys:
+            if key in self.update_keys:
                 setattr(self, key, value)
 
     @staticmethod
@@ -114,6 +114,7 @@ class PoolDao(Base):
         nullable=False,
     )
     token1_balance: Mapped[float] = mapped_column(Float, nullable=True)
+    pair_key: Mapped[str] = mapped_column(String, nullable=True, index=True)
 
     token0: Mapped[AssetDao] = relationship(
         "AssetDao",
@@ -124,35 +125,48 @@ class PoolDao(Base):
         foreign_keys=[token1_address],
     )
 
+    update_keys: ClassVar[Set[str]] = {
+        "apy_1d",
+        "apy_30d",
+        "apy_7d",
+        "collected_token0_protocol_fee",
+        "collected_token1_protocol_fee",
+        "deprecated",
+        "lp_account_address",
+        "lp_balance",
+        "lp_fee",
+        "lp_price_usd",
+        "lp_total_supply",
+        "lp_total_supply_usd",
+        "lp_wallet_address",
+        "protocol_fee",
+        "protocol_fee_address",
+        "ref_fee",
+        "reserve0",
+        "reserve1",
+        "router_address",
+        "token0_balance",
+        "token1_balance",
+    }
+
+    @staticmethod
+    def get_pair_key(token0_address: str, token1_address: str) -> str:
+        return ":".join(sorted((token0_address, token1_address)))
+
     @staticmethod
     def from_dict(pool_data: Dict[str, Any]) -> "PoolDao":
-        return PoolDao(**pool_data)
+        pool = PoolDao(**pool_data)
+        pool.pair_key = PoolDao.get_pair_key(
+            pool.token0_address, pool.token1_address
+        )
 
-    def update(self, **kwargs) -> None:
-        update_keys = {
-            "apy_1d",
-            "apy_30d",
-            "apy_7d",
-            "collected_token0_protocol_fee",
-            "collected_token1_protocol_fee",
-            "deprecated",
-            "lp_account_address",
-            "lp_balance",
-            "lp_fee",
-            "lp_price_usd",
-            "lp_total_supply",
-            "lp_total_supply_usd",
-            "lp_wallet_address",
-            "protocol_fee",
-            "protocol_fee_address",
-            "ref_fee",
-            "reserve0",
-            "reserve1",
-            "router_address",
-            "token0_balance",
-            "token1_balance",
-        }
+        return pool
 
+    def update(self, **kwargs) -> None:
         for key, value in kwargs.items():
-            if key in update_keys:
+            if key in self.update_keys:
                 setattr(self, key, value)
+
+        self.pair_key = PoolDao.get_pair_key(
+            self.token0_address, self.token1_address
+        )
@@ -0,0 +1,14 @@
+from sqlalchemy import String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class JettonWalletDao(Base):
+    __table_args__ = (UniqueConstraint("jetton_address", "owner_address"),)
+
+    jetton_address: Mapped[str] = mapped_column(String, nullable=False)
+    owner_address: Mapped[str] = mapped_column(
+        String, nullable=False, index=True
+    )
+    wallet_address: Mapped[str] = mapped_column(String, nullable=False)
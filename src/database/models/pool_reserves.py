@@ -0,0 +1,22 @@
+from sqlalchemy import BigInteger, Index, Integer, String, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class PoolReservesDao(Base):
+    __table_args__ = (
+        UniqueConstraint("pool_address", "resolution", "timestamp"),
+        Index(
+            "ix_pool_reserves_dao_resolution_timestamp",
+            "resolution",
+            "timestamp",
+        ),
+    )
+
+    pool_address: Mapped[str] = mapped_column(String, nullable=False)
+    resolution: Mapped[int] = mapped_column(Integer, nullable=False)
+    timestamp: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    reserve0: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    reserve1: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    samples: Mapped[int] = mapped_column(Integer, nullable=False, default=1)
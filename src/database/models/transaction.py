@@ -1,6 +1,6 @@
 from typing import TYPE_CHECKING
 
-from sqlalchemy import BigInteger, ForeignKey, String, Boolean
+from sqlalchemy import BigInteger, ForeignKey, Index, String, Boolean, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from .base import Base
@@ -10,6 +10,23 @@ if TYPE_CHECKING:
 
 
 class TransactionDao(Base):
+    __table_args__ = (
+        # Only unconfirmed swaps are polled, the partial index stays small
+        # however large the table grows.
+        Index(
+            "ix_transaction_dao_unconfirmed_valid_until",
+            "valid_until",
+            sqlite_where=text("is_confirmed = 0"),
+            postgresql_where=text("is_confirmed = false"),
+        ),
+        Index(
+            "ix_transaction_dao_user_wallet_address_is_confirmed_id",
+            "user_wallet_address",
+            "is_confirmed",
+            "id",
+        ),
+    )
+
     account_id: Mapped[int] = mapped_column(
         BigInteger, ForeignKey("account_dao.id"), nullable=False
     )
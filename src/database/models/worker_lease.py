@@ -0,0 +1,12 @@
+from sqlalchemy import BigInteger, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class WorkerLeaseDao(Base):
+    worker_id: Mapped[int] = mapped_column(
+        Integer, nullable=False, unique=True, index=True
+    )
+    holder: Mapped[str] = mapped_column(String, nullable=False)
+    expires_at: Mapped[int] = mapped_column(BigInteger, nullable=False)
@@ -0,0 +1,52 @@
+from typing import Any, Dict, Iterable, List, Type
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Base
+
+
+def _get_insert(dialect_name: str):
+    if dialect_name == "postgresql":
+        return postgresql.insert
+    if dialect_name == "sqlite":
+        return sqlite.insert
+
+    raise NotImplementedError(f"Upsert is not supported for {dialect_name}")
+
+
+async def upsert(
+    session: AsyncSession,
+    model: Type[Base],
+    rows: List[Dict[str, Any]],
+    index_elements: List[str],
+    update_keys: Iterable[str],
+    chunk_size: int = 1000,
+) -> int:
+    if not rows:
+        return 0
+
+    insert = _get_insert(session.bind.dialect.name)
+
+    # One statement is compiled and executed for every chunk of rows with
+    # executemany, multi-row VALUES would be recompiled for each chunk and
+    # hit the bound parameter limit of SQLite.
+    statement = insert(model)
+    update_keys = list(update_keys)
+    if update_keys:
+        statement = statement.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={key: statement.excluded[key] for key in update_keys},
+        )
+    else:
+        statement = statement.on_conflict_do_nothing(
+            index_elements=index_elements
+        )
+
+    batches = 0
+    for start in range(0, len(rows), chunk_size):
+        end = start + chunk_size
+        await session.execute(statement, rows[start:end])
+        batches += 1
+
+    return batches
@@ -0,0 +1,69 @@
+import logging
+import os
+import socket
+import time
+import uuid
+
+from src.config import config
+from src.utils.snowflake import MAX_WORKER_ID
+
+from .dal import transaction_dal, worker_lease_dal
+
+logger = logging.getLogger("worker_lease")
+
+
+class WorkerLease:
+    def __init__(self):
+        self.holder = (
+            f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        )
+        self.worker_id: int | None = None
+
+    async def acquire(self) -> int:
+        now = int(time.time())
+        expires_at = now + int(config.server.worker_lease_ttl)
+        leased = await worker_lease_dal.get_leased_worker_ids(now)
+
+        for worker_id in range(MAX_WORKER_ID + 1):
+            if worker_id in leased:
+                continue
+
+            if await worker_lease_dal.try_lease_worker_id(
+                worker_id, self.holder, now, expires_at
+            ):
+                self.worker_id = worker_id
+                transaction_dal.set_worker_id(worker_id)
+
+                logger.info("Leased worker id %d", worker_id)
+                return worker_id
+
+        raise RuntimeError("No free worker id left to lease")
+
+    async def renew(self):
+        now = int(time.time())
+
+        try:
+            renewed = await worker_lease_dal.renew_worker_lease(
+                self.worker_id,
+                self.holder,
+                now,
+                now + int(config.server.worker_lease_ttl),
+            )
+        except Exception:
+            logger.exception("Failed to renew worker id %d", self.worker_id)
+            return
+
+        # The lease expired and may be held by another worker by now, ids
+        # are issued under a new one from here on.
+        if not renewed:
+            logger.warning("Lost the lease of worker id %d", self.worker_id)
+            await self.acquire()
+
+    async def release(self):
+        if self.worker_id is not None:
+            await worker_lease_dal.release_worker_lease(
+                self.worker_id, self.holder
+            )
+
+
+worker_lease = WorkerLease()
@@ -1,70 +1,210 @@
-from src.database import database
+import asyncio
+import logging
+import time
+from contextlib import aclosing
+from typing import List
+
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.config import config
 from src.database.dal import asset_dal, pool_dal, transaction_dal
-from src.database.models import AssetDao, PoolDao
+from src.database.models.dex import AssetKind
+from src.ton.jetton_wallet_cache import jetton_wallet_cache
+from src.ton.tonapi_scheduler import Priority, request_priority
+from src.utils.rate_limiter import RateLimiter
+
+from .http_api import check_swap_transaction, iter_assets, iter_pools
+from .models import Asset, Pool
+from .pool_reserves import pool_reserves
+from .pool_snapshot import pool_snapshot
+from .routing import pool_graph
+from .ton_rates import ton_rate_table
+from .sync_state import SyncState
+
+logger = logging.getLogger("data_manager")
+
+
+class SwapSweepStats(BaseModel):
+    checked: int = 0
+    confirmed: int = 0
+    failed: int = 0
+    duration: float = 0
+
+
+assets_sync_state = SyncState("assets")
+pools_sync_state = SyncState("pools")
+swap_sweep_stats = SwapSweepStats()
+status_check_rate_limiter = RateLimiter(config.ston_fi.status_check_rps)
+
+
+async def _save_assets(session: AsyncSession, assets: List[Asset]):
+    started_at = time.perf_counter()
+
+    batches = await asset_dal.upsert_assets(
+        session,
+        [
+            asset.model_dump(exclude=["balance", "wallet_address"])
+            for asset in assets
+        ],
+    )
 
-from .http_api import get_assets, get_pools, update_swap_transaction
+    assets_sync_state.add_batches(batches, time.perf_counter() - started_at)
+
+
+async def _save_pools(session: AsyncSession, pools: List[Pool]):
+    started_at = time.perf_counter()
+
+    batches = await pool_dal.upsert_pools(
+        session, [pool.model_dump() for pool in pools]
+    )
+
+    pools_sync_state.add_batches(batches, time.perf_counter() - started_at)
 
 
 async def update_assets():
+    assets_sync_state.start_run()
+    success = True
+    changed = 0
+
+    # Changed records are upserted chunk by chunk as the payload streams in
+    # and committed once, a failed fetch or write rolls back the whole run.
     try:
-        assets = await get_assets()
+        async with asset_dal.create_assets_session() as session:
+            async with aclosing(
+                iter_assets(
+                    sync_state=assets_sync_state,
+                    chunk_size=config.ston_fi.sync_chunk_size,
+                    streaming=config.ston_fi.sync_streaming,
+                )
+            ) as assets_chunks:
+                async for assets_chunk in assets_chunks:
+                    changed += len(assets_chunk)
+                    await _save_assets(session, assets_chunk)
     except Exception:
-        return
+        logger.exception("Failed to sync assets")
+        assets_sync_state.rollback_changes(changed)
+        success = False
+    else:
+        assets_sync_state.commit_changes(changed)
+
+    assets_sync_state.finish_run(success)
+
+    try:
+        await prewarm_router_wallets()
+    except Exception:
+        logger.exception("Failed to prewarm router jetton wallets")
 
-    for new_asset_data in assets.asset_list:
-        try:
-            async with database.create_session() as session:
-                asset_data = await asset_dal.get_asset_by_contract_address(
-                    new_asset_data.contract_address
-                )
 
-                if asset_data:
-                    asset_data.update(**new_asset_data.model_dump())
-                else:
-                    asset_data = AssetDao.from_dict(
-                        new_asset_data.model_dump(
-                            exclude=["balance", "wallet_address"],
-                        )
-                    )
-                    session.add(asset_data)
+async def prewarm_router_wallets():
+    assets = await asset_dal.get_assets_list()
 
-                await session.commit()
-        except Exception:
-            # print(e)
-            continue
+    jetton_addresses = [
+        asset.contract_address
+        for asset in assets
+        if asset.kind != AssetKind.TON
+    ]
+    jetton_addresses.append(config.ston_fi.proxy_ton_address)
+
+    with request_priority(Priority.BACKGROUND):
+        await jetton_wallet_cache.prewarm(
+            jetton_contract_addresses=jetton_addresses,
+            owner_wallet_address=config.ston_fi.router_address,
+            concurrency=config.ton.jetton_wallet_prewarm_concurrency,
+        )
 
 
 async def update_pools():
+    pools_sync_state.start_run()
+    success = True
+    changed = 0
+
     try:
-        new_pools = await get_pools()
+        async with pool_dal.create_pools_session() as session:
+            async with aclosing(
+                iter_pools(
+                    sync_state=pools_sync_state,
+                    chunk_size=config.ston_fi.sync_chunk_size,
+                    streaming=config.ston_fi.sync_streaming,
+                )
+            ) as pools_chunks:
+                async for pools_chunk in pools_chunks:
+                    changed += len(pools_chunk)
+                    await _save_pools(session, pools_chunk)
     except Exception:
-        return
+        logger.exception("Failed to sync pools")
+        pools_sync_state.rollback_changes(changed)
+        success = False
+    else:
+        pools_sync_state.commit_changes(changed)
 
-    pools = await pool_dal.get_pools(include_deprecated=True)
-    pools_dict = {pool.address: pool for pool in pools}
+    pools_sync_state.finish_run(success)
 
-    for new_pool_data in new_pools.pool_list:
-        try:
-            pool_data = pools_dict.get(new_pool_data.address, None)
+    try:
+        await pool_snapshot.load()
+    except Exception:
+        logger.exception("Failed to reload pool snapshot")
 
-            if not pool_data:
-                pool_data = PoolDao.from_dict(
-                    {
-                        **new_pool_data.model_dump(),
-                    }
-                )
-            else:
-                pool_data.update(**new_pool_data.model_dump())
+    # Rebuilt from the committed snapshot, so the graph doesn't need the
+    # changed pools of the run kept around.
+    try:
+        await pool_graph.load()
+    except Exception:
+        logger.exception("Failed to update pool graph")
+
+    try:
+        pool_reserves.record_pools(await pool_snapshot.get_pools())
+        await pool_reserves.maintain()
+    except Exception:
+        logger.exception("Failed to store pool reserves")
 
-            async with database.create_session() as session:
-                session.add(pool_data)
-                await session.commit()
-        except Exception:
-            pass
+    try:
+        await ton_rate_table.load()
+    except Exception:
+        logger.exception("Failed to rebuild TON rates")
 
 
 async def update_swap_transactions():
+    global swap_sweep_stats
+
+    started_at = time.perf_counter()
+    stats = SwapSweepStats()
+
     transactions = await transaction_dal.get_unconfirmed_swap_transactions()
+    pending = iter(transactions)
+    confirmed_ids = []
+
+    async def worker():
+        for transaction in pending:
+            await status_check_rate_limiter.acquire()
+
+            try:
+                if await check_swap_transaction(transaction):
+                    confirmed_ids.append(transaction.id)
+            except Exception as e:
+                stats.failed += 1
+                logger.warning(
+                    "Failed to check swap transaction %s: %r",
+                    transaction.query_id,
+                    e,
+                )
+
+            stats.checked += 1
+
+    await asyncio.gather(
+        *(worker() for _ in range(config.ston_fi.status_check_concurrency))
+    )
+
+    await transaction_dal.set_transactions_confirmed(confirmed_ids)
+
+    stats.confirmed = len(confirmed_ids)
+    stats.duration = time.perf_counter() - started_at
+    swap_sweep_stats = stats
 
-    for transaction in transactions:
-        await update_swap_transaction(transaction)
+    logger.info(
+        "swap sweep: %d checked, %d confirmed, %d failed, %.3fs",
+        stats.checked,
+        stats.confirmed,
+        stats.failed,
+        stats.duration,
+    )
@@ -1,3 +1,13 @@
 class NotEnoughLiquidityError(Exception):
     code: str = "insufficient_pool_liquidity"
     pass
+
+
+class AssetRateNotFoundError(Exception):
+    code: str = "asset_rate_not_found"
+    pass
+
+
+class RouteNotFoundError(Exception):
+    code: str = "route_not_found"
+    pass
@@ -1,13 +1,20 @@
-from typing import List
+import json
+import logging
+from functools import partial
+from typing import Any, AsyncIterator, Dict, List, Type
 from urllib.parse import urlencode
 
 import httpx
+import ijson
+from pydantic import BaseModel, ValidationError
 
 from src.config import config
 from src.database.models import TransactionDao
-from src.database.dal import transaction_dal
 from src.dex.utils import calculate_fee_in_nanotons
+from src.utils.single_flight import SingleFlight
 
+from .http_client import StonFiClientFactory
+from .sync_state import SyncState, create_payload_hash
 from .models import (
     Asset,
     Assets,
@@ -20,43 +27,171 @@ from .models import (
     SwapSimulateResponse,
 )
 
+logger = logging.getLogger("ston_fi_api")
 
-async def get_wallet_assets(wallet_address: str) -> List[Asset]:
+wallet_requests = SingleFlight(
+    ttl=config.ston_fi.wallet_cache_ttl,
+    max_size=config.ston_fi.wallet_cache_size,
+)
+
+
+async def _fetch_wallet_assets(wallet_address: str) -> List[Asset]:
     url = f"{config.ston_fi.base_url}/v1/wallets/{wallet_address}/assets"
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, timeout=30)
-        response.raise_for_status()
+    client = StonFiClientFactory.get_client()
 
-        data_dict = response.json()
+    response = await client.get(url)
+    response.raise_for_status()
+
+    data_dict = response.json()
 
     validated_assets = Assets.model_validate(data_dict)
 
     return validated_assets.asset_list
 
 
-async def get_assets() -> Assets:
-    url = f"{config.ston_fi.base_url}/v1/assets"
+async def _fetch_wallet_pools(wallet_address: str) -> List[Pool]:
+    url = f"{config.ston_fi.base_url}/v1/wallets/{wallet_address}/pools"
+
+    client = StonFiClientFactory.get_client()
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, timeout=30)
-        response.raise_for_status()
+    response = await client.get(url)
+    response.raise_for_status()
 
-        data_dict = response.json()
+    data_dict = response.json()
+
+    return Pools.model_validate(data_dict).pool_list
+
+
+async def get_wallet_assets(wallet_address: str) -> List[Asset]:
+    assets = await wallet_requests.do(
+        ("assets", wallet_address),
+        partial(_fetch_wallet_assets, wallet_address),
+    )
 
-        return Assets.model_validate(data_dict)
+    return list(assets)
 
 
-async def get_pools() -> Pools:
-    url = f"{config.ston_fi.base_url}/v1/pools"
+class _ResponseReader:
+    def __init__(self, response: httpx.Response):
+        self._chunks = response.aiter_bytes()
+        self.payload_hash = create_payload_hash()
+
+    async def read(self, size: int = -1) -> bytes:
+        if size == 0:
+            return b""
+
+        try:
+            data = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            return b""
+
+        self.payload_hash.update(data)
+
+        return data
+
+
+async def _iter_list(records: List[Dict[str, Any]]):
+    for record in records:
+        yield record
+
+
+async def _iter_records(
+    url: str,
+    list_key: str,
+    key_field: str,
+    model: Type[BaseModel],
+    sync_state: SyncState,
+    chunk_size: int,
+    streaming: bool,
+) -> AsyncIterator[List[BaseModel]]:
+    client = StonFiClientFactory.get_client()
+
+    async with client.stream(
+        "GET",
+        url,
+        headers=sync_state.conditional_headers(),
+    ) as response:
+        if response.status_code == httpx.codes.NOT_MODIFIED:
+            sync_state.set_not_modified()
+            return
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, timeout=30)
         response.raise_for_status()
 
-        data_dict = response.json()
+        if streaming:
+            reader = _ResponseReader(response)
+            records = ijson.items_async(
+                reader, f"{list_key}.item", use_float=True
+            )
+        else:
+            payload = await response.aread()
+            payload_hash = create_payload_hash()
+            payload_hash.update(payload)
+
+            sync_state.set_validators(
+                response.headers, payload_hash.hexdigest()
+            )
+            if not sync_state.stats.payload_changed:
+                sync_state.skip_all()
+                return
+
+            records = _iter_list(json.loads(payload)[list_key])
+
+        chunk = []
+        async for record in records:
+            if sync_state.is_record_unchanged(record.get(key_field), record):
+                continue
+
+            try:
+                chunk.append(model.model_validate(record))
+            except ValidationError as e:
+                sync_state.stats.invalid += 1
+                logger.warning("Skipping invalid %s record: %s", list_key, e)
+                continue
+
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+
+        if chunk:
+            yield chunk
+
+        if streaming:
+            sync_state.set_validators(
+                response.headers, reader.payload_hash.hexdigest()
+            )
+
 
-        return Pools.model_validate(data_dict)
+def iter_assets(
+    sync_state: SyncState,
+    chunk_size: int,
+    streaming: bool = True,
+) -> AsyncIterator[List[Asset]]:
+    return _iter_records(
+        url=f"{config.ston_fi.base_url}/v1/assets",
+        list_key="asset_list",
+        key_field="contract_address",
+        model=Asset,
+        sync_state=sync_state,
+        chunk_size=chunk_size,
+        streaming=streaming,
+    )
+
+
+def iter_pools(
+    sync_state: SyncState,
+    chunk_size: int,
+    streaming: bool = True,
+) -> AsyncIterator[List[Pool]]:
+    return _iter_records(
+        url=f"{config.ston_fi.base_url}/v1/pools",
+        list_key="pool_list",
+        key_field="address",
+        model=Pool,
+        sync_state=sync_state,
+        chunk_size=chunk_size,
+        streaming=streaming,
+    )
 
 
 async def simulate_swap(
@@ -66,19 +201,20 @@ async def simulate_swap(
     url = f"{config.ston_fi.base_url}/v1/{'reverse_' if reverse else ''}swap/simulate"  # noqa
 
     if int(swap_data.units) > 0:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                url=url,
-                params=swap_data.model_dump(exclude_none=True),
-            )
-            response.raise_for_status()
+        client = StonFiClientFactory.get_client()
 
-            data_dict = response.json()
-            data_dict["ton_fee_units"] = await calculate_fee_in_nanotons(
-                offer_amount=int(swap_data.units),
-                offer_contract_address=swap_data.offer_address,
-            )
-            response = SwapSimulateResponse.model_validate(data_dict)
+        response = await client.post(
+            url=url,
+            params=swap_data.model_dump(exclude_none=True),
+        )
+        response.raise_for_status()
+
+        data_dict = response.json()
+        data_dict["ton_fee_units"] = await calculate_fee_in_nanotons(
+            offer_amount=int(swap_data.units),
+            offer_contract_address=swap_data.offer_address,
+        )
+        response = SwapSimulateResponse.model_validate(data_dict)
     else:
         return None
 
@@ -91,20 +227,17 @@ async def simulate_swap(
 
 
 async def get_pools_for_wallet(wallet_address: str) -> List[Pool]:
-    url = f"{config.ston_fi.base_url}/v1/wallets/{wallet_address}/pools"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, timeout=30)
-        response.raise_for_status()
-
-        data_dict = response.json()
+    wallet_pools = await wallet_requests.do(
+        ("pools", wallet_address),
+        partial(_fetch_wallet_pools, wallet_address),
+    )
 
     pools = list(
         filter(
             lambda pool: pool.token0_balance is not None
             or pool.token1_balance is not None
             or pool.lp_balance is not None,
-            Pools.model_validate(data_dict).pool_list,
+            wallet_pools,
         )
     )
 
@@ -116,15 +249,10 @@ async def get_pool_for_wallet_by_assets_addresses(
     token0_address: str,
     token1_address: str,
 ) -> Pool | None:
-    url = f"{config.ston_fi.base_url}/v1/wallets/{wallet_address}/pools"
-
-    async with httpx.AsyncClient() as client:
-        response = await client.get(url, timeout=30)
-        response.raise_for_status()
-
-        data_dict = response.json()
-
-    pools = Pools.model_validate(data_dict).pool_list
+    pools = await wallet_requests.do(
+        ("pools", wallet_address),
+        partial(_fetch_wallet_pools, wallet_address),
+    )
 
     for pool in pools:
         if {
@@ -139,7 +267,7 @@ async def get_pool_for_wallet_by_assets_addresses(
     return None
 
 
-async def update_swap_transaction(transaction: TransactionDao):
+async def check_swap_transaction(transaction: TransactionDao) -> bool:
     url = f"{config.ston_fi.base_url}/v1/swap/status"
 
     request_data = CheckTransactionRequest(
@@ -150,20 +278,19 @@ async def update_swap_transaction(transaction: TransactionDao):
 
     params = urlencode(request_data.model_dump(exclude_none=True))
 
-    async with httpx.AsyncClient() as client:
-        response = await client.get(
-            url=url,
-            params=params,
-            timeout=30,
-        )
-        response.raise_for_status()
+    client = StonFiClientFactory.get_client()
 
-        data_dict = response.json()
+    response = await client.get(
+        url=url,
+        params=params,
+    )
+    response.raise_for_status()
+
+    data_dict = response.json()
 
     if data_dict["@type"] == CheckTransactionResponseType.NOT_FOUND.value:
-        return
+        return False
 
     response = CheckTransactionResponse.model_validate(data_dict)
 
-    if response.exit_code == "swap_ok":
-        await transaction_dal.set_transaction_confirmed(transaction.id)
+    return response.exit_code == "swap_ok"
@@ -0,0 +1,67 @@
+from typing import Any, Dict
+
+import httpx
+from pydantic import BaseModel, computed_field
+
+from src.config import config
+
+
+class ConnectionStats(BaseModel):
+    requests: int = 0
+    connections_opened: int = 0
+    tls_handshakes: int = 0
+
+    @computed_field
+    @property
+    def connections_reused(self) -> int:
+        return max(self.requests - self.connections_opened, 0)
+
+
+class StonFiClientFactory:
+    client: httpx.AsyncClient | None = None
+    stats: ConnectionStats = ConnectionStats()
+
+    @classmethod
+    async def _trace(cls, event_name: str, info: Dict[str, Any]):
+        if event_name == "connection.connect_tcp.complete":
+            cls.stats.connections_opened += 1
+        elif event_name == "connection.start_tls.complete":
+            cls.stats.tls_handshakes += 1
+
+    @classmethod
+    async def _on_request(cls, request: httpx.Request):
+        cls.stats.requests += 1
+        request.extensions["trace"] = cls._trace
+
+    @classmethod
+    def init_client(cls) -> httpx.AsyncClient:
+        settings = config.ston_fi
+
+        cls.client = httpx.AsyncClient(
+            http2=settings.http2,
+            limits=httpx.Limits(
+                max_connections=settings.max_connections,
+                max_keepalive_connections=settings.max_keepalive_connections,
+                keepalive_expiry=settings.keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(
+                settings.timeout,
+                connect=settings.connect_timeout,
+            ),
+            event_hooks={"request": [cls._on_request]},
+        )
+
+        return cls.client
+
+    @classmethod
+    def get_client(cls) -> httpx.AsyncClient:
+        if cls.client is None or cls.client.is_closed:
+            cls.init_client()
+
+        return cls.client
+
+    @classmethod
+    async def close_client(cls):
+        if cls.client is not None:
+            await cls.client.aclose()
+            cls.client = None
@@ -1,16 +1,18 @@
+import asyncio
 import time
 from typing import List
 
 from tonsdk.utils import Address
 
 from src.config import config
-from src.database.dal import pool_dal
 from src.dex.http_api import get_pools_for_wallet
 from src.dex.models.transaction import MessageData, TransactionData
 from src.dex.ston_fi_contracts.router import Router
 from src.utils.address import validate_address
+from src.utils.timing import timed, track_latency
 
 from .models.liquidity import SimulateProvideLiquidityResponse
+from .pool_snapshot import pool_snapshot
 from .ston_fi_contracts.router_factory import RouterFactory
 
 PROXY_TON_ADDRESS = validate_address(config.ston_fi.proxy_ton_address)
@@ -51,6 +53,7 @@ async def create_provide_liquidity_message(
     return message_data
 
 
+@track_latency("provide_liquidity")
 async def provide_liquidity(
     user_wallet_address: str,
     token0_address: str,
@@ -61,22 +64,26 @@ async def provide_liquidity(
 ) -> List[MessageData]:
     router = RouterFactory.get_router()
 
-    token0_send_message = await create_provide_liquidity_message(
-        router=router,
-        user_wallet_address=user_wallet_address,
-        send_token_address=token0_address,
-        second_token_address=token1_address,
-        send_amount=token0_amount,
-        min_lp_out=min_lp_out,
-    )
-
-    token1_send_message = await create_provide_liquidity_message(
-        router=router,
-        user_wallet_address=user_wallet_address,
-        send_token_address=token1_address,
-        second_token_address=token0_address,
-        send_amount=token1_amount,
-        min_lp_out=min_lp_out,
+    token0_send_message, token1_send_message = await timed(
+        "build",
+        asyncio.gather(
+            create_provide_liquidity_message(
+                router=router,
+                user_wallet_address=user_wallet_address,
+                send_token_address=token0_address,
+                second_token_address=token1_address,
+                send_amount=token0_amount,
+                min_lp_out=min_lp_out,
+            ),
+            create_provide_liquidity_message(
+                router=router,
+                user_wallet_address=user_wallet_address,
+                send_token_address=token1_address,
+                second_token_address=token0_address,
+                send_amount=token1_amount,
+                min_lp_out=min_lp_out,
+            ),
+        ),
     )
 
     valid_until = int(time.time() + 60 * 10)
@@ -89,6 +96,7 @@ async def provide_liquidity(
     return transaction_data
 
 
+@track_latency("complete_provide_liquidity")
 async def complete_provide_liquidity(
     user_wallet_address: str,
     send_token_address: str,
@@ -117,6 +125,7 @@ async def complete_provide_liquidity(
     return transaction_data
 
 
+@track_latency("complete_provide_liquidity_activate")
 async def complete_provide_liquidity_activate(
     token0_amount: int,
     token1_amount: int,
@@ -142,6 +151,7 @@ async def complete_provide_liquidity_activate(
     return transaction_data
 
 
+@track_latency("simulate_provide_liquidity")
 async def simulate_provide_liquidity(
     token0_address: str,
     token1_address: str,
@@ -149,13 +159,19 @@ async def simulate_provide_liquidity(
     token1_amount: int,
     slippage_tolerance: float,
 ) -> SimulateProvideLiquidityResponse:
-    pool = await pool_dal.get_pool_for_assets(
-        token0_address=token0_address,
-        token1_address=token1_address,
+    pool = await timed(
+        "pool",
+        pool_snapshot.get_pool_for_assets(
+            token0_address=token0_address,
+            token1_address=token1_address,
+        ),
     )
 
     router = RouterFactory.get_router()
-    pool_data = await router.get_pool_data(pool_address=Address(pool.address))
+    pool_data = await timed(
+        "pool_data",
+        router.get_pool_data(pool_address=Address(pool.address)),
+    )
 
     token0_reserve, token1_reserve = (
         (pool_data.reserve0, pool_data.reserve1)
@@ -174,14 +190,17 @@ async def simulate_provide_liquidity(
             round(token1_amount / (token1_reserve + token1_amount), 4) * 100
         )
 
-    expected_tokens = await router.get_expected_tokens(
-        pool_address=pool.address,
-        token0_amount=token0_amount
-        if pool.token0_address == token0_address
-        else token1_amount,
-        token1_amount=token1_amount
-        if pool.token0_address == token0_address
-        else token0_amount,
+    expected_tokens = await timed(
+        "expected_tokens",
+        router.get_expected_tokens(
+            pool_address=pool.address,
+            token0_amount=token0_amount
+            if pool.token0_address == token0_address
+            else token1_amount,
+            token1_amount=token1_amount
+            if pool.token0_address == token0_address
+            else token0_amount,
+        ),
     )
 
     min_expected_tokens = int(expected_tokens * (1 - slippage_tolerance / 100))
@@ -196,6 +215,7 @@ async def simulate_provide_liquidity(
     )
 
 
+@track_latency("simulate_complete_provide_liquidity")
 async def simulate_complete_provide_liquidity(
     token0_address: str,
     token1_address: str,
@@ -213,16 +233,25 @@ async def simulate_complete_provide_liquidity(
             slippage_tolerance=slippage_tolerance,
         )
 
-    pool = await pool_dal.get_pool_for_assets(
-        token0_address=token0_address,
-        token1_address=token1_address,
+    pool = await timed(
+        "pool",
+        pool_snapshot.get_pool_for_assets(
+            token0_address=token0_address,
+            token1_address=token1_address,
+        ),
     )
 
     pool_address = Address(pool.address)
 
     router = RouterFactory.get_router()
 
-    pool_data = await router.get_pool_data(pool_address=pool_address)
+    pool_data, lp_account_data = await asyncio.gather(
+        timed("pool_data", router.get_pool_data(pool_address=pool_address)),
+        timed(
+            "lp_account_data",
+            router.get_lp_account_data(lp_account_address=lp_account_address),
+        ),
+    )
 
     token0_reserve, token1_reserve = (
         (pool_data.reserve0, pool_data.reserve1)
@@ -230,9 +259,6 @@ async def simulate_complete_provide_liquidity(
         else (pool_data.reserve1, pool_data.reserve0)
     )
 
-    lp_account_data = await router.get_lp_account_data(
-        lp_account_address=lp_account_address
-    )
     token0_balance, token1_balance = (
         (lp_account_data.token0_balance, lp_account_data.token1_balance)
         if pool.token0_address == token0_address
@@ -300,14 +326,17 @@ async def simulate_complete_provide_liquidity(
         send_amount = None
         send_token_address = None
 
-    expected_tokens = await router.get_expected_tokens(
-        pool_address=pool.address,
-        token0_amount=token0_amount
-        if pool.token0_address == token0_address
-        else token1_amount,
-        token1_amount=token1_amount
-        if pool.token0_address == token0_address
-        else token0_amount,
+    expected_tokens = await timed(
+        "expected_tokens",
+        router.get_expected_tokens(
+            pool_address=pool.address,
+            token0_amount=token0_amount
+            if pool.token0_address == token0_address
+            else token1_amount,
+            token1_amount=token1_amount
+            if pool.token0_address == token0_address
+            else token0_amount,
+        ),
     )
 
     min_expected_tokens = int(expected_tokens * (1 - slippage_tolerance / 100))
@@ -328,6 +357,7 @@ async def simulate_complete_provide_liquidity(
     )
 
 
+@track_latency("remove_liquidity")
 async def remove_liquidity(
     user_wallet_address: str,
     token0_address: str,
@@ -336,7 +366,7 @@ async def remove_liquidity(
 ) -> TransactionData:
     router = RouterFactory.get_router()
 
-    pools = await get_pools_for_wallet(user_wallet_address)
+    pools = await timed("pools", get_pools_for_wallet(user_wallet_address))
 
     pool = None
     for pool_data in pools:
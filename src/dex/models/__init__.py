@@ -5,11 +5,25 @@ from .check_transaction import (
     CheckTransactionResponse,
     CheckTransactionResponseType,
 )
-from .pool import Pool, PoolData, Pools
+from .pool import (
+    Pool,
+    PoolData,
+    PoolReservesResolution,
+    PoolReservesSeries,
+    Pools,
+)
 from .swap import (
+    SwapDepthPoint,
+    SwapDepthRequest,
+    SwapDepthResponse,
     SwapRequest,
+    SwapRouteHop,
+    SwapRouteRequest,
+    SwapRouteResponse,
     SwapSimulateRequest,
     SwapSimulateResponse,
+    SwapSplitLeg,
+    SwapSplitResponse,
 )
 
 __all__ = [
@@ -20,9 +34,19 @@ __all__ = [
     "Pool",
     "Pools",
     "PoolData",
+    "PoolReservesResolution",
+    "PoolReservesSeries",
     "SwapSimulateRequest",
     "SwapSimulateResponse",
+    "SwapSplitLeg",
+    "SwapSplitResponse",
+    "SwapDepthPoint",
+    "SwapDepthRequest",
+    "SwapDepthResponse",
     "SwapRequest",
+    "SwapRouteHop",
+    "SwapRouteRequest",
+    "SwapRouteResponse",
     "CheckTransactionRequest",
     "CheckTransactionResponse",
     "CheckTransactionResponseType",
@@ -1,3 +1,4 @@
+from enum import Enum
 from typing import List
 from pydantic import BaseModel
 
@@ -76,3 +77,19 @@ class PoolData(BaseModel):
     protocol_fee_address: ValidatedAddress
     collected_token0_protocol_fee: int
     collected_token1_protocol_fee: int
+
+
+class PoolReservesResolution(str, Enum):
+    RAW = "raw"
+    MINUTES_5 = "5m"
+    HOUR_1 = "1h"
+    DAY_1 = "1d"
+
+
+class PoolReservesSeries(BaseModel):
+    pool_address: ValidatedAddress
+    resolution: PoolReservesResolution
+    timestamp: List[int]
+    reserve0: List[int]
+    reserve1: List[int]
+    samples: List[int]
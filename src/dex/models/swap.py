@@ -1,4 +1,6 @@
-from pydantic import BaseModel
+from typing import List
+
+from pydantic import BaseModel, Field
 
 from src.utils.address import ValidatedAddress, ValidatedAddressOrNone
 
@@ -28,6 +30,84 @@ class SwapSimulateResponse(BaseModel):
     ton_fee_units: int
 
 
+class SwapDepthRequest(BaseModel):
+    offer_address: ValidatedAddress
+    ask_address: ValidatedAddress
+    units: int = Field(gt=0)
+    points: int = Field(default=50, gt=0)
+    referral_address: ValidatedAddressOrNone = None
+
+
+class SwapDepthPoint(BaseModel):
+    offer_units: int
+    ask_units: int
+    fee_units: int
+    price_impact: float
+    swap_rate: float
+
+
+class SwapDepthResponse(BaseModel):
+    offer_address: ValidatedAddress
+    ask_address: ValidatedAddress
+    pool_address: ValidatedAddress
+    offer_reserve: int
+    ask_reserve: int
+    points: List[SwapDepthPoint]
+
+
+class SwapRouteRequest(BaseModel):
+    offer_address: ValidatedAddress
+    ask_address: ValidatedAddress
+    units: int = Field(gt=0)
+    slippage_tolerance: float
+    referral_address: ValidatedAddressOrNone = None
+    # Split simulations ignore it, their legs are direct swaps.
+    max_hops: int | None = None
+
+
+class SwapRouteHop(BaseModel):
+    pool_address: ValidatedAddress
+    offer_address: ValidatedAddress
+    ask_address: ValidatedAddress
+    offer_units: int
+    ask_units: int
+    fee_units: int
+    price_impact: float
+
+
+class SwapRouteResponse(BaseModel):
+    offer_address: ValidatedAddress
+    ask_address: ValidatedAddress
+    offer_units: int
+    ask_units: int
+    min_ask_units: int
+    router_address: ValidatedAddress
+    slippage_tolerance: float
+    swap_rate: float
+    ton_fee_units: int
+    hops: List[SwapRouteHop]
+
+
+class SwapSplitLeg(BaseModel):
+    offer_units: int
+    ask_units: int
+    min_ask_units: int
+    hops: List[SwapRouteHop]
+
+
+class SwapSplitResponse(BaseModel):
+    offer_address: ValidatedAddress
+    ask_address: ValidatedAddress
+    offer_units: int
+    ask_units: int
+    min_ask_units: int
+    router_address: ValidatedAddress
+    slippage_tolerance: float
+    swap_rate: float
+    ton_fee_units: int
+    legs: List[SwapSplitLeg]
+
+
 class SwapRequest(BaseModel):
     userWalletAddress: ValidatedAddress
     offerJettonAddress: ValidatedAddress
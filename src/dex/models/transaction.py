@@ -2,7 +2,8 @@ from typing import List
 
 from pydantic import BaseModel
 
-from src.utils.address import ValidatedAddress
+from src.database.models import TransactionDao
+from src.utils.address import ValidatedAddress, ValidatedAddressOrNone
 
 
 class MessageData(BaseModel):
@@ -14,3 +15,34 @@ class MessageData(BaseModel):
 class TransactionData(BaseModel):
     valid_until: int
     messages: List[MessageData]
+
+
+class SwapTransaction(BaseModel):
+    query_id: int
+    router_address: ValidatedAddress
+    offer_jetton_address: ValidatedAddress
+    offer_amount: int
+    ask_jetton_address: ValidatedAddress
+    min_ask_amount: int
+    referral_address: ValidatedAddressOrNone = None
+    valid_until: int
+
+    @staticmethod
+    def from_transaction_dao(
+        transaction_dao: TransactionDao,
+    ) -> "SwapTransaction":
+        return SwapTransaction(
+            query_id=transaction_dao.query_id,
+            router_address=transaction_dao.router_address,
+            offer_jetton_address=transaction_dao.offer_jetton_address,
+            offer_amount=transaction_dao.offer_amount,
+            ask_jetton_address=transaction_dao.ask_jetton_address,
+            min_ask_amount=transaction_dao.min_ask_amount,
+            referral_address=transaction_dao.referral_address,
+            valid_until=transaction_dao.valid_until,
+        )
+
+
+class SwapTransactionsPage(BaseModel):
+    transactions: List[SwapTransaction]
+    next_cursor: int | None = None
@@ -1,11 +1,11 @@
 from tonsdk.utils import Address
 
-from src.database.dal import pool_dal
+from src.dex.pool_snapshot import pool_snapshot
 from src.dex.ston_fi_contracts.router_factory import RouterFactory
 
 
 async def get_pool_for_tokens(token_0_address: str, token_1_address: str):
-    pool = await pool_dal.get_pool_for_assets(
+    pool = await pool_snapshot.get_pool_for_assets(
         token0_address=token_0_address,
         token1_address=token_1_address,
     )
@@ -0,0 +1,216 @@
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from src.config import config
+from src.database.dal import pool_reserves_dal
+from src.database.models import PoolDao
+
+from .models import PoolReservesResolution
+
+logger = logging.getLogger("pool_reserves")
+
+RESOLUTION_SECONDS = {
+    PoolReservesResolution.RAW: 60,
+    PoolReservesResolution.MINUTES_5: 60 * 5,
+    PoolReservesResolution.HOUR_1: 60 * 60,
+    PoolReservesResolution.DAY_1: 60 * 60 * 24,
+}
+
+# Every resolution is rolled up from the next finer one.
+ROLLUPS = (
+    (PoolReservesResolution.RAW, PoolReservesResolution.MINUTES_5),
+    (PoolReservesResolution.MINUTES_5, PoolReservesResolution.HOUR_1),
+    (PoolReservesResolution.HOUR_1, PoolReservesResolution.DAY_1),
+)
+
+
+def _get_retentions() -> Dict[PoolReservesResolution, int]:
+    return {
+        PoolReservesResolution.RAW: config.pool_reserves.raw_retention,
+        PoolReservesResolution.MINUTES_5: (
+            config.pool_reserves.minutes_5_retention
+        ),
+        PoolReservesResolution.HOUR_1: config.pool_reserves.hour_1_retention,
+        PoolReservesResolution.DAY_1: config.pool_reserves.day_1_retention,
+    }
+
+
+def _get_rows(
+    resolution: int,
+    points: Dict[Tuple[str, int], Sequence[int]],
+) -> List[Dict[str, Any]]:
+    return [
+        {
+            "pool_address": pool_address,
+            "resolution": resolution,
+            "timestamp": timestamp,
+            "reserve0": reserve0,
+            "reserve1": reserve1,
+            "samples": samples,
+        }
+        for (pool_address, timestamp), (
+            reserve0,
+            reserve1,
+            samples,
+        ) in points.items()
+    ]
+
+
+class PoolReservesStats(BaseModel):
+    recorded: int = 0
+    buffered: int = 0
+    flushed: int = 0
+    rolled_up: int = 0
+    deleted: int = 0
+    maintained_at: float = 0
+    duration: float = 0
+
+
+class PoolReservesRecorder:
+    def __init__(self):
+        self.stats = PoolReservesStats()
+
+        # Raw points are buffered in memory, one per pool and minute, and
+        # written by the next maintenance run.
+        self._points: Dict[Tuple[str, int], Tuple[int, int, int]] = {}
+        self._rolled_up_at: Dict[PoolReservesResolution, int] = {}
+        self._lock = asyncio.Lock()
+
+    def record(
+        self,
+        pool_address: str,
+        reserve0: int,
+        reserve1: int,
+        timestamp: int | None = None,
+    ):
+        if timestamp is None:
+            timestamp = int(time.time())
+
+        key = (
+            pool_address,
+            timestamp
+            - timestamp % RESOLUTION_SECONDS[PoolReservesResolution.RAW],
+        )
+        point = self._points.get(key)
+        samples = point[2] + 1 if point is not None else 1
+
+        self._points[key] = (reserve0, reserve1, samples)
+
+        self.stats.recorded += 1
+        self.stats.buffered = len(self._points)
+
+    def record_pools(self, pools: Iterable[PoolDao]):
+        timestamp = int(time.time())
+
+        for pool in pools:
+            self.record(pool.address, pool.reserve0, pool.reserve1, timestamp)
+
+    async def maintain(self):
+        async with self._lock:
+            started_at = time.perf_counter()
+            now = int(time.time())
+
+            await self._flush()
+            await self._rollup(now)
+            await self._apply_retention(now)
+
+            self.stats.maintained_at = time.time()
+            self.stats.duration = time.perf_counter() - started_at
+
+            logger.debug(
+                "Pool reserves maintained in %.3fs", self.stats.duration
+            )
+
+    async def _flush(self):
+        points, self._points = self._points, {}
+        self.stats.buffered = 0
+
+        try:
+            await pool_reserves_dal.upsert_pool_reserves(
+                _get_rows(
+                    RESOLUTION_SECONDS[PoolReservesResolution.RAW], points
+                )
+            )
+        except Exception:
+            # Points recorded meanwhile are newer, they win over the
+            # returned ones.
+            for key, point in points.items():
+                self._points.setdefault(key, point)
+            self.stats.buffered = len(self._points)
+            raise
+
+        self.stats.flushed += len(points)
+
+    async def _rollup(self, now: int):
+        for source, target in ROLLUPS:
+            source_seconds = RESOLUTION_SECONDS[source]
+            target_seconds = RESOLUTION_SECONDS[target]
+
+            # A target bucket holds the last reserves of its source points,
+            # so it only changes once a new source point is written.
+            rolled_up_at = self._rolled_up_at.get(target)
+            if (
+                rolled_up_at is not None
+                and now - rolled_up_at < source_seconds
+            ):
+                continue
+
+            start = rolled_up_at if rolled_up_at is not None else now
+            start -= start % target_seconds
+            if rolled_up_at is None:
+                start -= target_seconds
+
+            rows = await pool_reserves_dal.get_pool_reserves_since(
+                source_seconds, start
+            )
+
+            buckets: Dict[Tuple[str, int], List[int]] = {}
+            for pool_address, timestamp, reserve0, reserve1, samples in rows:
+                key = (pool_address, timestamp - timestamp % target_seconds)
+                bucket = buckets.get(key)
+
+                if bucket is None:
+                    buckets[key] = [reserve0, reserve1, samples]
+                else:
+                    bucket[0] = reserve0
+                    bucket[1] = reserve1
+                    bucket[2] += samples
+
+            await pool_reserves_dal.upsert_pool_reserves(
+                _get_rows(target_seconds, buckets)
+            )
+
+            self._rolled_up_at[target] = now
+            self.stats.rolled_up += len(buckets)
+
+    async def _apply_retention(self, now: int):
+        for resolution, retention in _get_retentions().items():
+            if retention <= 0:
+                continue
+
+            self.stats.deleted += (
+                await pool_reserves_dal.delete_pool_reserves_before(
+                    RESOLUTION_SECONDS[resolution], now - retention
+                )
+            )
+
+    async def get_series(
+        self,
+        pool_address: str,
+        resolution: PoolReservesResolution,
+        start: int,
+        end: int,
+    ) -> Dict[str, List[int]]:
+        return await pool_reserves_dal.get_pool_reserves_series(
+            pool_address,
+            RESOLUTION_SECONDS[resolution],
+            start,
+            end,
+        )
+
+
+pool_reserves = PoolReservesRecorder()
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List
+
+from pydantic import BaseModel
+
+from src.database.dal import pool_dal
+from src.database.models import PoolDao
+
+logger = logging.getLogger("pool_snapshot")
+
+
+class PoolSnapshotStats(BaseModel):
+    pools: int = 0
+    pairs: int = 0
+    reloads: int = 0
+    reloaded_at: float = 0
+    hits: int = 0
+    misses: int = 0
+
+
+class PoolSnapshot:
+    def __init__(self):
+        self.stats = PoolSnapshotStats()
+
+        self._pools: List[PoolDao] | None = None
+        self._pairs: Dict[str, PoolDao] = {}
+        self._load_lock = asyncio.Lock()
+
+    async def load(self):
+        pools = await pool_dal.get_pools(include_deprecated=True)
+
+        pairs: Dict[str, PoolDao] = {}
+        for pool in pools:
+            pair_key = PoolDao.get_pair_key(
+                pool.token0_address, pool.token1_address
+            )
+            current = pairs.get(pair_key)
+            if current is None or current.deprecated and not pool.deprecated:
+                pairs[pair_key] = pool
+
+        # Every index is built aside and swapped in without yielding to the
+        # event loop, so readers see either the old or the new pool set.
+        self._pools = [pool for pool in pools if not pool.deprecated]
+        self._pairs = pairs
+
+        self.stats.pools = len(pools)
+        self.stats.pairs = len(pairs)
+        self.stats.reloads += 1
+        self.stats.reloaded_at = time.time()
+
+        logger.info(
+            "Reloaded pool snapshot: %d pools, %d pairs",
+            len(pools),
+            len(pairs),
+        )
+
+    async def ensure_loaded(self):
+        if self._pools is None:
+            # Concurrent first callers wait for a single load.
+            async with self._load_lock:
+                if self._pools is None:
+                    await self.load()
+
+    async def get_pool_for_assets(
+        self,
+        token0_address: str,
+        token1_address: str,
+    ) -> PoolDao | None:
+        await self.ensure_loaded()
+
+        pool = self._pairs.get(
+            PoolDao.get_pair_key(token0_address, token1_address)
+        )
+
+        if pool is None:
+            self.stats.misses += 1
+        else:
+            self.stats.hits += 1
+
+        return pool
+
+    async def get_pools(self) -> List[PoolDao]:
+        await self.ensure_loaded()
+
+        return self._pools
+
+
+pool_snapshot = PoolSnapshot()
@@ -0,0 +1,187 @@
+from typing import Tuple
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+from .exceptions import NotEnoughLiquidityError
+
+FEE_DIVIDER = 10000
+
+INT64_MAX = 2**63 - 1
+
+
+def _divc(numerator, denominator):
+    return -(-numerator // denominator)
+
+
+def get_amount_out(
+    amount_in: int,
+    reserve_in: int,
+    reserve_out: int,
+    lp_fee: int,
+    protocol_fee: int,
+    ref_fee: int,
+    has_ref: bool = False,
+) -> Tuple[int, int, int]:
+    # Same integer arithmetic as get_amount_out of the ston.fi v1 pool:
+    # floor division for the output, ceiling division for the fees.
+    if amount_in <= 0:
+        return (0, 0, 0)
+
+    amount_in_with_fee = amount_in * (FEE_DIVIDER - lp_fee)
+    base_out = (amount_in_with_fee * reserve_out) // (
+        reserve_in * FEE_DIVIDER + amount_in_with_fee
+    )
+
+    protocol_fee_out = 0
+    ref_fee_out = 0
+
+    if protocol_fee > 0:
+        protocol_fee_out = _divc(base_out * protocol_fee, FEE_DIVIDER)
+
+    if has_ref and ref_fee > 0:
+        ref_fee_out = _divc(base_out * ref_fee, FEE_DIVIDER)
+
+    base_out -= protocol_fee_out + ref_fee_out
+
+    return (base_out, protocol_fee_out, ref_fee_out)
+
+
+def _get_net_out(
+    base_out: int,
+    protocol_fee: int,
+    ref_fee: int,
+    has_ref: bool,
+) -> int:
+    net_out = base_out
+
+    if protocol_fee > 0:
+        net_out -= _divc(base_out * protocol_fee, FEE_DIVIDER)
+
+    if has_ref and ref_fee > 0:
+        net_out -= _divc(base_out * ref_fee, FEE_DIVIDER)
+
+    return net_out
+
+
+def get_amount_in(
+    amount_out: int,
+    reserve_in: int,
+    reserve_out: int,
+    lp_fee: int,
+    protocol_fee: int,
+    ref_fee: int,
+    has_ref: bool = False,
+) -> int:
+    if amount_out <= 0:
+        return 0
+
+    fees = protocol_fee + (ref_fee if has_ref else 0)
+    if fees >= FEE_DIVIDER:
+        raise NotEnoughLiquidityError()
+
+    # Smallest pool output that is still `amount_out` after the protocol
+    # and referral fees are taken from it.
+    base_out = _divc(amount_out * FEE_DIVIDER, FEE_DIVIDER - fees)
+    while _get_net_out(base_out, protocol_fee, ref_fee, has_ref) < amount_out:
+        base_out += 1
+    while (
+        base_out > amount_out
+        and _get_net_out(base_out - 1, protocol_fee, ref_fee, has_ref)
+        >= amount_out
+    ):
+        base_out -= 1
+
+    if base_out >= reserve_out:
+        raise NotEnoughLiquidityError()
+
+    return _divc(
+        base_out * reserve_in * FEE_DIVIDER,
+        (FEE_DIVIDER - lp_fee) * (reserve_out - base_out),
+    )
+
+
+def _as_integer_array(values: ArrayLike) -> np.ndarray:
+    array = np.asarray(values)
+
+    if array.dtype.kind not in "iuO":
+        raise TypeError("Quotes are computed from integer nano-units")
+
+    return array
+
+
+def get_amounts_out(
+    amounts_in: ArrayLike,
+    reserves_in: ArrayLike,
+    reserves_out: ArrayLike,
+    lp_fees: ArrayLike,
+    protocol_fees: ArrayLike,
+    ref_fees: ArrayLike,
+    has_ref: ArrayLike = False,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    arrays = np.broadcast_arrays(
+        *(
+            _as_integer_array(values)
+            for values in (
+                amounts_in,
+                reserves_in,
+                reserves_out,
+                lp_fees,
+                protocol_fees,
+                ref_fees,
+            )
+        ),
+        np.asarray(has_ref, dtype=bool),
+    )
+    if arrays[0].size == 0:
+        empty = np.zeros(arrays[0].shape, dtype=np.int64)
+        return (empty, empty.copy(), empty.copy())
+
+    (
+        amounts_in,
+        reserves_in,
+        reserves_out,
+        lp_fees,
+        protocol_fees,
+        ref_fees,
+        has_ref,
+    ) = arrays
+
+    max_amount_in = max(int(amounts_in.max()), 0)
+    max_reserve_in = int(reserves_in.max())
+    max_reserve_out = int(reserves_out.max())
+
+    # int64 is exact only while the widest product fits, which real jetton
+    # reserves rarely allow. Everything else falls back to object arrays:
+    # exact Python integers evaluated element by element, about as fast as
+    # calling get_amount_out in a loop, the batch is not vectorized then.
+    # An exact multi-limb int64 variant was measured slower than that for
+    # the few hundred points of a depth chart.
+    dtype = (
+        np.int64
+        if max_amount_in * FEE_DIVIDER * max_reserve_out <= INT64_MAX
+        and (max_reserve_in + max_amount_in) * FEE_DIVIDER <= INT64_MAX
+        else object
+    )
+
+    amounts_in = np.maximum(amounts_in, 0).astype(dtype)
+    reserves_in = reserves_in.astype(dtype)
+    reserves_out = reserves_out.astype(dtype)
+
+    amount_in_with_fee = amounts_in * (FEE_DIVIDER - lp_fees.astype(dtype))
+    denominator = reserves_in * FEE_DIVIDER + amount_in_with_fee
+    base_out = (amount_in_with_fee * reserves_out) // np.maximum(
+        denominator, 1
+    )
+
+    protocol_fee_out = _divc(
+        base_out * np.maximum(protocol_fees, 0).astype(dtype), FEE_DIVIDER
+    )
+    ref_fee_out = _divc(
+        base_out * np.where(has_ref, np.maximum(ref_fees, 0), 0).astype(dtype),
+        FEE_DIVIDER,
+    )
+
+    base_out = base_out - protocol_fee_out - ref_fee_out
+
+    return (base_out, protocol_fee_out, ref_fee_out)
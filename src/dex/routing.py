@@ -0,0 +1,481 @@
+import asyncio
+import logging
+import time
+from typing import Dict, Iterable, List, NamedTuple, Sequence, Set, Tuple
+
+import numpy as np
+from pydantic import BaseModel
+
+from src.database.models import PoolDao
+
+from .models import Pool
+from .pool_snapshot import pool_snapshot
+from .quote import FEE_DIVIDER, get_amount_out
+
+logger = logging.getLogger("routing")
+
+
+class PoolState(NamedTuple):
+    address: str
+    token0_address: str
+    token1_address: str
+    reserve0: int
+    reserve1: int
+    lp_fee: int
+    protocol_fee: int
+    ref_fee: int
+
+    @staticmethod
+    def from_pool(pool: Pool | PoolDao) -> "PoolState":
+        return PoolState(
+            address=pool.address,
+            token0_address=pool.token0_address,
+            token1_address=pool.token1_address,
+            reserve0=int(pool.reserve0),
+            reserve1=int(pool.reserve1),
+            lp_fee=int(pool.lp_fee or 0),
+            protocol_fee=int(pool.protocol_fee or 0),
+            ref_fee=int(pool.ref_fee or 0),
+        )
+
+    def get_reserves(self, offer_address: str) -> Tuple[int, int]:
+        if offer_address == self.token0_address:
+            return (self.reserve0, self.reserve1)
+
+        return (self.reserve1, self.reserve0)
+
+
+class RouteHop(NamedTuple):
+    pool: PoolState
+    offer_address: str
+    ask_address: str
+    offer_units: int
+    ask_units: int
+    protocol_fee_units: int
+    ref_fee_units: int
+
+
+def quote_route(
+    route: Sequence[RouteHop],
+    amount: int,
+    has_ref: bool = False,
+) -> List[RouteHop] | None:
+    quoted_route = []
+    offer_units = amount
+
+    for hop in route:
+        reserve_in, reserve_out = hop.pool.get_reserves(hop.offer_address)
+
+        ask_units, protocol_fee_units, ref_fee_units = get_amount_out(
+            amount_in=offer_units,
+            reserve_in=reserve_in,
+            reserve_out=reserve_out,
+            lp_fee=hop.pool.lp_fee,
+            protocol_fee=hop.pool.protocol_fee,
+            ref_fee=hop.pool.ref_fee,
+            has_ref=has_ref,
+        )
+        if ask_units <= 0:
+            return None
+
+        quoted_route.append(
+            hop._replace(
+                offer_units=offer_units,
+                ask_units=ask_units,
+                protocol_fee_units=protocol_fee_units,
+                ref_fee_units=ref_fee_units,
+            )
+        )
+        offer_units = ask_units
+
+    return quoted_route
+
+
+def split_amount(
+    routes: Sequence[Sequence[RouteHop]],
+    amount: int,
+    has_ref: bool = False,
+    steps: int = 20,
+) -> List[List[RouteHop]]:
+    # Output of a route is concave in its input, so handing out the
+    # amount step by step to the route with the largest marginal output
+    # converges to the optimal split up to the step size.
+    allocations = [0] * len(routes)
+    outputs = [0] * len(routes)
+    step_amount, remainder = divmod(amount, steps)
+
+    for step in range(steps):
+        step_units = step_amount + (remainder if step == 0 else 0)
+        if step_units == 0:
+            continue
+
+        best_route = 0
+        best_output = 0
+        best_gain = -1
+        for i, route in enumerate(routes):
+            quoted_route = quote_route(
+                route, allocations[i] + step_units, has_ref
+            )
+            output = quoted_route[-1].ask_units if quoted_route else 0
+
+            if output - outputs[i] > best_gain:
+                best_route = i
+                best_output = output
+                best_gain = output - outputs[i]
+
+        allocations[best_route] += step_units
+        outputs[best_route] = best_output
+
+    legs = []
+    for route, allocation in zip(routes, allocations):
+        if allocation == 0:
+            continue
+
+        quoted_route = quote_route(route, allocation, has_ref)
+        if quoted_route is not None:
+            legs.append(quoted_route)
+
+    return legs
+
+
+class RoutingStats(BaseModel):
+    pools: int = 0
+    tokens: int = 0
+    searches: int = 0
+    not_found: int = 0
+    search_time_total: float = 0
+    search_time_max: float = 0
+
+
+class PoolGraph:
+    def __init__(self):
+        self.stats = RoutingStats()
+        self.loaded = False
+        self._load_lock = asyncio.Lock()
+
+        self._reset()
+
+    def _reset(self):
+        self._pools: Dict[str, PoolState] = {}
+        self._pool_edges: Dict[str, int] = {}
+        self._tokens: Dict[str, int] = {}
+        self._token_addresses: List[str] = []
+
+        # Directed edges, pool i owns edges 2i (token0 -> token1) and
+        # 2i + 1 (token1 -> token0).
+        self._edge_pools: List[str] = []
+        self._sources = np.zeros(0, dtype=np.int64)
+        self._targets = np.zeros(0, dtype=np.int64)
+        self._reserves_in = np.zeros(0, dtype=np.float64)
+        self._reserves_out = np.zeros(0, dtype=np.float64)
+        self._lp_fees = np.zeros(0, dtype=np.float64)
+        self._fee_factors = np.zeros(0, dtype=np.float64)
+        self._ref_fees = np.zeros(0, dtype=np.float64)
+
+    async def load(self):
+        pools = await pool_snapshot.get_pools()
+
+        self._reset()
+        self.update(pools)
+        self.loaded = True
+
+        logger.info(
+            "Loaded pool graph: %d pools, %d tokens",
+            len(self._pools),
+            len(self._tokens),
+        )
+
+    async def ensure_loaded(self):
+        if not self.loaded:
+            async with self._load_lock:
+                if not self.loaded:
+                    await self.load()
+
+    def get_pool(self, address: str) -> PoolState | None:
+        return self._pools.get(address)
+
+    def update(self, pools: Iterable[Pool | PoolDao]):
+        new_pools = []
+
+        for pool in pools:
+            if pool.deprecated:
+                self._remove(pool.address)
+                continue
+
+            pool_state = PoolState.from_pool(pool)
+            self._pools[pool_state.address] = pool_state
+
+            edge = self._pool_edges.get(pool_state.address)
+            if edge is None:
+                new_pools.append(pool_state)
+            else:
+                self._set_edges(edge, pool_state)
+
+        if new_pools:
+            self._add(new_pools)
+
+        self.stats.pools = len(self._pools)
+        self.stats.tokens = len(self._tokens)
+
+    def find_route(
+        self,
+        offer_address: str,
+        ask_address: str,
+        amount: int,
+        max_hops: int = 3,
+        has_ref: bool = False,
+    ) -> List[RouteHop] | None:
+        started_at = time.perf_counter()
+
+        route = self._find_route(
+            offer_address, ask_address, amount, max_hops, has_ref
+        )
+
+        self._add_search(started_at, route is not None)
+
+        return route
+
+    def find_split(
+        self,
+        offer_address: str,
+        ask_address: str,
+        amount: int,
+        max_hops: int = 3,
+        has_ref: bool = False,
+        max_legs: int = 3,
+        steps: int = 20,
+    ) -> List[List[RouteHop]] | None:
+        started_at = time.perf_counter()
+
+        # Candidate legs do not share pools, so their outputs are
+        # independent of each other.
+        routes = []
+        excluded_pools = set()
+        for _ in range(max_legs):
+            route = self._find_route(
+                offer_address,
+                ask_address,
+                amount,
+                max_hops,
+                has_ref,
+                excluded_pools,
+            )
+            if route is None:
+                break
+
+            routes.append(route)
+            excluded_pools.update(hop.pool.address for hop in route)
+
+        legs = split_amount(routes, amount, has_ref, steps) if routes else []
+
+        self._add_search(started_at, bool(legs))
+
+        return legs or None
+
+    def _add_search(self, started_at: float, found: bool):
+        duration = time.perf_counter() - started_at
+
+        self.stats.searches += 1
+        self.stats.search_time_total += duration
+        self.stats.search_time_max = max(self.stats.search_time_max, duration)
+        if not found:
+            self.stats.not_found += 1
+
+    def _find_route(
+        self,
+        offer_address: str,
+        ask_address: str,
+        amount: int,
+        max_hops: int,
+        has_ref: bool,
+        excluded_pools: Set[str] | None = None,
+    ) -> List[RouteHop] | None:
+        offer_token = self._tokens.get(offer_address)
+        ask_token = self._tokens.get(ask_address)
+
+        if (
+            offer_token is None
+            or ask_token is None
+            or offer_token == ask_token
+            or amount <= 0
+        ):
+            return None
+
+        # The search runs on float64 amounts, one relaxation of every
+        # edge per hop. Candidate paths are then re-quoted exactly.
+        fee_factors = self._fee_factors - has_ref * self._ref_fees
+        enabled = np.ones(len(self._sources), dtype=bool)
+        for address in excluded_pools or ():
+            edge = self._pool_edges[address]
+            enabled[[edge, edge + 1]] = False
+
+        amounts = np.zeros(len(self._tokens), dtype=np.float64)
+        amounts[offer_token] = amount
+
+        predecessors = []
+        candidates = []
+
+        for hops in range(1, max_hops + 1):
+            active = np.flatnonzero((amounts[self._sources] > 0) & enabled)
+            amounts_in_with_fee = (
+                amounts[self._sources[active]] * self._lp_fees[active]
+            )
+            amounts_out = np.zeros(len(self._sources), dtype=np.float64)
+            amounts_out[active] = (
+                amounts_in_with_fee
+                * self._reserves_out[active]
+                / (
+                    self._reserves_in[active] * FEE_DIVIDER
+                    + amounts_in_with_fee
+                )
+                * fee_factors[active]
+            )
+
+            amounts = np.zeros(len(self._tokens), dtype=np.float64)
+            np.maximum.at(amounts, self._targets, amounts_out)
+
+            edges = np.full(len(self._tokens), -1, dtype=np.int64)
+            best = np.flatnonzero(
+                (amounts_out > 0) & (amounts_out == amounts[self._targets])
+            )
+            edges[self._targets[best]] = best
+            predecessors.append(edges)
+
+            if amounts[ask_token] > 0:
+                candidates.append((amounts[ask_token], hops))
+
+            # Routes never pass through their own ends.
+            amounts[offer_token] = 0
+            amounts[ask_token] = 0
+
+            if not amounts.any():
+                break
+
+        best_route = None
+        best_amount = 0
+
+        for _, hops in sorted(candidates, reverse=True):
+            route = self._quote_path(
+                self._get_path(predecessors, ask_token, hops),
+                amount,
+                has_ref,
+            )
+
+            if route is not None and route[-1].ask_units > best_amount:
+                best_route = route
+                best_amount = route[-1].ask_units
+
+        return best_route
+
+    def _get_path(
+        self,
+        predecessors: List[np.ndarray],
+        ask_token: int,
+        hops: int,
+    ) -> List[int]:
+        path = []
+        token = ask_token
+
+        for edges in reversed(predecessors[:hops]):
+            edge = int(edges[token])
+            path.append(edge)
+            token = int(self._sources[edge])
+
+        path.reverse()
+
+        return path
+
+    def _quote_path(
+        self,
+        path: List[int],
+        amount: int,
+        has_ref: bool,
+    ) -> List[RouteHop] | None:
+        tokens = [int(self._sources[edge]) for edge in path]
+        if len(set(tokens)) != len(tokens):
+            return None
+
+        route = []
+        for edge in path:
+            route.append(
+                RouteHop(
+                    pool=self._pools[self._edge_pools[edge]],
+                    offer_address=self._token_addresses[self._sources[edge]],
+                    ask_address=self._token_addresses[self._targets[edge]],
+                    offer_units=0,
+                    ask_units=0,
+                    protocol_fee_units=0,
+                    ref_fee_units=0,
+                )
+            )
+
+        return quote_route(route, amount, has_ref)
+
+    def _get_token(self, address: str) -> int:
+        token = self._tokens.get(address)
+
+        if token is None:
+            token = len(self._token_addresses)
+            self._tokens[address] = token
+            self._token_addresses.append(address)
+
+        return token
+
+    def _add(self, pools: List[PoolState]):
+        first_edge = len(self._edge_pools)
+
+        sources = []
+        targets = []
+        for pool in pools:
+            self._pool_edges[pool.address] = len(self._edge_pools)
+            self._edge_pools.extend((pool.address, pool.address))
+
+            token0 = self._get_token(pool.token0_address)
+            token1 = self._get_token(pool.token1_address)
+            sources.extend((token0, token1))
+            targets.extend((token1, token0))
+
+        self._sources = np.concatenate((self._sources, sources))
+        self._targets = np.concatenate((self._targets, targets))
+
+        added = len(sources)
+        self._reserves_in = np.concatenate(
+            (self._reserves_in, np.zeros(added))
+        )
+        self._reserves_out = np.concatenate(
+            (self._reserves_out, np.zeros(added))
+        )
+        self._lp_fees = np.concatenate((self._lp_fees, np.zeros(added)))
+        self._fee_factors = np.concatenate(
+            (self._fee_factors, np.zeros(added))
+        )
+        self._ref_fees = np.concatenate((self._ref_fees, np.zeros(added)))
+
+        for i, pool in enumerate(pools):
+            self._set_edges(first_edge + 2 * i, pool)
+
+    def _set_edges(self, edge: int, pool: PoolState):
+        for i, (reserve_in, reserve_out) in enumerate(
+            (
+                (pool.reserve0, pool.reserve1),
+                (pool.reserve1, pool.reserve0),
+            )
+        ):
+            self._reserves_in[edge + i] = reserve_in
+            self._reserves_out[edge + i] = reserve_out
+            self._lp_fees[edge + i] = FEE_DIVIDER - pool.lp_fee
+            self._fee_factors[edge + i] = 1 - pool.protocol_fee / FEE_DIVIDER
+            self._ref_fees[edge + i] = pool.ref_fee / FEE_DIVIDER
+
+    def _remove(self, address: str):
+        if self._pools.pop(address, None) is None:
+            return
+
+        # The edges stay in place with empty reserves so that the indices
+        # of the other pools do not shift.
+        edges = [self._pool_edges[address], self._pool_edges[address] + 1]
+        self._reserves_in[edges] = 0
+        self._reserves_out[edges] = 0
+
+
+pool_graph = PoolGraph()
@@ -1,15 +1,27 @@
+import asyncio
+from functools import partial
+from typing import Tuple
+
 from pytonapi import AsyncTonapi
 from tonsdk.boc import Cell, begin_cell
 from tonsdk.utils import Address, bytes_to_b64str
 
-from src.ton.utils import (create_jetton_transfer_body,
-                           get_jetton_wallet_address, parse_address_from_bytes)
+from src.config import config
+from src.ton.jetton_wallet_cache import jetton_wallet_cache
+from src.ton.utils import create_jetton_transfer_body, parse_address_from_bytes
+from src.utils.single_flight import SingleFlight
 
 from ..models import PoolData
 from ..models.lp_account import LpAccountData
 from ..models.transaction import MessageData
+from ..pool_reserves import pool_reserves
 from . import ston_constants
 
+pool_data_requests = SingleFlight(
+    ttl=config.ston_fi.pool_data_cache_ttl,
+    max_size=config.ston_fi.pool_data_cache_size,
+)
+
 
 class Router:
     def __init__(
@@ -100,6 +112,43 @@ class Router:
 
         return cell
 
+    async def get_swap_jetton_wallet_addresses(
+        self,
+        user_wallet_address: str,
+        offer_jetton_contract_address: str,
+        ask_jetton_contract_address: str,
+    ) -> Tuple[Address, Address]:
+        return await asyncio.gather(
+            jetton_wallet_cache.get(
+                tonapi_client=self.tonapi_client,
+                jetton_contract_address=offer_jetton_contract_address,
+                owner_wallet_address=user_wallet_address,
+            ),
+            jetton_wallet_cache.get(
+                tonapi_client=self.tonapi_client,
+                jetton_contract_address=ask_jetton_contract_address,
+                owner_wallet_address=self.address,
+            ),
+        )
+
+    async def get_swap_proxy_ton_wallet_addresses(
+        self,
+        proxy_ton_address: str,
+        ask_jetton_contract_address: str,
+    ) -> Tuple[Address, Address]:
+        return await asyncio.gather(
+            jetton_wallet_cache.get(
+                tonapi_client=self.tonapi_client,
+                jetton_contract_address=proxy_ton_address,
+                owner_wallet_address=self.address,
+            ),
+            jetton_wallet_cache.get(
+                tonapi_client=self.tonapi_client,
+                jetton_contract_address=ask_jetton_contract_address,
+                owner_wallet_address=self.address,
+            ),
+        )
+
     async def build_swap_jetton_tx_params(
         self,
         user_wallet_address: str,
@@ -119,16 +168,13 @@ class Router:
         if query_id is None:
             query_id = 0
 
-        offer_jetton_wallet_address = await get_jetton_wallet_address(
-            tonapi_client=self.tonapi_client,
-            jetton_contract_address=offer_jetton_contract_address,
-            owner_wallet_address=user_wallet_address,
-        )
-
-        ask_jetton_wallet_address = await get_jetton_wallet_address(
-            tonapi_client=self.tonapi_client,
-            jetton_contract_address=ask_jetton_contract_address,
-            owner_wallet_address=self.address,
+        (
+            offer_jetton_wallet_address,
+            ask_jetton_wallet_address,
+        ) = await self.get_swap_jetton_wallet_addresses(
+            user_wallet_address=user_wallet_address,
+            offer_jetton_contract_address=offer_jetton_contract_address,
+            ask_jetton_contract_address=ask_jetton_contract_address,
         )
 
         forward_payload = self.create_swap_body(
@@ -171,16 +217,12 @@ class Router:
         if query_id is None:
             query_id = 0
 
-        proxy_ton_wallet_address = await get_jetton_wallet_address(
-            tonapi_client=self.tonapi_client,
-            jetton_contract_address=proxy_ton_address,
-            owner_wallet_address=self.address,
-        )
-
-        ask_jetton_wallet_address = await get_jetton_wallet_address(
-            tonapi_client=self.tonapi_client,
-            jetton_contract_address=ask_jetton_contract_address,
-            owner_wallet_address=self.address,
+        (
+            proxy_ton_wallet_address,
+            ask_jetton_wallet_address,
+        ) = await self.get_swap_proxy_ton_wallet_addresses(
+            proxy_ton_address=proxy_ton_address,
+            ask_jetton_contract_address=ask_jetton_contract_address,
         )
 
         forward_payload = self.create_swap_body(
@@ -213,11 +255,19 @@ class Router:
     async def get_pool_data(
         self,
         pool_address: Address,
+    ) -> PoolData:
+        return await pool_data_requests.do(
+            Address(pool_address).to_string(False),
+            partial(self._fetch_pool_data, pool_address),
+        )
+
+    async def _fetch_pool_data(
+        self,
+        pool_address: Address,
     ) -> PoolData:
         response = await self.tonapi_client.blockchain.execute_get_method(
-            account_id=pool_address.to_string(),
-            method_name="get_pool_data",
-            args=[],
+            pool_address.to_string(),
+            "get_pool_data",
         )
 
         reserve0 = int(response.stack[0].num, 16)
@@ -250,6 +300,10 @@ class Router:
             collected_token1_protocol_fee=collected_token1_protocol_fee,
         )
 
+        pool_reserves.record(
+            pool_address.to_string(True, True, True), reserve0, reserve1
+        )
+
         return pool_data
 
     async def get_expected_tokens(
@@ -259,12 +313,10 @@ class Router:
         token1_amount: int,
     ) -> int:
         response = await self.tonapi_client.blockchain.execute_get_method(
-            account_id=pool_address,
-            method_name="get_expected_tokens",
-            args=[
-                f"{token1_amount}",
-                f"{token0_amount}",
-            ],
+            pool_address,
+            "get_expected_tokens",
+            f"{token1_amount}",
+            f"{token0_amount}",
         )
 
         return int(response.stack[0].num, 16)
@@ -274,9 +326,8 @@ class Router:
         lp_account_address: str,
     ):
         response = await self.tonapi_client.blockchain.execute_get_method(
-            account_id=lp_account_address,
-            method_name="get_lp_account_data",
-            args=[],
+            lp_account_address,
+            "get_lp_account_data",
         )
 
         token0_address = parse_address_from_bytes(
@@ -313,16 +364,17 @@ class Router:
         if query_id is None:
             query_id = 0
 
-        jetton_wallet_address = await get_jetton_wallet_address(
-            tonapi_client=self.tonapi_client,
-            jetton_contract_address=send_token_address,
-            owner_wallet_address=user_wallet_address,
-        )
-
-        router_wallet_address = await get_jetton_wallet_address(
-            tonapi_client=self.tonapi_client,
-            jetton_contract_address=second_token_address,
-            owner_wallet_address=self.address.to_string(True, True),
+        jetton_wallet_address, router_wallet_address = await asyncio.gather(
+            jetton_wallet_cache.get(
+                tonapi_client=self.tonapi_client,
+                jetton_contract_address=send_token_address,
+                owner_wallet_address=user_wallet_address,
+            ),
+            jetton_wallet_cache.get(
+                tonapi_client=self.tonapi_client,
+                jetton_contract_address=second_token_address,
+                owner_wallet_address=self.address.to_string(True, True),
+            ),
         )
 
         forward_payload = self.create_provide_liquidity_body(
@@ -363,16 +415,17 @@ class Router:
         if query_id is None:
             query_id = 0
 
-        proxy_ton_wallet_address = await get_jetton_wallet_address(
-            tonapi_client=self.tonapi_client,
-            jetton_contract_address=proxy_ton_address,
-            owner_wallet_address=self.address,
-        )
-
-        router_wallet_address = await get_jetton_wallet_address(
-            tonapi_client=self.tonapi_client,
-            jetton_contract_address=second_token_address,
-            owner_wallet_address=self.address,
+        proxy_ton_wallet_address, router_wallet_address = await asyncio.gather(
+            jetton_wallet_cache.get(
+                tonapi_client=self.tonapi_client,
+                jetton_contract_address=proxy_ton_address,
+                owner_wallet_address=self.address,
+            ),
+            jetton_wallet_cache.get(
+                tonapi_client=self.tonapi_client,
+                jetton_contract_address=second_token_address,
+                owner_wallet_address=self.address,
+            ),
         )
 
         forward_payload = self.create_provide_liquidity_body(
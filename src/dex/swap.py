@@ -1,17 +1,38 @@
+import asyncio
 import time
+from typing import List
 
 from tonsdk.utils import Address
 
 from src.config import config
-from src.database.dal import account_dal, pool_dal, transaction_dal
+from src.database.dal import account_dal, transaction_dal
 from src.dex.models.transaction import MessageData
 from src.utils.address import validate_address
-
-from .exceptions import NotEnoughLiquidityError
-from .models.swap import SwapRequest, SwapSimulateRequest, SwapSimulateResponse
+from src.utils.timing import timed, track_latency
+
+from .exceptions import NotEnoughLiquidityError, RouteNotFoundError
+from .models.swap import (
+    SwapDepthPoint,
+    SwapDepthRequest,
+    SwapDepthResponse,
+    SwapRequest,
+    SwapRouteHop,
+    SwapRouteRequest,
+    SwapRouteResponse,
+    SwapSimulateRequest,
+    SwapSimulateResponse,
+    SwapSplitLeg,
+    SwapSplitResponse,
+)
+from .pool_snapshot import pool_snapshot
+from .quote import get_amounts_out
+from .routing import RouteHop, pool_graph, quote_route
 from .models.transaction import TransactionData
+from .ston_fi_contracts.router import Router
 from .ston_fi_contracts.router_factory import RouterFactory
 from .utils import (
+    calculate_asset_ton_rate,
+    calculate_fee_from_ton_rate,
     calculate_fee_in_nanotons,
     calculate_in_amount,
     calculate_out_amount,
@@ -22,27 +43,18 @@ PROXY_TON_ADDRESS = validate_address(config.ston_fi.proxy_ton_address)
 TON_CONTRACT_ADDRESS = validate_address(config.ston_fi.ton_contract_address)
 
 
-async def swap(
+async def _create_swap_transaction(
     swap_data: SwapRequest,
-) -> TransactionData:
-    router = RouterFactory.get_router()
-
-    user_wallet_address = validate_address(swap_data.userWalletAddress)
-    ask_jetton_address = validate_address(swap_data.askJettonAddress)
-    offer_jetton_address = validate_address(swap_data.offerJettonAddress)
-    referral_address = (
-        Address(swap_data.referralAddress)
-        if swap_data.referralAddress
-        else None
-    )
-
-    account = await account_dal.get_account(user_wallet_address)
-
-    valid_until = int(time.time() + 60 * 10)
-
-    query_id = await transaction_dal.create_transaction(
-        account_id=account.id,
-        router_address=validate_address(router.address),
+    router_address: str,
+    user_wallet_address: str,
+    ask_jetton_address: str,
+    valid_until: int,
+) -> int:
+    account_id = await account_dal.get_account_id(user_wallet_address)
+
+    return await transaction_dal.create_transaction(
+        account_id=account_id,
+        router_address=router_address,
         user_wallet_address=user_wallet_address,
         offer_jetton_address=swap_data.offerJettonAddress,
         offer_amount=swap_data.offerAmount,
@@ -53,57 +65,174 @@ async def swap(
         valid_until=valid_until,
     )
 
-    fee_nanotons = await calculate_fee_in_nanotons(
-        offer_amount=swap_data.offerAmount,
-        offer_contract_address=swap_data.offerJettonAddress,
-    )
 
-    fee_message_data = MessageData(
-        to=config.swap.ton_fee_address,
-        amount=fee_nanotons,
-    )
+def _get_swap_ask_jetton_address(
+    offer_jetton_address: str,
+    ask_jetton_address: str,
+) -> str:
+    if (
+        offer_jetton_address != TON_CONTRACT_ADDRESS
+        and ask_jetton_address == TON_CONTRACT_ADDRESS
+    ):
+        return PROXY_TON_ADDRESS
 
-    if swap_data.offerJettonAddress == TON_CONTRACT_ADDRESS:
-        swap_message_data = await router.build_swap_proxy_ton_tx_params(
-            user_wallet_address=user_wallet_address,
+    return ask_jetton_address
+
+
+async def _prefetch_swap_wallet_addresses(
+    router: Router,
+    user_wallet_address: str,
+    offer_jetton_address: str,
+    ask_jetton_address: str,
+):
+    if offer_jetton_address == TON_CONTRACT_ADDRESS:
+        await router.get_swap_proxy_ton_wallet_addresses(
             proxy_ton_address=PROXY_TON_ADDRESS,
             ask_jetton_contract_address=ask_jetton_address,
-            offer_amount=swap_data.offerAmount,
-            min_ask_amount=swap_data.minAskAmount,
-            forward_gas_amount=swap_data.forwardGasAmount,
-            referral_address=swap_data.referralAddress,
-            query_id=query_id,
         )
     else:
-        if ask_jetton_address == TON_CONTRACT_ADDRESS:
-            ask_jetton_address = PROXY_TON_ADDRESS
-
-        swap_message_data = await router.build_swap_jetton_tx_params(
+        await router.get_swap_jetton_wallet_addresses(
             user_wallet_address=user_wallet_address,
             offer_jetton_contract_address=offer_jetton_address,
             ask_jetton_contract_address=ask_jetton_address,
+        )
+
+
+async def _build_swap_message(
+    router: Router,
+    swap_data: SwapRequest,
+    user_wallet_address: str,
+    offer_jetton_address: str,
+    ask_jetton_address: str,
+    query_id: int,
+) -> MessageData:
+    if offer_jetton_address == TON_CONTRACT_ADDRESS:
+        return await router.build_swap_proxy_ton_tx_params(
+            user_wallet_address=user_wallet_address,
+            proxy_ton_address=PROXY_TON_ADDRESS,
+            ask_jetton_contract_address=ask_jetton_address,
             offer_amount=swap_data.offerAmount,
             min_ask_amount=swap_data.minAskAmount,
             forward_gas_amount=swap_data.forwardGasAmount,
-            referral_address=referral_address,
+            referral_address=swap_data.referralAddress,
             query_id=query_id,
         )
 
+    return await router.build_swap_jetton_tx_params(
+        user_wallet_address=user_wallet_address,
+        offer_jetton_contract_address=offer_jetton_address,
+        ask_jetton_contract_address=ask_jetton_address,
+        offer_amount=swap_data.offerAmount,
+        min_ask_amount=swap_data.minAskAmount,
+        forward_gas_amount=swap_data.forwardGasAmount,
+        referral_address=(
+            Address(swap_data.referralAddress)
+            if swap_data.referralAddress
+            else None
+        ),
+        query_id=query_id,
+    )
+
+
+@track_latency("swap")
+async def swap(
+    swap_data: SwapRequest,
+) -> TransactionData:
+    router = RouterFactory.get_router()
+
+    user_wallet_address = validate_address(swap_data.userWalletAddress)
+    ask_jetton_address = validate_address(swap_data.askJettonAddress)
+    offer_jetton_address = validate_address(swap_data.offerJettonAddress)
+    swap_ask_jetton_address = _get_swap_ask_jetton_address(
+        offer_jetton_address, ask_jetton_address
+    )
+
+    valid_until = int(time.time() + 60 * 10)
+
+    # The fee is a rate table lookup and raises for unpriced assets, so it
+    # runs before a transaction is stored that the user would never get.
+    fee_nanotons = await timed(
+        "fee",
+        calculate_fee_in_nanotons(
+            offer_amount=swap_data.offerAmount,
+            offer_contract_address=swap_data.offerJettonAddress,
+        ),
+    )
+
+    # Wallet addresses are resolved (and cached) while the transaction is
+    # being stored, so building the message below does no I/O.
+    query_id, _ = await asyncio.gather(
+        timed(
+            "transaction",
+            _create_swap_transaction(
+                swap_data=swap_data,
+                router_address=validate_address(router.address),
+                user_wallet_address=user_wallet_address,
+                ask_jetton_address=ask_jetton_address,
+                valid_until=valid_until,
+            ),
+        ),
+        timed(
+            "wallets",
+            _prefetch_swap_wallet_addresses(
+                router=router,
+                user_wallet_address=user_wallet_address,
+                offer_jetton_address=offer_jetton_address,
+                ask_jetton_address=swap_ask_jetton_address,
+            ),
+        ),
+    )
+
+    fee_message_data = MessageData(
+        to=config.swap.ton_fee_address,
+        amount=fee_nanotons,
+    )
+
+    swap_message_data = await timed(
+        "build",
+        _build_swap_message(
+            router=router,
+            swap_data=swap_data,
+            user_wallet_address=user_wallet_address,
+            offer_jetton_address=offer_jetton_address,
+            ask_jetton_address=swap_ask_jetton_address,
+            query_id=query_id,
+        ),
+    )
+
     return TransactionData(
         valid_until=valid_until,
         messages=[fee_message_data, swap_message_data],
     )
 
 
+@track_latency("simulate_swap")
 async def simulate_swap(
     swap_data: SwapSimulateRequest,
 ) -> SwapSimulateResponse:
-    pool = await pool_dal.get_pool_for_assets(
-        token0_address=swap_data.offer_address,
-        token1_address=swap_data.ask_address,
+    pool = await timed(
+        "pool",
+        pool_snapshot.get_pool_for_assets(
+            token0_address=swap_data.offer_address,
+            token1_address=swap_data.ask_address,
+        ),
     )
+    # /swap sends a single pool swap, pairs without a direct pool are
+    # quoted by /swap/route instead.
+    if pool is None:
+        raise RouteNotFoundError()
+
     router = RouterFactory.get_router()
-    pool_data = await router.get_pool_data(Address(pool.address))
+    pool_data, fee_nanotons = await asyncio.gather(
+        timed("pool_data", router.get_pool_data(Address(pool.address))),
+        timed(
+            "fee",
+            calculate_fee_in_nanotons(
+                offer_amount=int(swap_data.units),
+                offer_contract_address=swap_data.offer_address,
+            ),
+        ),
+    )
 
     in_reserved, out_reserved = (
         (pool_data.reserve0, pool_data.reserve1)
@@ -144,11 +273,6 @@ async def simulate_swap(
         else 0
     )
 
-    fee_nanotons = await calculate_fee_in_nanotons(
-        offer_amount=int(swap_data.units),
-        offer_contract_address=swap_data.offer_address,
-    )
-
     response = SwapSimulateResponse(
         ask_address=swap_data.ask_address,
         ask_units=ask_units,
@@ -169,13 +293,87 @@ async def simulate_swap(
     return response
 
 
+@track_latency("simulate_swap_depth")
+async def simulate_swap_depth(
+    swap_data: SwapDepthRequest,
+) -> SwapDepthResponse:
+    pool = await timed(
+        "pool",
+        pool_snapshot.get_pool_for_assets(
+            token0_address=swap_data.offer_address,
+            token1_address=swap_data.ask_address,
+        ),
+    )
+    if pool is None:
+        raise RouteNotFoundError()
+
+    router = RouterFactory.get_router()
+    pool_data = await timed(
+        "pool_data", router.get_pool_data(Address(pool.address))
+    )
+
+    in_reserved, out_reserved = (
+        (pool_data.reserve0, pool_data.reserve1)
+        if pool.token0_address == swap_data.offer_address
+        else (pool_data.reserve1, pool_data.reserve0)
+    )
+
+    points = max(1, min(swap_data.points, config.swap.depth_max_points))
+    offer_units = [
+        swap_data.units * point // points for point in range(1, points + 1)
+    ]
+
+    ask_units, protocol_fee_units, ref_fee_units = get_amounts_out(
+        amounts_in=offer_units,
+        reserves_in=in_reserved,
+        reserves_out=out_reserved,
+        lp_fees=pool_data.lp_fee,
+        protocol_fees=pool_data.protocol_fee,
+        ref_fees=pool_data.ref_fee,
+        has_ref=bool(swap_data.referral_address),
+    )
+
+    return SwapDepthResponse(
+        offer_address=swap_data.offer_address,
+        ask_address=swap_data.ask_address,
+        pool_address=pool.address,
+        offer_reserve=in_reserved,
+        ask_reserve=out_reserved,
+        points=[
+            SwapDepthPoint(
+                offer_units=offer,
+                ask_units=int(ask),
+                fee_units=int(protocol_fee) + int(ref_fee),
+                price_impact=calculate_price_impact(
+                    amount=offer,
+                    reserved=in_reserved,
+                ),
+                swap_rate=int(ask) / offer if offer > 0 else 0,
+            )
+            for offer, ask, protocol_fee, ref_fee in zip(
+                offer_units, ask_units, protocol_fee_units, ref_fee_units
+            )
+        ],
+    )
+
+
+@track_latency("simulate_swap_reverse")
 async def simulate_swap_reverse(swap_data: SwapSimulateRequest):
-    pool = await pool_dal.get_pool_for_assets(
-        token0_address=swap_data.offer_address,
-        token1_address=swap_data.ask_address,
+    pool = await timed(
+        "pool",
+        pool_snapshot.get_pool_for_assets(
+            token0_address=swap_data.offer_address,
+            token1_address=swap_data.ask_address,
+        ),
     )
+    if pool is None:
+        raise RouteNotFoundError()
+
     router = RouterFactory.get_router()
-    pool_data = await router.get_pool_data(Address(pool.address))
+    pool_data, offer_ton_rate = await asyncio.gather(
+        timed("pool_data", router.get_pool_data(Address(pool.address))),
+        timed("fee", calculate_asset_ton_rate(swap_data.offer_address)),
+    )
 
     in_reserved, out_reserved = (
         (pool_data.reserve0, pool_data.reserve1)
@@ -232,10 +430,7 @@ async def simulate_swap_reverse(swap_data: SwapSimulateRequest):
         else 0
     )
 
-    fee_nanotons = await calculate_fee_in_nanotons(
-        offer_amount=offer_units,
-        offer_contract_address=swap_data.offer_address,
-    )
+    fee_nanotons = calculate_fee_from_ton_rate(offer_units, offer_ton_rate)
 
     response = SwapSimulateResponse(
         ask_address=swap_data.ask_address,
@@ -255,3 +450,294 @@ async def simulate_swap_reverse(swap_data: SwapSimulateRequest):
     )
 
     return response
+
+
+async def _get_live_route(
+    router: Router,
+    route: List[RouteHop],
+) -> List[RouteHop]:
+    pools_data = await asyncio.gather(
+        *(router.get_pool_data(Address(hop.pool.address)) for hop in route)
+    )
+
+    return [
+        hop._replace(
+            pool=hop.pool._replace(
+                reserve0=pool_data.reserve0,
+                reserve1=pool_data.reserve1,
+                lp_fee=pool_data.lp_fee,
+                protocol_fee=pool_data.protocol_fee,
+                ref_fee=pool_data.ref_fee,
+            )
+        )
+        for hop, pool_data in zip(route, pools_data)
+    ]
+
+
+def _create_route_hops(route: List[RouteHop]) -> List[SwapRouteHop]:
+    return [
+        SwapRouteHop(
+            pool_address=hop.pool.address,
+            offer_address=hop.offer_address,
+            ask_address=hop.ask_address,
+            offer_units=hop.offer_units,
+            ask_units=hop.ask_units,
+            fee_units=hop.protocol_fee_units + hop.ref_fee_units,
+            price_impact=calculate_price_impact(
+                amount=hop.offer_units,
+                reserved=hop.pool.get_reserves(hop.offer_address)[0],
+            ),
+        )
+        for hop in route
+    ]
+
+
+def _get_max_hops(max_hops: int | None) -> int:
+    return min(
+        max_hops or config.swap.route_max_hops,
+        config.swap.route_max_hops,
+    )
+
+
+@track_latency("simulate_swap_route")
+async def simulate_swap_route(
+    swap_data: SwapRouteRequest,
+) -> SwapRouteResponse:
+    await pool_graph.ensure_loaded()
+
+    has_ref = bool(swap_data.referral_address)
+
+    route = pool_graph.find_route(
+        offer_address=swap_data.offer_address,
+        ask_address=swap_data.ask_address,
+        amount=swap_data.units,
+        max_hops=_get_max_hops(swap_data.max_hops),
+        has_ref=has_ref,
+    )
+    if route is None:
+        raise RouteNotFoundError()
+
+    router = RouterFactory.get_router()
+    live_route, fee_nanotons = await asyncio.gather(
+        timed("pool_data", _get_live_route(router, route)),
+        timed(
+            "fee",
+            calculate_fee_in_nanotons(
+                offer_amount=swap_data.units,
+                offer_contract_address=swap_data.offer_address,
+            ),
+        ),
+    )
+
+    # The route is picked on synced reserves, the amounts are quoted
+    # against the live ones.
+    route = quote_route(live_route, swap_data.units, has_ref)
+    if route is None:
+        raise NotEnoughLiquidityError()
+
+    ask_units = route[-1].ask_units
+    slippage_tolerance = swap_data.slippage_tolerance / 100
+
+    return SwapRouteResponse(
+        offer_address=swap_data.offer_address,
+        ask_address=swap_data.ask_address,
+        offer_units=swap_data.units,
+        ask_units=ask_units,
+        min_ask_units=int(ask_units * (1 - slippage_tolerance)),
+        router_address=router.address.to_string(True, True, True),
+        slippage_tolerance=slippage_tolerance,
+        swap_rate=ask_units / swap_data.units,
+        ton_fee_units=fee_nanotons,
+        hops=_create_route_hops(route),
+    )
+
+
+async def _get_split_legs(
+    router: Router,
+    offer_address: str,
+    ask_address: str,
+    amount: int,
+    has_ref: bool,
+) -> List[List[RouteHop]]:
+    await pool_graph.ensure_loaded()
+
+    # A swap message of the router is a single pool swap, so only direct
+    # legs can be sent together in one transaction. The simulation quotes
+    # the same legs: with one pool per pair an amount is only split when
+    # several pools (or routers) trade the pair, otherwise the single leg
+    # is the plain swap.
+    legs = pool_graph.find_split(
+        offer_address=offer_address,
+        ask_address=ask_address,
+        amount=amount,
+        max_hops=1,
+        has_ref=has_ref,
+        max_legs=config.swap.split_max_legs,
+        steps=config.swap.split_steps,
+    )
+    if legs is None:
+        raise RouteNotFoundError()
+
+    live_legs = await timed(
+        "pool_data",
+        asyncio.gather(*(_get_live_route(router, leg) for leg in legs)),
+    )
+
+    quoted_legs = [
+        quote_route(live_leg, leg[0].offer_units, has_ref)
+        for leg, live_leg in zip(legs, live_legs)
+    ]
+    if None in quoted_legs:
+        raise NotEnoughLiquidityError()
+
+    return quoted_legs
+
+
+@track_latency("simulate_swap_split")
+async def simulate_swap_split(
+    swap_data: SwapRouteRequest,
+) -> SwapSplitResponse:
+    router = RouterFactory.get_router()
+
+    legs, fee_nanotons = await asyncio.gather(
+        _get_split_legs(
+            router=router,
+            offer_address=swap_data.offer_address,
+            ask_address=swap_data.ask_address,
+            amount=swap_data.units,
+            has_ref=bool(swap_data.referral_address),
+        ),
+        timed(
+            "fee",
+            calculate_fee_in_nanotons(
+                offer_amount=swap_data.units,
+                offer_contract_address=swap_data.offer_address,
+            ),
+        ),
+    )
+
+    slippage_tolerance = swap_data.slippage_tolerance / 100
+    ask_units = sum(leg[-1].ask_units for leg in legs)
+
+    return SwapSplitResponse(
+        offer_address=swap_data.offer_address,
+        ask_address=swap_data.ask_address,
+        offer_units=swap_data.units,
+        ask_units=ask_units,
+        min_ask_units=int(ask_units * (1 - slippage_tolerance)),
+        router_address=router.address.to_string(True, True, True),
+        slippage_tolerance=slippage_tolerance,
+        swap_rate=ask_units / swap_data.units,
+        ton_fee_units=fee_nanotons,
+        legs=[
+            SwapSplitLeg(
+                offer_units=leg[0].offer_units,
+                ask_units=leg[-1].ask_units,
+                min_ask_units=int(
+                    leg[-1].ask_units * (1 - slippage_tolerance)
+                ),
+                hops=_create_route_hops(leg),
+            )
+            for leg in legs
+        ],
+    )
+
+
+@track_latency("swap_split")
+async def swap_split(
+    swap_data: SwapRequest,
+) -> TransactionData:
+    router = RouterFactory.get_router()
+
+    user_wallet_address = validate_address(swap_data.userWalletAddress)
+    ask_jetton_address = validate_address(swap_data.askJettonAddress)
+    offer_jetton_address = validate_address(swap_data.offerJettonAddress)
+    swap_ask_jetton_address = _get_swap_ask_jetton_address(
+        offer_jetton_address, ask_jetton_address
+    )
+
+    valid_until = int(time.time() + 60 * 10)
+
+    legs, fee_nanotons, _ = await asyncio.gather(
+        _get_split_legs(
+            router=router,
+            offer_address=offer_jetton_address,
+            ask_address=ask_jetton_address,
+            amount=swap_data.offerAmount,
+            has_ref=bool(swap_data.referralAddress),
+        ),
+        timed(
+            "fee",
+            calculate_fee_in_nanotons(
+                offer_amount=swap_data.offerAmount,
+                offer_contract_address=swap_data.offerJettonAddress,
+            ),
+        ),
+        timed(
+            "wallets",
+            _prefetch_swap_wallet_addresses(
+                router=router,
+                user_wallet_address=user_wallet_address,
+                offer_jetton_address=offer_jetton_address,
+                ask_jetton_address=swap_ask_jetton_address,
+            ),
+        ),
+    )
+
+    # The requested minimum is shared between the legs in proportion to
+    # their expected output.
+    ask_units = sum(leg[-1].ask_units for leg in legs)
+    legs_data = [
+        swap_data.model_copy(
+            update={
+                "offerAmount": leg[0].offer_units,
+                "minAskAmount": swap_data.minAskAmount
+                * leg[-1].ask_units
+                // ask_units,
+            }
+        )
+        for leg in legs
+    ]
+
+    query_ids = await timed(
+        "transaction",
+        asyncio.gather(
+            *(
+                _create_swap_transaction(
+                    swap_data=leg_data,
+                    router_address=validate_address(router.address),
+                    user_wallet_address=user_wallet_address,
+                    ask_jetton_address=ask_jetton_address,
+                    valid_until=valid_until,
+                )
+                for leg_data in legs_data
+            )
+        ),
+    )
+
+    swap_messages_data = await timed(
+        "build",
+        asyncio.gather(
+            *(
+                _build_swap_message(
+                    router=router,
+                    swap_data=leg_data,
+                    user_wallet_address=user_wallet_address,
+                    offer_jetton_address=offer_jetton_address,
+                    ask_jetton_address=swap_ask_jetton_address,
+                    query_id=query_id,
+                )
+                for leg_data, query_id in zip(legs_data, query_ids)
+            )
+        ),
+    )
+
+    fee_message_data = MessageData(
+        to=config.swap.ton_fee_address,
+        amount=fee_nanotons,
+    )
+
+    return TransactionData(
+        valid_until=valid_until,
+        messages=[fee_message_data, *swap_messages_data],
+    )
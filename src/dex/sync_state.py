@@ -0,0 +1,133 @@
+import hashlib
+import json
+import logging
+import time
+from typing import Any, Dict
+
+import httpx
+from pydantic import BaseModel
+
+logger = logging.getLogger("data_manager")
+
+
+def create_payload_hash():
+    return hashlib.blake2b(digest_size=16)
+
+
+def _hash_record(record: Dict[str, Any]) -> str:
+    record_json = json.dumps(record, sort_keys=True, separators=(",", ":"))
+
+    return hashlib.blake2b(record_json.encode(), digest_size=16).hexdigest()
+
+
+class SyncStats(BaseModel):
+    total: int = 0
+    changed: int = 0
+    skipped: int = 0
+    invalid: int = 0
+    failed: int = 0
+    not_modified: bool = False
+    payload_changed: bool = True
+    batches: int = 0
+    db_duration: float = 0
+    duration: float = 0
+
+
+class SyncState:
+    def __init__(self, name: str):
+        self.name = name
+
+        self.etag: str | None = None
+        self.last_modified: str | None = None
+        self.payload_hash: str | None = None
+        self.record_hashes: Dict[str, str] = {}
+
+        self.stats = SyncStats()
+
+        self._pending_hashes: Dict[str, str] = {}
+        self._pending_validators: Dict[str, str | None] | None = None
+        self._started_at = 0.0
+
+    def start_run(self):
+        self.stats = SyncStats()
+        self._pending_hashes = {}
+        self._pending_validators = None
+        self._started_at = time.perf_counter()
+
+    def conditional_headers(self) -> Dict[str, str]:
+        headers = {}
+
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+
+        return headers
+
+    def set_not_modified(self):
+        self.stats.not_modified = True
+        self.skip_all()
+
+    def skip_all(self):
+        self.stats.payload_changed = False
+        self.stats.total = len(self.record_hashes)
+        self.stats.skipped = len(self.record_hashes)
+
+    def is_record_unchanged(self, key: str, record: Dict[str, Any]) -> bool:
+        self.stats.total += 1
+
+        record_hash = _hash_record(record)
+
+        if self.record_hashes.get(key) == record_hash:
+            self.stats.skipped += 1
+            return True
+
+        self._pending_hashes[key] = record_hash
+
+        return False
+
+    def set_validators(self, headers: httpx.Headers, payload_hash: str):
+        self._pending_validators = {
+            "etag": headers.get("ETag"),
+            "last_modified": headers.get("Last-Modified"),
+            "payload_hash": payload_hash,
+        }
+
+        if payload_hash == self.payload_hash:
+            self.stats.payload_changed = False
+
+    def add_batches(self, batches: int, duration: float):
+        self.stats.batches += batches
+        self.stats.db_duration += duration
+
+    def commit_changes(self, changed: int):
+        self.stats.changed += changed
+        self.record_hashes.update(self._pending_hashes)
+        self._pending_hashes = {}
+
+    def rollback_changes(self, failed: int):
+        self.stats.failed += failed
+        self._pending_hashes = {}
+
+    def finish_run(self, success: bool = True):
+        if success and not self.stats.failed and self._pending_validators:
+            self.etag = self._pending_validators["etag"]
+            self.last_modified = self._pending_validators["last_modified"]
+            self.payload_hash = self._pending_validators["payload_hash"]
+
+        self._pending_validators = None
+        self.stats.duration = time.perf_counter() - self._started_at
+
+        logger.info(
+            "%s sync: %d total, %d changed, %d skipped, %d invalid, "
+            "%d failed, not modified: %s, %.3fs (db %.3fs)",
+            self.name,
+            self.stats.total,
+            self.stats.changed,
+            self.stats.skipped,
+            self.stats.invalid,
+            self.stats.failed,
+            self.stats.not_modified,
+            self.stats.duration,
+            self.stats.db_duration,
+        )
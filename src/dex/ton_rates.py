@@ -0,0 +1,121 @@
+import asyncio
+import heapq
+import logging
+import time
+from typing import Dict, Iterable, List, Tuple
+
+from pydantic import BaseModel
+
+from src.config import config
+from src.database.models import PoolDao
+from src.utils.address import validate_address
+
+from .exceptions import AssetRateNotFoundError
+from .pool_snapshot import pool_snapshot
+
+logger = logging.getLogger("ton_rates")
+
+
+class TonRateTableStats(BaseModel):
+    rates: int = 0
+    unpriced: int = 0
+    rebuilds: int = 0
+    rebuilt_at: float = 0
+    misses: int = 0
+
+
+def build_ton_rates(
+    pools: Iterable[PoolDao],
+    ton_addresses: Iterable[str],
+) -> Tuple[Dict[str, float], int]:
+    neighbours: Dict[str, List[Tuple[str, int, int]]] = {}
+    for pool in pools:
+        if pool.deprecated or pool.reserve0 <= 0 or pool.reserve1 <= 0:
+            continue
+
+        neighbours.setdefault(pool.token0_address, []).append(
+            (pool.token1_address, pool.reserve0, pool.reserve1)
+        )
+        neighbours.setdefault(pool.token1_address, []).append(
+            (pool.token0_address, pool.reserve1, pool.reserve0)
+        )
+
+    # Assets are priced along the path with the fewest hops from TON, and
+    # among those along the one whose shallowest pool holds the most TON
+    # value. Direct TON pools always win, multi-hop paths only price the
+    # assets that have none.
+    rates: Dict[str, float] = {}
+    keys: Dict[str, Tuple[int, float]] = {}
+    queue = []
+    for address in ton_addresses:
+        rates[address] = 1
+        keys[address] = (0, -float("inf"))
+        queue.append((*keys[address], address))
+
+    priced = set()
+    while queue:
+        hops, width, address = heapq.heappop(queue)
+        if address in priced:
+            continue
+        priced.add(address)
+
+        rate = rates[address]
+        for other, reserve, other_reserve in neighbours.get(address, ()):
+            if other in priced:
+                continue
+
+            key = (hops + 1, max(width, -reserve * rate))
+            if other not in keys or key < keys[other]:
+                keys[other] = key
+                rates[other] = rate * reserve / other_reserve
+                heapq.heappush(queue, (*key, other))
+
+    return rates, len(neighbours.keys() - rates.keys())
+
+
+class TonRateTable:
+    def __init__(self):
+        self.stats = TonRateTableStats()
+        self.ton_addresses = {
+            validate_address(config.ton.ton_contract_address),
+            validate_address(config.ston_fi.proxy_ton_address),
+        }
+
+        self._rates: Dict[str, float] | None = None
+        self._load_lock = asyncio.Lock()
+
+    async def load(self):
+        pools = await pool_snapshot.get_pools()
+
+        rates, unpriced = build_ton_rates(pools, self.ton_addresses)
+
+        # The table is replaced as a whole, readers never see a partially
+        # rebuilt one.
+        self._rates = rates
+
+        self.stats.rates = len(rates)
+        self.stats.unpriced = unpriced
+        self.stats.rebuilds += 1
+        self.stats.rebuilt_at = time.time()
+
+        logger.info(
+            "Rebuilt TON rates: %d priced, %d unpriced", len(rates), unpriced
+        )
+
+    async def ensure_loaded(self):
+        if self._rates is None:
+            async with self._load_lock:
+                if self._rates is None:
+                    await self.load()
+
+    def get_rate(self, address: str) -> float:
+        rate = self._rates.get(address) if self._rates is not None else None
+
+        if rate is None:
+            self.stats.misses += 1
+            raise AssetRateNotFoundError(address)
+
+        return rate
+
+
+ton_rate_table = TonRateTable()
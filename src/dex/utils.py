@@ -1,9 +1,9 @@
 from typing import Tuple
 
 from src.config import config
-from src.database.dal import pool_dal
 
-FEE_DIVIDER = 10000
+from .quote import FEE_DIVIDER, get_amount_in, get_amount_out
+from .ton_rates import ton_rate_table
 
 
 def calculate_out_amount(
@@ -15,29 +15,14 @@ def calculate_out_amount(
     protocol_fee: int,
     ref_fee: int,
 ) -> Tuple[int, int, int]:
-    if amount_in <= 0:
-        return (0, 0, 0)
-
-    amount_in_with_fee = amount_in / 1_000_000_000 * (FEE_DIVIDER - lp_fee)
-    base_out = (amount_in_with_fee * reserve_out / 1_000_000_000) / (
-        reserve_in / 1_000_000_000 * FEE_DIVIDER + amount_in_with_fee
-    )
-
-    protocol_fee_out = 0
-    ref_fee_out = 0
-
-    if protocol_fee > 0:
-        protocol_fee_out = base_out * protocol_fee / FEE_DIVIDER
-
-    if has_ref and (ref_fee > 0):
-        ref_fee_out = base_out * ref_fee / FEE_DIVIDER
-
-    base_out -= protocol_fee_out + ref_fee_out
-
-    return (
-        int(base_out * 1_000_000_000),
-        int(protocol_fee_out * 1_000_000_000),
-        int(ref_fee_out * 1_000_000_000),
+    return get_amount_out(
+        amount_in=amount_in,
+        reserve_in=reserve_in,
+        reserve_out=reserve_out,
+        lp_fee=lp_fee,
+        protocol_fee=protocol_fee,
+        ref_fee=ref_fee,
+        has_ref=bool(has_ref),
     )
 
 
@@ -51,25 +36,19 @@ def calculate_in_amount(
     ref_fee: int,
     slippage_tolerance: float,
 ) -> int:
-    if amount_out <= 0:
-        return 0
-
-    numerator = (
-        ((reserve_in / 1_000_000_000) * (amount_out / 1_000_000_000))
-        * 10_000
-        * 1_000_000_000
-    )
-    denominator = (
-        (reserve_out - amount_out) / 1_000_000_000 * (10_000 - lp_fee)
+    amount_in = get_amount_in(
+        amount_out=amount_out,
+        reserve_in=reserve_in,
+        reserve_out=reserve_out,
+        lp_fee=lp_fee,
+        protocol_fee=protocol_fee,
+        ref_fee=ref_fee,
+        has_ref=bool(has_ref),
     )
 
-    amount_in = numerator / denominator + 1
+    slippage_bps = round(slippage_tolerance * 100)
 
-    amount_in = int(
-        (amount_in * (10_020 + (slippage_tolerance * 100))) // 10_000
-    )
-
-    return amount_in
+    return amount_in * (FEE_DIVIDER + slippage_bps) // FEE_DIVIDER
 
 
 def calculate_price_impact(
@@ -81,30 +60,20 @@ def calculate_price_impact(
     return price_impact
 
 
+def calculate_fee_from_ton_rate(offer_amount: int, rate: float) -> int:
+    return int((rate * config.swap.fee_percent / 100) * offer_amount)
+
+
 async def calculate_fee_in_nanotons(
     offer_amount: int,
     offer_contract_address: str,
 ) -> int:
-    if offer_contract_address in {
-        config.ton.ton_contract_address,
-        config.ston_fi.proxy_ton_address,
-    }:
-        return int((config.swap.fee_percent / 100) * offer_amount)
-
     rate = await calculate_asset_ton_rate(offer_contract_address)
 
-    return int((rate * config.swap.fee_percent / 100) * offer_amount)
+    return calculate_fee_from_ton_rate(offer_amount, rate)
 
 
 async def calculate_asset_ton_rate(offer_contract_address: str) -> float:
-    pool = await pool_dal.get_pool_for_assets(
-        offer_contract_address, config.ton.ton_contract_address
-    )
-
-    offer_asset_reserve, ton_reserve = (
-        [pool.reserve0, pool.reserve1]
-        if offer_contract_address == pool.token0_address
-        else [pool.reserve1, pool.reserve0]
-    )
+    await ton_rate_table.ensure_loaded()
 
-    return ton_reserve / offer_asset_reserve
+    return ton_rate_table.get_rate(offer_contract_address)
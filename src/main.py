@@ -3,9 +3,14 @@ from fastapi.middleware.cors import CORSMiddleware
 
 import src.task_scheduler as scheduler
 from src.api.v1 import register_routes
+from src.auth.payload_store import payload_store
 from src.config import config
 from src.database import database
+from src.database.dal import transaction_dal
+from src.database.worker_lease import worker_lease
 from src.dex import data_manager
+from src.dex.http_client import StonFiClientFactory
+from src.dex.pool_reserves import pool_reserves
 from src.middlewares import register_middlewares
 from src.utils.logger import init_logger
 
@@ -18,14 +23,49 @@ def init_repeated_tasks():
     scheduler.add_interval_task(data_manager.update_assets, 60 * 10)
     scheduler.add_interval_task(data_manager.update_pools, 60 * 10)
     scheduler.add_interval_task(data_manager.update_swap_transactions, 60 * 2)
+    scheduler.add_interval_task(
+        pool_reserves.maintain,
+        config.pool_reserves.maintenance_interval,
+    )
+    scheduler.add_interval_task(
+        payload_store.sweep,
+        config.ton_proof.sweep_interval,
+    )
+
+    if config.server.worker_id is None:
+        scheduler.add_interval_task(
+            worker_lease.renew,
+            config.server.worker_lease_ttl / 3,
+        )
+
+    if database.replicas:
+        scheduler.add_interval_task(
+            database.probe_replicas,
+            config.database.replica_probe_interval,
+        )
 
 
 async def startup():
+    StonFiClientFactory.init_client()
     await database.init_database()
+
+    # Workers started from the same env would share a configured worker
+    # id, so unless one is set explicitly every worker leases its own.
+    if config.server.worker_id is not None:
+        transaction_dal.set_worker_id(config.server.worker_id)
+    else:
+        await worker_lease.acquire()
+
     init_repeated_tasks()
 
 
+async def shutdown():
+    await StonFiClientFactory.close_client()
+    await worker_lease.release()
+
+
 app.add_event_handler("startup", startup)
+app.add_event_handler("shutdown", shutdown)
 
 
 app.add_middleware(
@@ -0,0 +1,29 @@
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+
+class StandInSettings(BaseSettings):
+    fixtures_path: str | None = None
+    seed: int = 0
+    assets_count: int = 200
+    pools_count: int = 300
+
+    router_address: str = "EQB3ncyBUTjZUA5EnFKR5_EnOMI9V1tTEAAPaiU71gc4TiUt"
+    ton_address: str = "EQAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAAM9c"
+
+    latency: float = 0
+    latency_jitter: float = 0
+    error_rate: float = 0
+    error_status: int = 500
+
+    swap_found_rate: float = 1
+    nonstandard_jetton_rate: float = 0.1
+
+    model_config = SettingsConfigDict(
+        env_file=".env.stand_in",
+        env_file_encoding="utf-8",
+        env_prefix="stand_in__",
+        extra="ignore",
+    )
+
+
+settings = StandInSettings()
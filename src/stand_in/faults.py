@@ -0,0 +1,27 @@
+import asyncio
+import random
+from typing import Callable
+
+from fastapi.requests import Request
+from fastapi.responses import JSONResponse, Response
+
+from .config import settings
+
+
+async def faults_middleware(request: Request, call_next: Callable):
+    latency = settings.latency
+    if settings.latency_jitter:
+        latency += random.uniform(0, settings.latency_jitter)
+
+    if latency > 0:
+        await asyncio.sleep(latency)
+
+    if settings.error_rate and random.random() < settings.error_rate:
+        return JSONResponse(
+            status_code=settings.error_status,
+            content={"error": "Injected error"},
+        )
+
+    response: Response = await call_next(request)
+
+    return response
@@ -0,0 +1,276 @@
+import hashlib
+import json
+import math
+import random
+from typing import Any, Dict, FrozenSet, List
+
+from tonsdk.boc import begin_cell
+from tonsdk.utils import Address
+
+from .config import StandInSettings, settings
+
+PROTOCOL_FEE_ADDRESS_SEED = "protocol_fee"
+WALLET_HOLDINGS = 10
+
+JETTON_WALLET_CODE = (
+    begin_cell()
+    .store_uint(0xC0DE, 16)
+    .store_ref(begin_cell().store_uint(0xF00D, 16).end_cell())
+    .end_cell()
+)
+
+
+def make_address(*parts: Any) -> str:
+    digest = hashlib.sha256(":".join(map(str, parts)).encode()).hexdigest()
+
+    return Address(f"0:{digest}").to_string(True, True, True)
+
+
+def to_raw_address(address: str) -> str:
+    return Address(address).to_string(False)
+
+
+def is_standard_jetton(jetton_address: str) -> bool:
+    digest = hashlib.sha256(
+        f"{settings.seed}:{to_raw_address(jetton_address)}".encode()
+    ).digest()
+
+    return (
+        int.from_bytes(digest[:4], "big") / 2**32
+        >= settings.nonstandard_jetton_rate
+    )
+
+
+def get_jetton_wallet_address(jetton_address: str, owner_address: str) -> str:
+    data = begin_cell()
+    if not is_standard_jetton(jetton_address):
+        # e.g. wallets with an extra status field
+        data.store_uint(0, 4)
+
+    data = (
+        data.store_coins(0)
+        .store_address(Address(owner_address))
+        .store_address(Address(jetton_address))
+        .store_ref(JETTON_WALLET_CODE)
+        .end_cell()
+    )
+    state_init = (
+        begin_cell()
+        .store_uint(6, 5)
+        .store_ref(JETTON_WALLET_CODE)
+        .store_ref(data)
+        .end_cell()
+    )
+
+    return Address(f"0:{state_init.bytes_hash().hex()}").to_string(
+        True, True, True
+    )
+
+
+def get_payload_etag(payload: bytes) -> str:
+    return f'"{hashlib.blake2b(payload, digest_size=16).hexdigest()}"'
+
+
+class Fixtures:
+    def __init__(
+        self,
+        assets: List[Dict[str, Any]],
+        pools: List[Dict[str, Any]],
+        seed: int = 0,
+    ):
+        self.seed = seed
+        self.assets = assets
+        self.pools = pools
+
+        self.assets_payload = json.dumps({"asset_list": assets}).encode()
+        self.pools_payload = json.dumps({"pool_list": pools}).encode()
+        self.assets_etag = get_payload_etag(self.assets_payload)
+        self.pools_etag = get_payload_etag(self.pools_payload)
+
+        self.assets_by_address: Dict[str, Dict[str, Any]] = {
+            to_raw_address(asset["contract_address"]): asset
+            for asset in assets
+        }
+        self.pools_by_address: Dict[str, Dict[str, Any]] = {
+            to_raw_address(pool["address"]): pool for pool in pools
+        }
+        self.pools_by_pair: Dict[FrozenSet[str], Dict[str, Any]] = {
+            frozenset(
+                (
+                    to_raw_address(pool["token0_address"]),
+                    to_raw_address(pool["token1_address"]),
+                )
+            ): pool
+            for pool in pools
+        }
+
+    def _sample_balances(
+        self,
+        wallet_address: str,
+        kind: str,
+        addresses: List[str],
+    ) -> Dict[str, int]:
+        rng = random.Random(
+            f"{self.seed}:{kind}:{to_raw_address(wallet_address)}"
+        )
+
+        held = rng.sample(addresses, min(WALLET_HOLDINGS, len(addresses)))
+
+        return {address: rng.randint(10**6, 10**12) for address in held}
+
+    def get_asset_balances(self, wallet_address: str) -> Dict[str, int]:
+        return self._sample_balances(
+            wallet_address,
+            "assets",
+            [asset["contract_address"] for asset in self.assets],
+        )
+
+    def get_lp_balances(self, wallet_address: str) -> Dict[str, int]:
+        return self._sample_balances(
+            wallet_address,
+            "pools",
+            [pool["address"] for pool in self.pools],
+        )
+
+    def get_pool_by_address(self, address: str) -> Dict[str, Any] | None:
+        return self.pools_by_address.get(to_raw_address(address))
+
+    def get_pool_by_assets(
+        self,
+        token0_address: str,
+        token1_address: str,
+    ) -> Dict[str, Any] | None:
+        return self.pools_by_pair.get(
+            frozenset(
+                (
+                    to_raw_address(token0_address),
+                    to_raw_address(token1_address),
+                )
+            )
+        )
+
+
+def _generate_asset(rng: random.Random, index: int) -> Dict[str, Any]:
+    symbol = f"JET{index}"
+    price = round(rng.uniform(0.0001, 10), 6)
+
+    return {
+        "blacklisted": False,
+        "community": rng.random() < 0.5,
+        "contract_address": make_address("jetton", index),
+        "decimals": 9,
+        "default_symbol": False,
+        "deprecated": False,
+        "dex_price_usd": str(price),
+        "dex_usd_price": str(price),
+        "display_name": f"Jetton {index}",
+        "image_url": f"https://example.com/{symbol.lower()}.png",
+        "kind": "Jetton",
+        "symbol": symbol,
+        "third_party_price_usd": None,
+        "third_party_usd_price": None,
+    }
+
+
+def _generate_pool(
+    rng: random.Random,
+    settings: StandInSettings,
+    token0_address: str,
+    token1_address: str,
+) -> Dict[str, Any]:
+    reserve0 = rng.randint(10**9, 10**15)
+    reserve1 = rng.randint(10**9, 10**15)
+
+    return {
+        "address": make_address(
+            "pool",
+            *sorted(map(to_raw_address, (token0_address, token1_address))),
+        ),
+        "apy_1d": str(round(rng.uniform(0, 0.01), 6)),
+        "apy_30d": str(round(rng.uniform(0, 0.3), 6)),
+        "apy_7d": str(round(rng.uniform(0, 0.07), 6)),
+        "collected_token0_protocol_fee": "0",
+        "collected_token1_protocol_fee": "0",
+        "deprecated": False,
+        "lp_account_address": None,
+        "lp_balance": None,
+        "lp_fee": "20",
+        "lp_price_usd": None,
+        "lp_total_supply": str(math.isqrt(reserve0 * reserve1)),
+        "lp_total_supply_usd": None,
+        "lp_wallet_address": None,
+        "protocol_fee": "10",
+        "protocol_fee_address": make_address(PROTOCOL_FEE_ADDRESS_SEED),
+        "ref_fee": "10",
+        "reserve0": str(reserve0),
+        "reserve1": str(reserve1),
+        "router_address": settings.router_address,
+        "token0_address": token0_address,
+        "token0_balance": None,
+        "token1_address": token1_address,
+        "token1_balance": None,
+    }
+
+
+def generate_fixtures(settings: StandInSettings) -> Fixtures:
+    rng = random.Random(settings.seed)
+
+    assets = [
+        {
+            "blacklisted": False,
+            "community": False,
+            "contract_address": settings.ton_address,
+            "decimals": 9,
+            "default_symbol": True,
+            "deprecated": False,
+            "dex_price_usd": "2.5",
+            "dex_usd_price": "2.5",
+            "display_name": "TON",
+            "image_url": "https://example.com/ton.png",
+            "kind": "Ton",
+            "symbol": "TON",
+            "third_party_price_usd": "2.5",
+            "third_party_usd_price": "2.5",
+        }
+    ]
+    assets.extend(
+        _generate_asset(rng, index)
+        for index in range(1, max(settings.assets_count, 2))
+    )
+
+    jetton_addresses = [asset["contract_address"] for asset in assets[1:]]
+
+    # Every jetton gets a TON pool first, so that rates and TON fees can
+    # be calculated for all of them; the rest are random jetton pairs.
+    pairs = [(settings.ton_address, address) for address in jetton_addresses]
+    seen_pairs = {frozenset(pair) for pair in pairs}
+
+    max_pairs = len(assets) * (len(assets) - 1) // 2
+    while len(pairs) < min(settings.pools_count, max_pairs):
+        pair = tuple(rng.sample(jetton_addresses, 2))
+        if frozenset(pair) in seen_pairs:
+            continue
+
+        seen_pairs.add(frozenset(pair))
+        pairs.append(pair)
+
+    pools = [
+        _generate_pool(rng, settings, token0_address, token1_address)
+        for token0_address, token1_address in pairs[: settings.pools_count]
+    ]
+
+    return Fixtures(assets=assets, pools=pools, seed=settings.seed)
+
+
+def load_fixtures(settings: StandInSettings) -> Fixtures:
+    if not settings.fixtures_path:
+        return generate_fixtures(settings)
+
+    with open(settings.fixtures_path, "rb") as fixtures_file:
+        data = json.load(fixtures_file)
+
+    return Fixtures(
+        assets=data["asset_list"],
+        pools=data["pool_list"],
+        seed=settings.seed,
+    )
@@ -0,0 +1,20 @@
+from fastapi import FastAPI
+
+from . import ston_fi, tonapi
+from .config import settings
+from .faults import faults_middleware
+from .fixtures import load_fixtures
+
+app = FastAPI()
+
+
+async def startup():
+    app.state.fixtures = load_fixtures(settings)
+
+
+app.add_event_handler("startup", startup)
+
+app.middleware("http")(faults_middleware)
+
+ston_fi.register_routes(app)
+tonapi.register_routes(app)
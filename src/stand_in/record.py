@@ -0,0 +1,28 @@
+import asyncio
+import json
+import sys
+
+import httpx
+
+STON_FI_BASE_URL = "https://api.ston.fi"
+
+
+async def record(path: str, base_url: str = STON_FI_BASE_URL):
+    async with httpx.AsyncClient(timeout=60) as client:
+        assets_response = await client.get(f"{base_url}/v1/assets")
+        assets_response.raise_for_status()
+
+        pools_response = await client.get(f"{base_url}/v1/pools")
+        pools_response.raise_for_status()
+
+    fixtures = {
+        "asset_list": assets_response.json()["asset_list"],
+        "pool_list": pools_response.json()["pool_list"],
+    }
+
+    with open(path, "w") as fixtures_file:
+        json.dump(fixtures, fixtures_file)
+
+
+if __name__ == "__main__":
+    asyncio.run(record(*sys.argv[1:]))
@@ -0,0 +1,263 @@
+import hashlib
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, HTTPException
+from fastapi.requests import Request
+from fastapi.responses import Response
+
+from .config import settings
+from .fixtures import (
+    Fixtures,
+    get_jetton_wallet_address,
+    make_address,
+    to_raw_address,
+)
+
+FEE_DIVIDER = 10000
+
+
+def _get_fixtures(request: Request) -> Fixtures:
+    return request.app.state.fixtures
+
+
+def _conditional_response(
+    request: Request,
+    payload: bytes,
+    etag: str,
+) -> Response:
+    if request.headers.get("If-None-Match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+
+    return Response(
+        content=payload,
+        media_type="application/json",
+        headers={"ETag": etag},
+    )
+
+
+async def get_assets_endpoint(request: Request):
+    fixtures = _get_fixtures(request)
+
+    return _conditional_response(
+        request, fixtures.assets_payload, fixtures.assets_etag
+    )
+
+
+async def get_pools_endpoint(request: Request):
+    fixtures = _get_fixtures(request)
+
+    return _conditional_response(
+        request, fixtures.pools_payload, fixtures.pools_etag
+    )
+
+
+async def get_wallet_assets_endpoint(request: Request, wallet_address: str):
+    fixtures = _get_fixtures(request)
+    balances = fixtures.get_asset_balances(wallet_address)
+
+    asset_list: List[Dict[str, Any]] = []
+    for asset in fixtures.assets:
+        balance = balances.get(asset["contract_address"])
+        if balance is not None:
+            asset = dict(
+                asset,
+                balance=str(balance),
+                wallet_address=get_jetton_wallet_address(
+                    asset["contract_address"], wallet_address
+                ),
+            )
+        asset_list.append(asset)
+
+    return {"asset_list": asset_list}
+
+
+async def get_wallet_pools_endpoint(request: Request, wallet_address: str):
+    fixtures = _get_fixtures(request)
+    balances = fixtures.get_lp_balances(wallet_address)
+
+    pool_list: List[Dict[str, Any]] = []
+    for pool in fixtures.pools:
+        balance = balances.get(pool["address"])
+        if balance is not None:
+            pool = dict(
+                pool,
+                lp_balance=str(balance),
+                lp_wallet_address=get_jetton_wallet_address(
+                    pool["address"], wallet_address
+                ),
+                lp_account_address=make_address(
+                    "lp_account", pool["address"], wallet_address
+                ),
+            )
+        pool_list.append(pool)
+
+    return {"pool_list": pool_list}
+
+
+def _get_swap_pool(
+    fixtures: Fixtures,
+    offer_address: str,
+    ask_address: str,
+) -> Dict[str, Any]:
+    pool = fixtures.get_pool_by_assets(offer_address, ask_address)
+    if pool is None:
+        raise HTTPException(status_code=400, detail="Pool not found")
+
+    return pool
+
+
+def _get_reserves(pool: Dict[str, Any], offer_address: str):
+    reserve_in, reserve_out = int(pool["reserve0"]), int(pool["reserve1"])
+    if to_raw_address(pool["token0_address"]) != to_raw_address(offer_address):
+        reserve_in, reserve_out = reserve_out, reserve_in
+
+    return reserve_in, reserve_out
+
+
+def _simulate(
+    pool: Dict[str, Any],
+    offer_address: str,
+    ask_address: str,
+    offer_units: int,
+    ask_units: int,
+    slippage_tolerance: float,
+) -> Dict[str, Any]:
+    reserve_in, _ = _get_reserves(pool, offer_address)
+
+    lp_fee = int(pool["lp_fee"])
+    protocol_fee = int(pool["protocol_fee"])
+
+    return {
+        "ask_address": ask_address,
+        "ask_units": str(ask_units),
+        "fee_address": pool["protocol_fee_address"],
+        "fee_percent": str((lp_fee + protocol_fee) / FEE_DIVIDER),
+        "fee_units": str(ask_units * protocol_fee // FEE_DIVIDER),
+        "min_ask_units": str(int(ask_units * (1 - slippage_tolerance / 100))),
+        "offer_address": offer_address,
+        "offer_units": str(offer_units),
+        "pool_address": pool["address"],
+        "price_impact": str(offer_units / (reserve_in + offer_units)),
+        "router_address": pool["router_address"],
+        "slippage_tolerance": str(slippage_tolerance),
+        "swap_rate": str(ask_units / offer_units if offer_units else 0),
+    }
+
+
+async def simulate_swap_endpoint(
+    request: Request,
+    offer_address: str,
+    ask_address: str,
+    units: int,
+    slippage_tolerance: float,
+    referral_address: str | None = None,
+):
+    pool = _get_swap_pool(_get_fixtures(request), offer_address, ask_address)
+    reserve_in, reserve_out = _get_reserves(pool, offer_address)
+
+    amount_in_with_fee = units * (FEE_DIVIDER - int(pool["lp_fee"]))
+    base_out = (amount_in_with_fee * reserve_out) // (
+        reserve_in * FEE_DIVIDER + amount_in_with_fee
+    )
+
+    fee_out = base_out * int(pool["protocol_fee"]) // FEE_DIVIDER
+    if referral_address:
+        fee_out += base_out * int(pool["ref_fee"]) // FEE_DIVIDER
+
+    return _simulate(
+        pool=pool,
+        offer_address=offer_address,
+        ask_address=ask_address,
+        offer_units=units,
+        ask_units=base_out - fee_out,
+        slippage_tolerance=slippage_tolerance,
+    )
+
+
+async def simulate_reverse_swap_endpoint(
+    request: Request,
+    offer_address: str,
+    ask_address: str,
+    units: int,
+    slippage_tolerance: float,
+    referral_address: str | None = None,
+):
+    pool = _get_swap_pool(_get_fixtures(request), offer_address, ask_address)
+    reserve_in, reserve_out = _get_reserves(pool, offer_address)
+
+    if units >= reserve_out:
+        raise HTTPException(status_code=400, detail="Not enough liquidity")
+
+    numerator = reserve_in * units * FEE_DIVIDER
+    denominator = (reserve_out - units) * (FEE_DIVIDER - int(pool["lp_fee"]))
+
+    return _simulate(
+        pool=pool,
+        offer_address=offer_address,
+        ask_address=ask_address,
+        offer_units=-(-numerator // denominator),
+        ask_units=units,
+        slippage_tolerance=slippage_tolerance,
+    )
+
+
+async def get_swap_status_endpoint(
+    query_id: int,
+    router_address: str,
+    owner_address: str,
+):
+    digest = hashlib.sha256(
+        f"{settings.seed}:{query_id}:{owner_address}".encode()
+    ).digest()
+
+    if int.from_bytes(digest[:4], "big") / 2**32 >= settings.swap_found_rate:
+        return {"@type": "NotFound"}
+
+    return {
+        "@type": "Found",
+        "address": router_address,
+        "balance_deltas": {},
+        "coins": "0",
+        "exit_code": "swap_ok",
+        "logical_time": str(int.from_bytes(digest[4:10], "big")),
+        "query_id": query_id,
+        "tx_hash": digest.hex(),
+    }
+
+
+def register_routes(app: FastAPI):
+    app.add_api_route(
+        path="/v1/assets",
+        endpoint=get_assets_endpoint,
+        methods=["GET"],
+    )
+    app.add_api_route(
+        path="/v1/pools",
+        endpoint=get_pools_endpoint,
+        methods=["GET"],
+    )
+    app.add_api_route(
+        path="/v1/wallets/{wallet_address}/assets",
+        endpoint=get_wallet_assets_endpoint,
+        methods=["GET"],
+    )
+    app.add_api_route(
+        path="/v1/wallets/{wallet_address}/pools",
+        endpoint=get_wallet_pools_endpoint,
+        methods=["GET"],
+    )
+    app.add_api_route(
+        path="/v1/swap/simulate",
+        endpoint=simulate_swap_endpoint,
+        methods=["POST"],
+    )
+    app.add_api_route(
+        path="/v1/reverse_swap/simulate",
+        endpoint=simulate_reverse_swap_endpoint,
+        methods=["POST"],
+    )
+    app.add_api_route(
+        path="/v1/swap/status",
+        endpoint=get_swap_status_endpoint,
+        methods=["GET"],
+    )
@@ -0,0 +1,238 @@
+import hashlib
+from typing import Any, Dict, List
+
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.requests import Request
+from tonsdk.boc import Cell, Slice, begin_cell
+from tonsdk.utils import Address
+
+from .fixtures import (
+    JETTON_WALLET_CODE,
+    Fixtures,
+    get_jetton_wallet_address,
+    make_address,
+    to_raw_address,
+)
+
+
+def _get_fixtures(request: Request) -> Fixtures:
+    return request.app.state.fixtures
+
+
+def _num(value: int) -> Dict[str, Any]:
+    return {"type": "num", "num": hex(value)}
+
+
+def _cell(cell: Cell) -> Dict[str, Any]:
+    return {"type": "cell", "cell": cell.to_boc(False).hex()}
+
+
+def _address_cell(address: str) -> Dict[str, Any]:
+    return _cell(begin_cell().store_address(Address(address)).end_cell())
+
+
+def _parse_address_arg(arg: str) -> str:
+    address = Slice(Cell.one_from_boc(bytes.fromhex(arg))).read_msg_addr()
+
+    return address.to_string(True, True, True)
+
+
+def _get_pool(fixtures: Fixtures, account_id: str) -> Dict[str, Any]:
+    pool = fixtures.get_pool_by_address(account_id)
+    if pool is None:
+        raise HTTPException(status_code=400, detail="Not a pool contract")
+
+    return pool
+
+
+def _get_wallet_address(
+    fixtures: Fixtures,
+    account_id: str,
+    args: List[str],
+) -> List[Dict[str, Any]]:
+    owner_address = _parse_address_arg(args[0])
+
+    return [
+        _address_cell(get_jetton_wallet_address(account_id, owner_address))
+    ]
+
+
+def _get_jetton_data(
+    fixtures: Fixtures,
+    account_id: str,
+    args: List[str],
+) -> List[Dict[str, Any]]:
+    return [
+        _num(10**18),
+        _num(-1),
+        _address_cell(make_address("jetton_admin", account_id)),
+        _cell(begin_cell().end_cell()),
+        _cell(JETTON_WALLET_CODE),
+    ]
+
+
+def _get_pool_data(
+    fixtures: Fixtures,
+    account_id: str,
+    args: List[str],
+) -> List[Dict[str, Any]]:
+    pool = _get_pool(fixtures, account_id)
+    router_address = pool["router_address"]
+
+    return [
+        _num(int(pool["reserve0"])),
+        _num(int(pool["reserve1"])),
+        _address_cell(
+            get_jetton_wallet_address(pool["token0_address"], router_address)
+        ),
+        _address_cell(
+            get_jetton_wallet_address(pool["token1_address"], router_address)
+        ),
+        _num(int(pool["lp_fee"])),
+        _num(int(pool["protocol_fee"])),
+        _num(int(pool["ref_fee"])),
+        _address_cell(pool["protocol_fee_address"]),
+        _num(int(pool["collected_token0_protocol_fee"])),
+        _num(int(pool["collected_token1_protocol_fee"])),
+    ]
+
+
+def _get_expected_tokens(
+    fixtures: Fixtures,
+    account_id: str,
+    args: List[str],
+) -> List[Dict[str, Any]]:
+    pool = _get_pool(fixtures, account_id)
+
+    amount0, amount1 = (int(arg, 0) for arg in args[:2])
+    reserve0, reserve1 = int(pool["reserve0"]), int(pool["reserve1"])
+    total_supply = int(pool["lp_total_supply"])
+
+    return [
+        _num(
+            min(
+                amount0 * total_supply // reserve0,
+                amount1 * total_supply // reserve1,
+            )
+        )
+    ]
+
+
+def _get_lp_account_data(
+    fixtures: Fixtures,
+    account_id: str,
+    args: List[str],
+) -> List[Dict[str, Any]]:
+    digest = hashlib.sha256(to_raw_address(account_id).encode()).digest()
+    pool = fixtures.pools[
+        int.from_bytes(digest[:4], "big") % len(fixtures.pools)
+    ]
+
+    return [
+        _address_cell(make_address("lp_account_owner", account_id)),
+        _address_cell(pool["address"]),
+        _num(int.from_bytes(digest[4:8], "big")),
+        _num(int.from_bytes(digest[8:12], "big")),
+    ]
+
+
+GET_METHODS = {
+    "get_wallet_address": _get_wallet_address,
+    "get_jetton_data": _get_jetton_data,
+    "get_pool_data": _get_pool_data,
+    "get_expected_tokens": _get_expected_tokens,
+    "get_lp_account_data": _get_lp_account_data,
+}
+
+
+async def execute_get_method_endpoint(
+    request: Request,
+    account_id: str,
+    method_name: str,
+    args: List[str] = Query(default=[]),
+):
+    get_method = GET_METHODS.get(method_name)
+    if get_method is None:
+        raise HTTPException(status_code=501, detail="Unknown get method")
+
+    return {
+        "success": True,
+        "exit_code": 0,
+        "stack": get_method(_get_fixtures(request), account_id, args),
+    }
+
+
+async def get_jettons_balances_endpoint(request: Request, account_id: str):
+    fixtures = _get_fixtures(request)
+    balances = fixtures.get_asset_balances(account_id)
+
+    return {
+        "balances": [
+            {
+                "balance": str(balances[asset["contract_address"]]),
+                "wallet_address": {
+                    "address": to_raw_address(
+                        get_jetton_wallet_address(
+                            asset["contract_address"], account_id
+                        )
+                    ),
+                    "is_scam": False,
+                },
+                "jetton": {
+                    "address": to_raw_address(asset["contract_address"]),
+                    "name": asset["display_name"] or asset["symbol"],
+                    "symbol": asset["symbol"],
+                    "decimals": asset["decimals"],
+                    "image": asset["image_url"] or "",
+                    "verification": "whitelist",
+                },
+            }
+            for asset in fixtures.assets
+            if asset["contract_address"] in balances
+            and asset["kind"] == "Jetton"
+        ]
+    }
+
+
+async def get_account_info_endpoint(account_id: str):
+    digest = hashlib.sha256(to_raw_address(account_id).encode()).digest()
+
+    return {
+        "address": to_raw_address(account_id),
+        "balance": int.from_bytes(digest[:5], "big"),
+        "last_activity": 1700000000 + int.from_bytes(digest[5:8], "big"),
+        "status": "active",
+        "interfaces": ["wallet_v4r2"],
+        "get_methods": [],
+    }
+
+
+async def get_public_key_endpoint(account_id: str):
+    public_key = hashlib.sha256(
+        f"public_key:{to_raw_address(account_id)}".encode()
+    ).hexdigest()
+
+    return {"public_key": public_key}
+
+
+def register_routes(app: FastAPI):
+    app.add_api_route(
+        path="/v2/blockchain/accounts/{account_id}/methods/{method_name}",
+        endpoint=execute_get_method_endpoint,
+        methods=["GET"],
+    )
+    app.add_api_route(
+        path="/v2/accounts/{account_id}/jettons",
+        endpoint=get_jettons_balances_endpoint,
+        methods=["GET"],
+    )
+    app.add_api_route(
+        path="/v2/accounts/{account_id}/publickey",
+        endpoint=get_public_key_endpoint,
+        methods=["GET"],
+    )
+    app.add_api_route(
+        path="/v2/accounts/{account_id}",
+        endpoint=get_account_info_endpoint,
+        methods=["GET"],
+    )
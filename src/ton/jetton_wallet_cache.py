@@ -0,0 +1,186 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from functools import partial
+from typing import Iterable, Tuple
+
+from pydantic import BaseModel
+from pytonapi import AsyncTonapi
+from tonsdk.utils import Address
+
+from src.config import config
+from src.database.dal import jetton_wallet_dal
+from src.database.models import JettonWalletDao
+from src.utils.single_flight import SingleFlight
+
+from .utils import get_jetton_wallet_address
+
+logger = logging.getLogger("jetton_wallet_cache")
+
+
+class JettonWalletCacheStats(BaseModel):
+    calls: int = 0
+    memory_hits: int = 0
+    db_hits: int = 0
+    resolved: int = 0
+    prewarmed: int = 0
+    prewarm_failed: int = 0
+
+
+def _get_key(
+    jetton_contract_address: Address | str,
+    owner_wallet_address: Address | str,
+) -> Tuple[str, str]:
+    return (
+        Address(jetton_contract_address).to_string(False),
+        Address(owner_wallet_address).to_string(False),
+    )
+
+
+class JettonWalletCache:
+    def __init__(self, max_size: int = 10_000):
+        self.max_size = max_size
+        self.stats = JettonWalletCacheStats()
+
+        self._wallets: OrderedDict[Tuple[str, str], str] = OrderedDict()
+        self._requests = SingleFlight()
+
+    async def get(
+        self,
+        jetton_contract_address: Address | str,
+        owner_wallet_address: Address | str,
+        tonapi_client: AsyncTonapi | None = None,
+    ) -> Address:
+        self.stats.calls += 1
+
+        key = _get_key(jetton_contract_address, owner_wallet_address)
+
+        wallet_address = self._get(key)
+        if wallet_address is not None:
+            self.stats.memory_hits += 1
+            return Address(wallet_address)
+
+        wallet_address = await self._requests.do(
+            key, partial(self._load, key, tonapi_client)
+        )
+
+        return Address(wallet_address)
+
+    async def prewarm(
+        self,
+        jetton_contract_addresses: Iterable[str],
+        owner_wallet_address: Address | str,
+        tonapi_client: AsyncTonapi | None = None,
+        concurrency: int = 4,
+    ):
+        owner_address = Address(owner_wallet_address).to_string(False)
+
+        jetton_wallets = await jetton_wallet_dal.get_jetton_wallets_by_owner(
+            owner_address
+        )
+        for jetton_wallet in jetton_wallets:
+            self._put(
+                (jetton_wallet.jetton_address, owner_address),
+                jetton_wallet.wallet_address,
+            )
+
+        missing = iter(
+            {
+                key
+                for key in (
+                    _get_key(jetton_contract_address, owner_address)
+                    for jetton_contract_address in jetton_contract_addresses
+                )
+                if key not in self._wallets
+            }
+        )
+        resolved = []
+
+        async def worker():
+            for key in missing:
+                try:
+                    wallet_address = await self._resolve(key, tonapi_client)
+                except Exception as e:
+                    self.stats.prewarm_failed += 1
+                    logger.warning(
+                        "Failed to resolve jetton wallet for %s: %r", key, e
+                    )
+                    continue
+
+                self._put(key, wallet_address)
+                resolved.append(
+                    JettonWalletDao(
+                        jetton_address=key[0],
+                        owner_address=key[1],
+                        wallet_address=wallet_address,
+                    )
+                )
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+        await jetton_wallet_dal.add_jetton_wallets(resolved)
+        self.stats.prewarmed += len(resolved)
+
+        logger.info(
+            "Prewarmed %d jetton wallets of %s", len(resolved), owner_address
+        )
+
+    def _get(self, key: Tuple[str, str]) -> str | None:
+        wallet_address = self._wallets.get(key)
+
+        if wallet_address is not None:
+            self._wallets.move_to_end(key)
+
+        return wallet_address
+
+    def _put(self, key: Tuple[str, str], wallet_address: str):
+        self._wallets[key] = wallet_address
+        self._wallets.move_to_end(key)
+
+        while len(self._wallets) > self.max_size:
+            self._wallets.popitem(last=False)
+
+    async def _resolve(
+        self,
+        key: Tuple[str, str],
+        tonapi_client: AsyncTonapi | None,
+    ) -> str:
+        wallet_address = await get_jetton_wallet_address(
+            jetton_contract_address=key[0],
+            owner_wallet_address=key[1],
+            tonapi_client=tonapi_client,
+        )
+        self.stats.resolved += 1
+
+        return wallet_address.to_string(True, True, True)
+
+    async def _load(
+        self,
+        key: Tuple[str, str],
+        tonapi_client: AsyncTonapi | None,
+    ) -> str:
+        jetton_wallet = await jetton_wallet_dal.get_jetton_wallet(*key)
+
+        if jetton_wallet is not None:
+            self.stats.db_hits += 1
+            wallet_address = jetton_wallet.wallet_address
+        else:
+            wallet_address = await self._resolve(key, tonapi_client)
+            await jetton_wallet_dal.add_jetton_wallets(
+                [
+                    JettonWalletDao(
+                        jetton_address=key[0],
+                        owner_address=key[1],
+                        wallet_address=wallet_address,
+                    )
+                ]
+            )
+
+        self._put(key, wallet_address)
+
+        return wallet_address
+
+
+jetton_wallet_cache = JettonWalletCache(
+    max_size=config.ton.jetton_wallet_cache_size,
+)
@@ -1,21 +1,76 @@
+from functools import partial
+
 from pytonapi import AsyncTonapi
+from pytonapi.async_tonapi import methods
 from src.config import config
 
+from .tonapi_scheduler import tonapi_scheduler
+
+
+class ScheduledRequestMixin:
+    async def _request(
+        self,
+        method,
+        path,
+        headers=None,
+        params=None,
+        body=None,
+    ):
+        return await tonapi_scheduler.run(
+            partial(
+                super()._request,
+                method=method,
+                path=path,
+                headers=headers,
+                params=params,
+                body=body,
+            )
+        )
+
+
+class ScheduledAccountsMethod(ScheduledRequestMixin, methods.AccountsMethod):
+    pass
+
+
+class ScheduledBlockchainMethod(
+    ScheduledRequestMixin, methods.BlockchainMethod
+):
+    pass
+
+
+class ScheduledJettonsMethod(ScheduledRequestMixin, methods.JettonsMethod):
+    pass
+
+
+class ScheduledAsyncTonapi(AsyncTonapi):
+    @property
+    def accounts(self) -> methods.AccountsMethod:
+        return ScheduledAccountsMethod(**self.__dict__)
+
+    @property
+    def blockchain(self) -> methods.BlockchainMethod:
+        return ScheduledBlockchainMethod(**self.__dict__)
+
+    @property
+    def jettons(self) -> methods.JettonsMethod:
+        return ScheduledJettonsMethod(**self.__dict__)
+
 
 class TonapiClientFactory:
     tonapi_key: str = config.ton_console.api_key.get_secret_value()
+    base_url: str | None = config.ton_console.base_url
     tonapi_client: AsyncTonapi = None
-    max_rps: int = 1
-    max_retries: int = 10
 
     @classmethod
     def get_tonapi_client(cls) -> AsyncTonapi:
         if cls.tonapi_client:
             return cls.tonapi_client
 
-        cls.tonapi_client = AsyncTonapi(
+        # Retries on 429 are handled by the scheduler within its budget.
+        cls.tonapi_client = ScheduledAsyncTonapi(
             api_key=cls.tonapi_key,
-            max_retries=cls.max_retries,
+            max_retries=0,
+            base_url=f"{cls.base_url.rstrip('/')}/" if cls.base_url else None,
         )
 
         return cls.tonapi_client
@@ -0,0 +1,213 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+from pydantic import BaseModel
+from pytonapi.exceptions import TONAPITooManyRequestsError
+
+from src.config import config
+
+logger = logging.getLogger("tonapi_scheduler")
+
+
+class Priority(IntEnum):
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
+_current_priority: ContextVar[Priority] = ContextVar(
+    "tonapi_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    token = _current_priority.set(priority)
+
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+class TonapiLaneStats(BaseModel):
+    requests: int = 0
+    queued: int = 0
+    max_queued: int = 0
+    wait_total: float = 0
+    wait_max: float = 0
+
+    def add_wait(self, duration: float):
+        self.requests += 1
+        self.wait_total += duration
+        self.wait_max = max(self.wait_max, duration)
+
+
+class TonapiSchedulerStats(BaseModel):
+    lanes: Dict[str, TonapiLaneStats]
+    throttled: int = 0
+    retries: int = 0
+    retries_denied: int = 0
+    retry_budget: float = 0
+
+
+class RetryBudget:
+    def __init__(self, ratio: float, max_balance: float):
+        self.ratio = ratio
+        self.max_balance = max_balance
+        self.balance = max_balance
+
+    def deposit(self):
+        self.balance = min(self.max_balance, self.balance + self.ratio)
+
+    def withdraw(self) -> bool:
+        if self.balance < 1:
+            return False
+
+        self.balance -= 1
+        return True
+
+
+class TonapiScheduler:
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        max_retries: int = 3,
+        retry_delay: float = 1,
+        retry_budget_ratio: float = 0.1,
+        retry_budget_max: float = 10,
+    ):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.retry_budget = RetryBudget(retry_budget_ratio, retry_budget_max)
+        self.stats = TonapiSchedulerStats(
+            lanes={
+                priority.name.lower(): TonapiLaneStats()
+                for priority in Priority
+            },
+            retry_budget=self.retry_budget.balance,
+        )
+
+        self._tokens = float(self.burst)
+        self._updated_at = time.monotonic()
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._dispatcher: asyncio.Task | None = None
+
+    async def run(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        priority = _current_priority.get()
+        attempt = 0
+
+        while True:
+            await self.acquire(priority)
+
+            try:
+                result = await func()
+            except TONAPITooManyRequestsError:
+                self.stats.throttled += 1
+                self._pause(self.retry_delay)
+
+                attempt += 1
+                if (
+                    attempt > self.max_retries
+                    or not self.retry_budget.withdraw()
+                ):
+                    self.stats.retries_denied += 1
+                    self.stats.retry_budget = self.retry_budget.balance
+                    raise
+
+                self.stats.retries += 1
+                self.stats.retry_budget = self.retry_budget.balance
+                logger.warning(
+                    "tonapi rate limit hit, retry %d/%d",
+                    attempt,
+                    self.max_retries,
+                )
+                continue
+
+            if attempt == 0:
+                self.retry_budget.deposit()
+                self.stats.retry_budget = self.retry_budget.balance
+
+            return result
+
+    async def acquire(self, priority: Priority = Priority.INTERACTIVE):
+        lane = self.stats.lanes[priority.name.lower()]
+
+        if self.rate <= 0 or not self._waiters and self._take():
+            lane.add_wait(0)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), future))
+        lane.queued += 1
+        lane.max_queued = max(lane.max_queued, lane.queued)
+
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+        started_at = time.monotonic()
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self._tokens += 1
+            raise
+        finally:
+            lane.queued -= 1
+
+        lane.add_wait(time.monotonic() - started_at)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst,
+            self._tokens + (now - self._updated_at) * self.rate,
+        )
+        self._updated_at = now
+
+    def _take(self) -> bool:
+        self._refill()
+
+        if self._tokens < 1:
+            return False
+
+        self._tokens -= 1
+        return True
+
+    def _pause(self, delay: float):
+        # Negative tokens keep every lane idle for `delay` seconds.
+        self._refill()
+        self._tokens = min(self._tokens, -delay * self.rate)
+
+    async def _dispatch(self):
+        while self._waiters:
+            if self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+                continue
+
+            if not self._take():
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                continue
+
+            _, _, future = heapq.heappop(self._waiters)
+            future.set_result(None)
+
+
+tonapi_scheduler = TonapiScheduler(
+    rate=config.ton_console.rps,
+    burst=config.ton_console.burst,
+    max_retries=config.ton_console.max_retries,
+    retry_delay=config.ton_console.retry_delay,
+    retry_budget_ratio=config.ton_console.retry_budget_ratio,
+    retry_budget_max=config.ton_console.retry_budget_max,
+)
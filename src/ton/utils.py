@@ -1,8 +1,19 @@
+import asyncio
+import logging
+from functools import partial
+from hashlib import sha256
+from typing import Dict, List
+
+from pydantic import BaseModel
 from pytonapi import AsyncTonapi
 from tonsdk.boc import Cell, Slice, begin_cell
 from tonsdk.utils import Address, b64str_to_bytes, bytes_to_b64str
 
+from src.config import config
 from src.ton.tonapi_client_factory import TonapiClientFactory
+from src.utils.single_flight import SingleFlight
+
+logger = logging.getLogger("ton_utils")
 
 
 def get_address_cell(address: Address | str) -> Cell:
@@ -41,7 +52,7 @@ def parse_address_from_cell_str(cell_str: str) -> Address | None:
     return parse_address_from_cell(cell)
 
 
-async def get_jetton_wallet_address(
+async def fetch_jetton_wallet_address(
     jetton_contract_address: str,
     owner_wallet_address: str,
     tonapi_client: AsyncTonapi | None = None,
@@ -52,9 +63,9 @@ async def get_jetton_wallet_address(
     owner_wallet_address_hex = get_address_cell(owner_wallet_address)
 
     response = await tonapi_client.blockchain.execute_get_method(
-        account_id=jetton_contract_address,
-        method_name="get_wallet_address",
-        args=[owner_wallet_address_hex.to_boc(False).hex()],
+        jetton_contract_address,
+        "get_wallet_address",
+        owner_wallet_address_hex.to_boc(False).hex(),
     )
 
     wallet_address = parse_address_from_bytes(
@@ -64,6 +75,226 @@ async def get_jetton_wallet_address(
     return wallet_address
 
 
+async def fetch_jetton_wallet_code(
+    jetton_contract_address: str,
+    tonapi_client: AsyncTonapi | None = None,
+) -> Cell:
+    if not tonapi_client:
+        tonapi_client = TonapiClientFactory.get_tonapi_client()
+
+    response = await tonapi_client.blockchain.execute_get_method(
+        jetton_contract_address,
+        "get_jetton_data",
+    )
+
+    return Cell.one_from_boc(bytes.fromhex(response.stack[4].cell))
+
+
+def _get_address_bits(address: Address) -> int:
+    # addr_std$10 anycast:(Maybe Anycast) workchain_id:int8 address:bits256
+    return (
+        (0b100 << 264)
+        | ((address.wc & 0xFF) << 256)
+        | int.from_bytes(address.hash_part, "big")
+    )
+
+
+class JettonWalletCode:
+    # Standard jetton wallet data is balance:Coins owner:MsgAddress
+    # master:MsgAddress wallet_code:^Cell, and the wallet address is the
+    # hash of StateInit{code, data}. Both cell hashes are computed here
+    # directly from the code cell hash and depth, without building cells.
+    DATA_DESCRIPTORS = bytes([1, 135])
+    STATE_INIT_DESCRIPTORS = bytes([2, 1, 0b00110100])
+
+    def __init__(self, jetton_contract_address: str, wallet_code: Cell):
+        jetton_address = Address(jetton_contract_address)
+
+        self.workchain = jetton_address.wc
+        self.master_bits = _get_address_bits(jetton_address)
+
+        code_depth = wallet_code.get_max_depth()
+        code_hash = wallet_code.bytes_hash()
+
+        self.data_suffix = code_depth.to_bytes(2, "big") + code_hash
+        self.state_init_prefix = (
+            self.STATE_INIT_DESCRIPTORS
+            + code_depth.to_bytes(2, "big")
+            + (code_depth + 1).to_bytes(2, "big")
+            + code_hash
+        )
+
+    def derive(self, owner_wallet_address: Address | str) -> Address:
+        owner_bits = _get_address_bits(Address(owner_wallet_address))
+
+        # 4 zero bits of balance + 2 * 267 address bits, topped up to
+        # 68 bytes with a completion tag.
+        data_bits = (((owner_bits << 267) | self.master_bits) << 6) | 0b100000
+
+        data_hash = sha256(
+            self.DATA_DESCRIPTORS
+            + data_bits.to_bytes(68, "big")
+            + self.data_suffix
+        ).digest()
+        state_init_hash = sha256(self.state_init_prefix + data_hash).digest()
+
+        return Address(f"{self.workchain}:{state_init_hash.hex()}")
+
+
+class JettonWalletDerivationStats(BaseModel):
+    derived: int = 0
+    fetched: int = 0
+    code_fetches: int = 0
+    mismatches: int = 0
+
+
+class JettonWalletDeriver:
+    def __init__(self):
+        self.stats = JettonWalletDerivationStats()
+
+        self._codes: Dict[str, JettonWalletCode | None] = {}
+        self._requests = SingleFlight()
+
+    async def get_wallet_code(
+        self,
+        jetton_contract_address: str,
+        owner_wallet_address: Address | str,
+        tonapi_client: AsyncTonapi | None = None,
+    ) -> JettonWalletCode | None:
+        key = Address(jetton_contract_address).to_string(False)
+
+        if key in self._codes:
+            return self._codes[key]
+
+        return await self._requests.do(
+            key,
+            partial(
+                self._load_wallet_code,
+                key,
+                owner_wallet_address,
+                tonapi_client,
+            ),
+        )
+
+    async def _load_wallet_code(
+        self,
+        jetton_contract_address: str,
+        owner_wallet_address: Address | str,
+        tonapi_client: AsyncTonapi | None,
+    ) -> JettonWalletCode | None:
+        self.stats.code_fetches += 1
+
+        try:
+            wallet_code = JettonWalletCode(
+                jetton_contract_address,
+                await fetch_jetton_wallet_code(
+                    jetton_contract_address, tonapi_client
+                ),
+            )
+            derived_address = wallet_code.derive(owner_wallet_address)
+        except NotImplementedError:
+            # Library (exotic) wallet code cannot be hashed by tonsdk.
+            wallet_code = derived_address = None
+
+        expected_address = await fetch_jetton_wallet_address(
+            jetton_contract_address, owner_wallet_address, tonapi_client
+        )
+        self.stats.fetched += 1
+
+        if derived_address is None or (
+            derived_address.to_string(False)
+            != expected_address.to_string(False)
+        ):
+            self.stats.mismatches += 1
+            logger.info(
+                "Jetton %s has non-standard wallets, using get-methods",
+                jetton_contract_address,
+            )
+            wallet_code = None
+
+        self._codes[jetton_contract_address] = wallet_code
+
+        return wallet_code
+
+    async def get_wallet_address(
+        self,
+        jetton_contract_address: str,
+        owner_wallet_address: Address | str,
+        tonapi_client: AsyncTonapi | None = None,
+    ) -> Address:
+        wallet_code = await self.get_wallet_code(
+            jetton_contract_address, owner_wallet_address, tonapi_client
+        )
+
+        if wallet_code is None:
+            self.stats.fetched += 1
+            return await fetch_jetton_wallet_address(
+                jetton_contract_address, owner_wallet_address, tonapi_client
+            )
+
+        self.stats.derived += 1
+
+        return wallet_code.derive(owner_wallet_address)
+
+    async def get_wallet_addresses(
+        self,
+        jetton_contract_address: str,
+        owner_wallet_addresses: List[Address | str],
+        tonapi_client: AsyncTonapi | None = None,
+    ) -> List[Address]:
+        if not owner_wallet_addresses:
+            return []
+
+        wallet_code = await self.get_wallet_code(
+            jetton_contract_address, owner_wallet_addresses[0], tonapi_client
+        )
+
+        if wallet_code is None:
+            semaphore = asyncio.Semaphore(
+                config.ton.jetton_wallet_fetch_concurrency
+            )
+
+            async def fetch(owner_wallet_address: Address | str) -> Address:
+                async with semaphore:
+                    self.stats.fetched += 1
+                    return await fetch_jetton_wallet_address(
+                        jetton_contract_address,
+                        owner_wallet_address,
+                        tonapi_client,
+                    )
+
+            return await asyncio.gather(
+                *(fetch(owner) for owner in owner_wallet_addresses)
+            )
+
+        self.stats.derived += len(owner_wallet_addresses)
+
+        return [wallet_code.derive(owner) for owner in owner_wallet_addresses]
+
+
+jetton_wallet_deriver = JettonWalletDeriver()
+
+
+async def get_jetton_wallet_address(
+    jetton_contract_address: str,
+    owner_wallet_address: str,
+    tonapi_client: AsyncTonapi | None = None,
+) -> Address:
+    return await jetton_wallet_deriver.get_wallet_address(
+        jetton_contract_address, owner_wallet_address, tonapi_client
+    )
+
+
+async def get_jetton_wallet_addresses(
+    jetton_contract_address: str,
+    owner_wallet_addresses: List[str],
+    tonapi_client: AsyncTonapi | None = None,
+) -> List[Address]:
+    return await jetton_wallet_deriver.get_wallet_addresses(
+        jetton_contract_address, owner_wallet_addresses, tonapi_client
+    )
+
+
 def create_jetton_transfer_body(
     to_address: str,
     jetton_amount: int,
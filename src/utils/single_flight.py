@@ -0,0 +1,81 @@
+import asyncio
+import time
+from functools import partial
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+from pydantic import BaseModel
+
+
+class SingleFlightStats(BaseModel):
+    calls: int = 0
+    hits: int = 0
+    coalesced: int = 0
+    misses: int = 0
+
+
+class SingleFlight:
+    def __init__(self, ttl: float = 0, max_size: int = 10_000):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.stats = SingleFlightStats()
+
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+        self._results: Dict[Hashable, Tuple[float, Any]] = {}
+
+    async def do(
+        self,
+        key: Hashable,
+        func: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        self.stats.calls += 1
+
+        cached = self._results.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            self.stats.hits += 1
+            return cached[1]
+
+        task = self._in_flight.get(key)
+
+        if task is None:
+            self.stats.misses += 1
+            task = asyncio.ensure_future(func())
+            task.add_done_callback(partial(self._on_done, key))
+            self._in_flight[key] = task
+        else:
+            self.stats.coalesced += 1
+
+        # Shielded so that a cancelled caller does not cancel the request
+        # the other callers are waiting on.
+        return await asyncio.shield(task)
+
+    def invalidate(self, key: Hashable | None = None):
+        if key is None:
+            self._results.clear()
+        else:
+            self._results.pop(key, None)
+
+    def _on_done(self, key: Hashable, task: asyncio.Task):
+        self._in_flight.pop(key, None)
+
+        if task.cancelled() or task.exception() is not None:
+            return
+
+        if self.ttl > 0:
+            self._store(key, task.result())
+
+    def _store(self, key: Hashable, result: Any):
+        self._results.pop(key, None)
+
+        if len(self._results) >= self.max_size:
+            now = time.monotonic()
+            for expired_key in [
+                k
+                for k, (expires, _) in self._results.items()
+                if expires <= now
+            ]:
+                del self._results[expired_key]
+
+        while len(self._results) >= self.max_size:
+            del self._results[next(iter(self._results))]
+
+        self._results[key] = (time.monotonic() + self.ttl, result)
@@ -0,0 +1,49 @@
+import time
+
+TIMESTAMP_BITS = 41
+WORKER_ID_BITS = 10
+SEQUENCE_BITS = 12
+
+MAX_WORKER_ID = (1 << WORKER_ID_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+# 2024-01-01 00:00:00 UTC, 41 bits of milliseconds last until 2093.
+DEFAULT_EPOCH = 1704067200000
+
+
+class SnowflakeGenerator:
+    def __init__(self, worker_id: int, epoch: int = DEFAULT_EPOCH):
+        if not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(
+                f"Worker id must be between 0 and {MAX_WORKER_ID}"
+            )
+
+        self.worker_id = worker_id
+        self.epoch = epoch
+
+        self._timestamp = -1
+        self._sequence = 0
+
+    def next_id(self) -> int:
+        # Ids are 63 bits wide: they fit a signed BIGINT column as well as
+        # an unsigned 64 bit message field. The timestamp never goes back,
+        # a clock moving backwards or an exhausted sequence borrows the next
+        # millisecond instead of blocking.
+        timestamp = max(int(time.time() * 1000) - self.epoch, self._timestamp)
+
+        if timestamp == self._timestamp:
+            self._sequence += 1
+
+            if self._sequence > MAX_SEQUENCE:
+                timestamp += 1
+                self._sequence = 0
+        else:
+            self._sequence = 0
+
+        self._timestamp = timestamp
+
+        return (
+            timestamp << (WORKER_ID_BITS + SEQUENCE_BITS)
+            | self.worker_id << SEQUENCE_BITS
+            | self._sequence
+        )
@@ -0,0 +1,103 @@
+import logging
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Awaitable, Callable, Dict
+
+from pydantic import BaseModel
+
+from src.config import config
+
+logger = logging.getLogger("latency")
+
+
+class StageStats(BaseModel):
+    count: int = 0
+    total: float = 0
+    max: float = 0
+
+    def add(self, duration: float):
+        self.count += 1
+        self.total += duration
+        self.max = max(self.max, duration)
+
+
+class LatencyStats(BaseModel):
+    slow_threshold: float
+    slow: int = 0
+    total: StageStats = StageStats()
+    stages: Dict[str, StageStats] = {}
+
+
+latency_stats: Dict[str, LatencyStats] = {}
+
+_current_stages: ContextVar[Dict[str, float] | None] = ContextVar(
+    "current_stages", default=None
+)
+
+
+# Only measures and logs, work running past slow_threshold isn't cancelled.
+@asynccontextmanager
+async def measure_latency(name: str, slow_threshold: float):
+    stages: Dict[str, float] = {}
+    token = _current_stages.set(stages)
+    started_at = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - started_at
+        _current_stages.reset(token)
+
+        stats = latency_stats.setdefault(
+            name, LatencyStats(slow_threshold=slow_threshold)
+        )
+        stats.total.add(duration)
+        for stage, stage_duration in stages.items():
+            stats.stages.setdefault(stage, StageStats()).add(stage_duration)
+
+        if duration > slow_threshold:
+            stats.slow += 1
+            logger.warning(
+                "%s took %.3fs, slow threshold is %.3fs: %s",
+                name,
+                duration,
+                slow_threshold,
+                ", ".join(
+                    f"{stage}={stage_duration:.3f}s"
+                    for stage, stage_duration in stages.items()
+                ),
+            )
+
+
+def track_latency(name: str, slow_threshold: float | None = None):
+    def decorator(func: Callable[..., Awaitable[Any]]):
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            async with measure_latency(
+                name,
+                (
+                    slow_threshold
+                    if slow_threshold is not None
+                    else config.server.slow_threshold
+                ),
+            ):
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+async def timed(stage: str, awaitable: Awaitable[Any]) -> Any:
+    started_at = time.perf_counter()
+
+    try:
+        return await awaitable
+    finally:
+        stages = _current_stages.get()
+        if stages is not None:
+            stages[stage] = (
+                stages.get(stage, 0) + time.perf_counter() - started_at
+            )